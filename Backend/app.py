@@ -17,15 +17,20 @@ load_dotenv(dotenv_path=env_path)
 from routes.report_routes import report_bp
 from routes.auth_routes import auth_bp
 from routes.health_routes import health_bp
-from utils.exception import AppException
+from utils.exception import AppException, LLMRateLimitedError
+from utils.upload import SpooledUploadRequest
 from routes.comparison_routes import comparison_bp
 from routes.chatbot_routes import chatbot_bp
 from routes.voice_chatbot_routes import voice_chatbot_bp
 from routes.medical_term_routes import medical_term_bp
 from routes.symptom_checker_routes import symptom_checker_bp
 from routes.medicine_routes import medicine_bp
+from routes.metrics_routes import metrics_bp
+from services.llm_admission import start_request as start_llm_request
+from services.llm_metrics import current_endpoint
 
 app = Flask(__name__)
+app.request_class = SpooledUploadRequest
 CORS(app)
 
 # Register Blueprints
@@ -38,12 +43,16 @@ app.register_blueprint(chatbot_bp)
 app.register_blueprint(medical_term_bp)
 app.register_blueprint(symptom_checker_bp)
 app.register_blueprint(medicine_bp)
+app.register_blueprint(metrics_bp)
 
 # --- Request Logging Hooks ---
 @app.before_request
 def log_request_info():
     """Log details of the incoming request."""
     logger.info(f" INCOMING REQUEST: {request.method} {request.path}")
+    # LLM metrics are attributed to the endpoint that triggered the call.
+    current_endpoint.set(request.endpoint or request.path)
+    start_llm_request()
     if request.endpoint:
         logger.info(f"    Handling Function: {request.endpoint}")
     # Optional: Log body for non-file requests if needed, but keeping it clean for now
@@ -60,6 +69,8 @@ def log_response_info(response):
 @app.errorhandler(AppException)
 def handle_app_exception(e):
     logger.error(f" APP ERROR in {request.path}: {e.to_dict()}")
+    if isinstance(e, LLMRateLimitedError):
+        return jsonify(e.to_dict()), e.status_code, {"Retry-After": str(e.retry_after)}
     return jsonify(e.to_dict()), e.status_code
 
 @app.errorhandler(Exception)
@@ -0,0 +1,70 @@
+# Requests/sec of one gthread worker for the upload summary step: the
+# summary plus one batched explanation of the flagged lab parameters, called
+# one after the other (blocking API) against run concurrently with
+# asyncio.gather on the shared loop (what report_service.summarize_report_async
+# does). Uses the
+# fake LLM backend with a fixed latency, so only the call pattern differs.
+# Run from Backend/:
+#
+#     python -m benchmarks.llm_load [requests] [threads] [terms]
+
+import os
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY_MS", "300")
+os.environ.setdefault("FAKE_LLM_LATENCY_SIGMA", "0")
+# Measure the worker, not the admission limits.
+os.environ.setdefault("LLM_MAX_CONCURRENT", "10000")
+os.environ.setdefault("LLM_BACKGROUND_SHARE", "1")
+
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.gemini_service import generate_summary, generate_summary_async
+from services.llm_gateway import run_async
+from services.response_cache import get_or_explain_medical_terms, get_or_explain_medical_terms_async
+
+REPORT = "Hemoglobin 10.2 L g/dL 13.0-17.0\nSerum Creatinine 1.6 H mg/dL 0.6-1.2\n"
+
+
+def _terms(request: int, count: int) -> list:
+    # Unique, non-dictionary terms, so every explanation reaches the backend.
+    return [f"Load marker {request}-{i}" for i in range(count)]
+
+
+def blocking_request(request: int, terms: int):
+    generate_summary(f"{REPORT}Request {request}", "en")
+    get_or_explain_medical_terms(_terms(request, terms), "en")
+
+
+def fan_out_request(request: int, terms: int):
+    async def summarize():
+        return await asyncio.gather(
+            generate_summary_async(f"{REPORT}Request {request}", "en"),
+            get_or_explain_medical_terms_async(_terms(request, terms), "en"),
+        )
+    run_async(summarize())
+
+
+def measure(handler, requests: int, threads: int, terms: int, offset: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda request: handler(offset + request, terms), range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+def run(requests: int = 64, threads: int = 8, terms: int = 4):
+    print(f"{requests} requests, {threads} threads, 1 summary + 1 call for {terms} terms per request, "
+          f"fake latency {os.environ['FAKE_LLM_LATENCY_MS']} ms")
+    run_async(asyncio.sleep(0))  # start the shared loop outside the timing
+
+    blocking = measure(blocking_request, requests, threads, terms, 0)
+    fan_out = measure(fan_out_request, requests, threads, terms, requests)
+    print(f"{'blocking calls':<16} {blocking:>8.1f} req/s")
+    print(f"{'asyncio fan-out':<16} {fan_out:>8.1f} req/s  ({fan_out / blocking:.2f}x)")
+
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:4]))
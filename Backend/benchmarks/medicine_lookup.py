@@ -0,0 +1,42 @@
+# Lookup latency of the bundled medicine catalog (services/medicine_catalog.py)
+# for each kind of query /medicine/identify sees. Run from Backend/:
+#
+#     python -m benchmarks.medicine_lookup [rounds]
+
+import statistics
+import sys
+import time
+
+from services.medicine_catalog import get_catalog
+
+QUERIES = {
+    "exact": ["Dolo 650", "paracetamol", "Pantocid", "Telma", "Azithral", "Metformin"],
+    "fuzzy": ["dollo 650", "paracitamol", "pantoprazol", "azitromycin", "amoxycilin", "thyronrom"],
+    "phonetic": ["sitrizin", "metphormin", "levocitirizin", "siprofloksasin"],
+    "strength": ["crocin 500mg tablet", "augmentin 625", "amlodipin 5 mg", "shelcal 500 tab"],
+    "miss": ["glycomet gp 1", "warfarin", "insulin glargine", "xyz"],
+}
+
+
+def _percentile(samples: list, share: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * share))]
+
+
+def run(rounds: int = 2000):
+    catalog = get_catalog()
+    print(f"{'query kind':<10} {'resolved':>9} {'p50 µs':>8} {'p95 µs':>8} {'max µs':>8}")
+    for kind, queries in QUERIES.items():
+        resolved = sum(catalog.identify(query) is not None for query in queries)
+        samples = []
+        for _ in range(rounds):
+            for query in queries:
+                start = time.perf_counter()
+                catalog.identify(query)
+                samples.append((time.perf_counter() - start) * 1e6)
+        samples.sort()
+        print(f"{kind:<10} {resolved:>4}/{len(queries):<4} {statistics.median(samples):>8.1f} "
+              f"{_percentile(samples, 0.95):>8.1f} {samples[-1]:>8.1f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
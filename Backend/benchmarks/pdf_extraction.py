@@ -0,0 +1,77 @@
+# Serial against page-range-parallel text extraction (pdf_service.iter_pages)
+# on synthetic multi-hundred-page reports, for uploads held in memory and
+# files on disk. The first parallel run includes starting the pool; later
+# runs reuse it. Run from Backend/:
+#
+#     python -m benchmarks.pdf_extraction [pages ...]
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import fitz
+
+from benchmarks.synthetic_pdf import make_report_pdf
+from services import pdf_service
+from utils.constants import PDF_EXTRACT_WORKERS
+
+ROUNDS = 3
+
+
+def _serial(doc) -> list:
+    return [page.get_text() for page in doc]
+
+
+def _parallel(doc) -> list:
+    # Forces the pool regardless of PDF_PARALLEL_MIN_PAGES.
+    cutoff = pdf_service.PDF_PARALLEL_MIN_PAGES
+    pdf_service.PDF_PARALLEL_MIN_PAGES = 0
+    try:
+        return list(pdf_service.iter_pages(doc))
+    finally:
+        pdf_service.PDF_PARALLEL_MIN_PAGES = cutoff
+
+
+def _time(extract, open_doc) -> tuple:
+    seconds = []
+    for _ in range(ROUNDS):
+        doc = open_doc()
+        start = time.perf_counter()
+        pages = extract(doc)
+        seconds.append(time.perf_counter() - start)
+        doc.close()
+    return statistics.median(seconds), pages
+
+
+def run(page_counts=(100, 300, 600)):
+    print(f"PDF_EXTRACT_WORKERS={PDF_EXTRACT_WORKERS}, {os.cpu_count()} CPUs, median of {ROUNDS} runs")
+    print(f"{'pages':>6} {'source':<7} {'serial p/s':>11} {'parallel p/s':>13} {'speedup':>8} {'same text':>10}")
+
+    start = time.perf_counter()
+    doc = fitz.open(stream=make_report_pdf(8), filetype="pdf")
+    _parallel(doc)
+    doc.close()
+    print(f"(pool start + first batch: {(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for pages in page_counts:
+            data = make_report_pdf(pages)
+            path = os.path.join(directory, f"{pages}.pdf")
+            with open(path, "wb") as f:
+                f.write(data)
+
+            sources = {
+                "memory": lambda: fitz.open(stream=memoryview(data), filetype="pdf"),
+                "file": lambda: fitz.open(path),
+            }
+            for name, open_doc in sources.items():
+                serial, expected = _time(_serial, open_doc)
+                parallel, actual = _time(_parallel, open_doc)
+                print(f"{pages:>6} {name:<7} {pages / serial:>11.0f} {pages / parallel:>13.0f} "
+                      f"{serial / parallel:>7.2f}x {str(actual == expected):>10}")
+
+
+if __name__ == "__main__":
+    run(tuple(int(arg) for arg in sys.argv[1:]) or (100, 300, 600))
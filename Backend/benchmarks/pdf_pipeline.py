@@ -0,0 +1,113 @@
+# Head-to-head of the registered extractors (pdf_service.EXTRACTORS) on a
+# fixture corpus: pages/sec, peak RSS and text-length parity against the
+# PyMuPDF text layer. Each (extractor, document) pair runs in a fresh
+# process, so peak RSS belongs to that extractor alone. Run from Backend/:
+#
+#     python -m benchmarks.pdf_pipeline [extra.pdf ...]
+#
+# The corpus is a text-only and a partly scanned synthetic report, plus any
+# PDFs given on the command line.
+
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_pdf import make_report_pdf
+
+EXTRACTORS = ["pymupdf", "pypdf2", "auto", "ocr"]
+
+
+def _reset_peak_rss():
+    # Linux: start VmHWM (peak RSS) over from the current RSS, so imports
+    # do not count. Elsewhere the peak covers the whole process.
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _rss_mib(field: str) -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in KiB on Linux, bytes on macOS.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _measure(extractor: str, path: str, results):
+    # Runs in a fresh process.
+    import fitz
+    from services.pdf_service import extract_document_pages
+
+    doc = fitz.open(path)
+    baseline = _rss_mib("VmRSS")
+    _reset_peak_rss()
+    try:
+        start = time.perf_counter()
+        pages = extract_document_pages(doc, extractor)
+        seconds = time.perf_counter() - start
+        results.put({
+            "pages": doc.page_count,
+            "seconds": seconds,
+            "chars": sum(len(page.strip()) for page in pages),
+            "empty_pages": sum(1 for page in pages if not page.strip()),
+            "rss_mib": _rss_mib("VmHWM"),
+            "rss_growth_mib": _rss_mib("VmHWM") - baseline,
+        })
+    except Exception as e:
+        results.put({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        doc.close()
+
+
+def measure(extractor: str, path: str) -> dict:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_measure, args=(extractor, path, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def _corpus(directory: str, extra: list) -> dict:
+    corpus = {}
+    for name, pdf in [("text-120p", make_report_pdf(120)), ("mixed-40p", make_report_pdf(40, scanned_every=5))]:
+        path = os.path.join(directory, f"{name}.pdf")
+        with open(path, "wb") as f:
+            f.write(pdf)
+        corpus[name] = path
+    for path in extra:
+        corpus[os.path.basename(path)] = path
+    return corpus
+
+
+def run(extra: list = ()):
+    print(f"{'document':<14} {'extractor':<9} {'pages/s':>9} {'peak RSS MiB':>13} {'+RSS MiB':>9} "
+          f"{'chars':>8} {'vs pymupdf':>11} {'empty pages':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, path in _corpus(directory, list(extra)).items():
+            reference = None
+            for extractor in EXTRACTORS:
+                result = measure(extractor, path)
+                if "error" in result:
+                    print(f"{name:<14} {extractor:<9} unavailable: {result['error'][:70]}")
+                    continue
+                if extractor == "pymupdf":
+                    reference = result["chars"]
+                parity = f"{result['chars'] / reference:.1%}" if reference else "-"
+                print(f"{name:<14} {extractor:<9} {result['pages'] / result['seconds']:>9.1f} "
+                      f"{result['rss_mib']:>13.0f} {result['rss_growth_mib']:>9.1f} {result['chars']:>8} "
+                      f"{parity:>11} {result['empty_pages']:>12}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:])
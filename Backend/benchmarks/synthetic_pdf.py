@@ -0,0 +1,59 @@
+# Synthetic lab reports for the benchmarks: every page has a letterhead, a
+# patient block, a lab table and a page footer, like the uploads we see.
+# Optionally every n-th page is an image only (a "scan" with no text layer).
+
+import fitz
+
+_ROWS = [
+    ("Hemoglobin", "13.5", "g/dL", "12.0-15.5"),
+    ("Total WBC Count", "7,400", "/cumm", "4000-11000"),
+    ("Platelet Count", "2.5", "lakh/cumm", "1.5-4.5"),
+    ("Serum Creatinine", "0.9", "mg/dL", "0.6-1.2"),
+    ("SGPT (ALT)", "32", "U/L", "0-40"),
+    ("Fasting Glucose", "96", "mg/dL", "70-100"),
+    ("Total Cholesterol", "182", "mg/dL", "< 200"),
+    ("TSH", "2.1", "uIU/mL", "0.4-4.0"),
+]
+
+
+def _page_text(number: int, pages: int) -> str:
+    lines = [
+        "City Diagnostics Laboratory, 12 MG Road, Pune 411001",
+        "NABL accredited | Phone 020-5550100",
+        f"Patient Name: Test Patient {number % 7}",
+        "Age: 45 Years   Gender: Female",
+        "UHID: 00012345   Dr. Asha Kulkarni",
+        "",
+        f"Investigation section {number + 1}",
+        "Test Name            Result      Unit        Reference Range",
+    ]
+    for i, (name, value, unit, reference) in enumerate(_ROWS):
+        if (i + number) % 3:
+            lines.append(f"{name:<20} {value:<10} {unit:<10} {reference}")
+    lines += [
+        "",
+        f"Comment: findings on page {number + 1} reviewed by the pathologist.",
+        "This is a computer generated report",
+        f"Page {number + 1} of {pages}",
+    ]
+    return "\n".join(lines)
+
+
+def make_report_pdf(pages: int, scanned_every: int = 0) -> bytes:
+    """A PDF of `pages` report pages; every `scanned_every`-th page is an image."""
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        text = _page_text(number, pages)
+        if scanned_every and number % scanned_every == scanned_every - 1:
+            source = fitz.open()
+            source.new_page().insert_text((50, 60), text, fontsize=9)
+            pixmap = source[0].get_pixmap(dpi=150)
+            source.close()
+            page.insert_image(page.rect, pixmap=pixmap)
+        else:
+            page.insert_text((50, 60), text, fontsize=9)
+    try:
+        return doc.tobytes()
+    finally:
+        doc.close()
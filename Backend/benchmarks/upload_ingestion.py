@@ -0,0 +1,94 @@
+# Upload ingestion: the old path (save the upload under storage/uploads and
+# reopen it by path) against open_uploaded_pdf (memoryview over in-memory
+# uploads, mmap over spooled ones). Reports p50 latency of opening the
+# upload and of open + text extraction, Python-side bytes allocated at peak
+# (tracemalloc) and bytes written to disk per upload. Run from Backend/:
+#
+#     python -m benchmarks.upload_ingestion [pages] [rounds]
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from tempfile import SpooledTemporaryFile
+
+import fitz
+from werkzeug.datastructures import FileStorage
+
+from benchmarks.synthetic_pdf import make_report_pdf
+from services.pdf_service import open_uploaded_pdf
+
+
+def _upload(data: bytes, spool_threshold: int) -> FileStorage:
+    # What utils.upload.SpooledUploadRequest hands the route.
+    stream = SpooledTemporaryFile(max_size=spool_threshold, mode="rb+")
+    stream.write(data)
+    stream.seek(0)
+    return FileStorage(stream=stream, filename="report.pdf", content_type="application/pdf")
+
+
+def _save_and_reopen(file: FileStorage, upload_dir: str):
+    start = time.perf_counter()
+    path = os.path.join(upload_dir, "upload.pdf")
+    file.save(path)
+    doc = fitz.open(path)
+    opened = time.perf_counter() - start
+    try:
+        text = "".join(page.get_text() for page in doc)
+    finally:
+        doc.close()
+    written = os.path.getsize(path)
+    os.remove(path)
+    return opened, text, written
+
+
+def _in_place(file: FileStorage, upload_dir: str):
+    start = time.perf_counter()
+    with open_uploaded_pdf(file) as doc:
+        opened = time.perf_counter() - start
+        text = "".join(page.get_text() for page in doc)
+    return opened, text, 0
+
+
+def _measure(ingest, data: bytes, spool_threshold: int, rounds: int, upload_dir: str) -> dict:
+    opens, seconds, peaks = [], [], []
+    for _ in range(rounds):
+        file = _upload(data, spool_threshold)
+        tracemalloc.start()
+        start = time.perf_counter()
+        opened, text, written = ingest(file, upload_dir)
+        opens.append(opened)
+        seconds.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        file.stream.close()
+    return {
+        "open_ms": statistics.median(opens) * 1000,
+        "ms": statistics.median(seconds) * 1000,
+        "peak_kib": statistics.median(peaks) / 1024,
+        "disk_kib": written / 1024,
+        "chars": len(text),
+    }
+
+
+def run(pages: int = 200, rounds: int = 10):
+    data = make_report_pdf(pages)
+    print(f"📄 {pages}-page PDF, {len(data) / 1024:.0f} KiB, {rounds} rounds each")
+    print(f"{'path':<28} {'open ms':>8} {'total ms':>9} {'py peak KiB':>12} {'disk KiB':>9} {'chars':>8}")
+
+    cases = [
+        ("save + reopen (old)", _save_and_reopen, len(data) + 1),
+        ("in place, in memory", _in_place, len(data) + 1),
+        ("in place, spooled (mmap)", _in_place, 0),
+    ]
+    with tempfile.TemporaryDirectory() as upload_dir:
+        for name, ingest, spool_threshold in cases:
+            result = _measure(ingest, data, spool_threshold, rounds, upload_dir)
+            print(f"{name:<28} {result['open_ms']:>8.2f} {result['ms']:>9.1f} {result['peak_kib']:>12.0f} "
+                  f"{result['disk_kib']:>9.0f} {result['chars']:>8}")
+
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:3]))
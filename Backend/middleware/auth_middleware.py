@@ -1,6 +1,7 @@
 from functools import wraps
 from flask import request, g
 from services.auth_service import verify_firebase_token
+from services.llm_admission import set_request_user
 from utils.exception import AuthError
 
 def auth_required(f):
@@ -15,6 +16,7 @@ def auth_required(f):
         user = verify_firebase_token(token)
 
         g.user = user   # attach user to request context
+        set_request_user(user["uid"])   # per-user LLM admission limits
         return f(*args, **kwargs)
 
     return decorated
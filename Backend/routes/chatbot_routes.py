@@ -149,9 +149,9 @@
 #         "sessionId": session_id
 #     })
 
-from flask import Blueprint, request, g
+from flask import Blueprint, Response, request, g, stream_with_context
 from middleware.auth_middleware import auth_required
-from services.chatbot_service import generate_chat_response
+from services.chatbot_service import generate_chat_response, stream_chat_response
 from services.chatbot_repository import (
     create_chat_session,
     get_chat_session,
@@ -160,7 +160,8 @@ from services.chatbot_repository import (
     get_session_messages
 )
 from services.report_repository import get_report_by_name_and_type
-from utils.response import success_response
+from utils.exception import LLMUnavailableError
+from utils.response import sse_event, start_stream, success_response
 import time
 
 chatbot_bp = Blueprint("chatbot", __name__, url_prefix="/chatbot")
@@ -268,25 +269,22 @@ def get_session(session_id):
     })
 
 
-@chatbot_bp.route("/message", methods=["POST"])
-@auth_required
-def send_message():
+def _load_chat_context(data):
     """
-    Send a message to the chatbot.
-    Body: { sessionId, message, language }
+    Validate a /message body and load what the answer needs.
+    Returns (context, None) or (None, error_response).
     """
-    data = request.json
     session_id = data.get("sessionId")
     user_message = data.get("message")
     language = data.get("language", "en")
 
     if not session_id or not user_message:
-        return {"error": "sessionId and message required"}, 400
+        return None, ({"error": "sessionId and message required"}, 400)
     
     # Get session
     session = get_chat_session(session_id, g.user["uid"])
     if not session:
-        return {"error": "Session not found"}, 404
+        return None, ({"error": "Session not found"}, 404)
     
     # Try to get report with retry (in case it wasn't found during session creation)
     report = get_report_with_retry(
@@ -298,7 +296,7 @@ def send_message():
     
     if not report:
         # Even if report not found, we can still try to help with general medical questions
-        return {"error": "Report not found. Please try uploading it again."}, 404
+        return None, ({"error": "Report not found. Please try uploading it again."}, 404)
     
     report_summary = report.get("summary", "")
     
@@ -315,10 +313,35 @@ def send_message():
     
     # Add user message to session
     add_message_to_session(session_id, "user", user_message, g.user["uid"])
+
+    return {
+        "session_id": session_id,
+        "user_message": user_message,
+        "language": language,
+        "report_summary": report_summary,
+        "messages": messages,
+    }, None
+
+
+@chatbot_bp.route("/message", methods=["POST"])
+@auth_required
+def send_message():
+    """
+    Send a message to the chatbot.
+    Body: { sessionId, message, language }
+    """
+    context, error = _load_chat_context(request.json)
+    if error:
+        return error
+    session_id = context["session_id"]
     
     # Generate chatbot response
     try:
-        bot_response = generate_chat_response(user_message, report_summary, messages, language)
+        bot_response = generate_chat_response(
+            context["user_message"], context["report_summary"], context["messages"], context["language"]
+        )
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         print(f"❌ Error generating response: {str(e)}")
         return {"error": f"Failed to generate response: {str(e)}"}, 500
@@ -329,4 +352,62 @@ def send_message():
     return success_response({
         "response": bot_response,
         "sessionId": session_id
-    })
\ No newline at end of file
+    })
+
+
+@chatbot_bp.route("/message/stream", methods=["POST"])
+@auth_required
+def stream_message():
+    """
+    Streaming version of /message over Server-Sent Events.
+    Body: { sessionId, message, language }
+
+    Emits `token` events ({"text"}) as the answer is generated, then one
+    `done` event ({"response", "sessionId"}) after the full answer has been
+    saved to the session, or an `error` event ({"error"}). A rejected or
+    failed LLM call is answered before the stream starts (429 with
+    Retry-After, or 503), and any other error before the first chunk gets
+    the same JSON 500 as /message.
+    """
+    context, error = _load_chat_context(request.json)
+    if error:
+        return error
+
+    user_id = g.user["uid"]
+    session_id = context["session_id"]
+
+    # Admission and the first chunk happen before the response starts.
+    try:
+        tokens = start_stream(stream_chat_response(
+            context["user_message"], context["report_summary"], context["messages"], context["language"]
+        ))
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        print(f"❌ Error generating response: {str(e)}")
+        return {"error": f"Failed to generate response: {str(e)}"}, 500
+
+    def events():
+        parts = []
+        try:
+            for text in tokens:
+                parts.append(text)
+                yield sse_event("token", {"text": text})
+        except LLMUnavailableError as e:
+            yield sse_event("error", e.to_dict())
+            return
+        except Exception as e:
+            print(f"❌ Error streaming response: {str(e)}")
+            yield sse_event("error", {"error": f"Failed to generate response: {str(e)}"})
+            return
+
+        # Only a completed answer is saved, same as the non-streaming route.
+        bot_response = "".join(parts)
+        add_message_to_session(session_id, "assistant", bot_response, user_id)
+        yield sse_event("done", {"response": bot_response, "sessionId": session_id})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
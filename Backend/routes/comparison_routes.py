@@ -68,7 +68,7 @@ def compare():
         raise ReportNotFoundError()
 
     # Compare
-    comparison_text = compare_reports(old_report, new_report, language)
+    comparison = compare_reports(old_report, new_report, language)
 
     # Store comparison
     comparison_id = save_comparison({
@@ -77,12 +77,12 @@ def compare():
         "oldReportType": old_type,
         "newReportName": new_name,
         "newReportType": new_type,
-        "comparisonText": comparison_text
+        "comparisonText": comparison
     })
 
     return success_response({
         "comparisonId": comparison_id,
-        "comparison": comparison_text
+        "comparison": comparison
     })
 
 
@@ -1,7 +1,53 @@
 from flask import Blueprint
+from middleware.auth_middleware import auth_required
+from services.llm_gateway import get_gateway_stats
+from services.medical_term_dictionary import get_dictionary_stats
+from services.medicine_catalog import get_catalog_stats
+from services.response_cache import get_response_cache_stats
+from services.summary_cache import get_summary_cache_stats
+from services.symptom_triage import get_triage_stats
+from utils.response import success_response
 
 health_bp = Blueprint("health", __name__)
 
+# Liveness check for the load balancer, so it stays open. The stats
+# endpoints below reveal cache and traffic details and need a signed-in user.
 @health_bp.route("/health")
 def health():
     return "Backend running"
+
+
+@health_bp.route("/health/summary-cache")
+@auth_required
+def summary_cache_stats():
+    return success_response(get_summary_cache_stats())
+
+
+@health_bp.route("/health/response-cache")
+@auth_required
+def response_cache_stats():
+    return success_response(get_response_cache_stats())
+
+
+@health_bp.route("/health/llm")
+@auth_required
+def llm_gateway_stats():
+    return success_response(get_gateway_stats())
+
+
+@health_bp.route("/health/term-dictionary")
+@auth_required
+def term_dictionary_stats():
+    return success_response(get_dictionary_stats())
+
+
+@health_bp.route("/health/medicine-catalog")
+@auth_required
+def medicine_catalog_stats():
+    return success_response(get_catalog_stats())
+
+
+@health_bp.route("/health/symptom-triage")
+@auth_required
+def symptom_triage_stats():
+    return success_response(get_triage_stats())
@@ -1,7 +1,9 @@
 from flask import Blueprint, request, g
 from middleware.auth_middleware import auth_required
 from utils.response import success_response
-from services.gemini_service import explain_medical_term
+from services.medical_term_dictionary import autocomplete_terms
+from services.response_cache import get_or_explain_medical_term, get_or_explain_medical_terms
+from utils.constants import MEDICAL_TERM_AUTOCOMPLETE_MAX, MEDICAL_TERM_BATCH_MAX
 
 medical_term_bp = Blueprint("medical_term", __name__, url_prefix="/medical-term")
 
@@ -18,10 +20,55 @@ def explain_term():
     if not term:
         return {"error": "term is required"}, 400
     
-    explanation = explain_medical_term(term, language)
+    explanation = get_or_explain_medical_term(term, language)
     
     return success_response({
         "term": term,
         "explanation": explanation,
         "language": language
-    })
\ No newline at end of file
+    })
+
+
+@medical_term_bp.route("/explain-batch", methods=["POST"])
+@auth_required
+def explain_terms():
+    """
+    Explain several medical terms in one request.
+    Body: { terms: [...], language }
+    """
+    data = request.json
+    terms = data.get("terms")
+    language = data.get("language", "en")
+
+    if not isinstance(terms, list) or not terms:
+        return {"error": "terms must be a non-empty list"}, 400
+    if len(terms) > MEDICAL_TERM_BATCH_MAX:
+        return {"error": f"at most {MEDICAL_TERM_BATCH_MAX} terms per request"}, 400
+    if not all(isinstance(term, str) and term.strip() for term in terms):
+        return {"error": "every term must be a non-empty string"}, 400
+
+    explanations = get_or_explain_medical_terms(terms, language)
+
+    return success_response({
+        "explanations": explanations,
+        "language": language
+    })
+
+
+@medical_term_bp.route("/autocomplete", methods=["GET"])
+@auth_required
+def autocomplete():
+    """
+    Suggest dictionary terms for a partly typed term.
+    Query: ?q=<prefix>&limit=<n>
+    """
+    query = request.args.get("q", "")
+    limit = min(request.args.get("limit", MEDICAL_TERM_AUTOCOMPLETE_MAX, type=int), MEDICAL_TERM_AUTOCOMPLETE_MAX)
+
+    if not query.strip():
+        return {"error": "q is required"}, 400
+
+    return success_response({
+        "query": query,
+        "suggestions": autocomplete_terms(query, max(1, limit))
+    })
@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from services.gemini_service import identify_medicine
+from services.response_cache import get_or_identify_medicine
 from firebase_admin import auth
 from utils.exception import AppException
 
@@ -24,9 +24,11 @@ def identify_medicine_route():
         if not medicine_name:
             return jsonify({'error': 'Medicine name is required'}), 400
 
-        result = identify_medicine(medicine_name, language)
+        result = get_or_identify_medicine(medicine_name, language)
         return jsonify({'success': True, 'data': result})
 
+    except AppException:
+        raise
     except Exception as e:
         print(f"Error identifying medicine: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -0,0 +1,30 @@
+from flask import Blueprint
+from middleware.auth_middleware import auth_required
+from services.llm_metrics import get_llm_metrics, get_llm_route_metrics
+from services.model_router import get_routes
+from utils.response import success_response
+
+metrics_bp = Blueprint("metrics", __name__, url_prefix="/metrics")
+
+
+@metrics_bp.route("/llm")
+@auth_required
+def llm_metrics():
+    """
+    Per-endpoint LLM call counts, errors, models, cache hits/misses and
+    histograms of latency and prompt/candidate tokens.
+    """
+    return success_response(get_llm_metrics())
+
+
+@metrics_bp.route("/llm/routes")
+@auth_required
+def llm_route_metrics():
+    """
+    The model routing table and, per route, call counts, errors, models
+    and a latency histogram.
+    """
+    return success_response({
+        "routes": get_routes(),
+        "metrics": get_llm_route_metrics()
+    })
@@ -27,15 +27,16 @@
 
 
 
-from flask import Blueprint, request, g
+import traceback
+from flask import Blueprint, Response, request, g, stream_with_context
 from middleware.auth_middleware import auth_required
-from services.report_service import process_report
+from services.report_service import prepare_report, process_report, stream_report_summary
 from services.report_repository import (
     get_reports_for_user,
     get_report_by_name_and_type
 )
-from utils.response import success_response
-from utils.exception import ReportNotFoundError
+from utils.response import sse_event, start_stream, success_response
+from utils.exception import LLMUnavailableError, ReportNotFoundError, ReportProcessingError
 from services.report_repository import get_report_by_name_and_type
 from services.comparison_service import compare_reports
 
@@ -87,6 +88,58 @@ def upload():
         "userId": g.user["uid"],
         "language": language
     })
+
+
+@report_bp.route("/upload/stream", methods=["POST"])
+@auth_required
+def upload_stream():
+    """
+    Same as /upload, but answers with Server-Sent Events so the upload
+    screen can show charts and insights while the summary is generated:
+    `visualization`, `insight`, `summary_text` and finally `done` (the
+    /upload response data), or `error`. A rejected or failed LLM call is
+    answered before the stream starts (429 with Retry-After, or 503).
+    """
+    file = request.files.get("file")
+    report_type = request.form.get("reportType")
+    language = request.form.get("language", "en")
+
+    if not file or not report_type:
+        return {"error": "Missing file or reportType"}, 400
+
+    try:
+        safe_text, visualizations = prepare_report(file)
+    except Exception:
+        traceback.print_exc()
+        raise ReportProcessingError()
+
+    # Admission and the first summary chunk happen before the response
+    # starts, so a rejected LLM call is answered with 429 + Retry-After.
+    try:
+        events = start_stream(stream_report_summary(
+            safe_text, visualizations, g.user["uid"], file.filename, report_type, language
+        ))
+    except LLMUnavailableError:
+        raise
+    except Exception:
+        traceback.print_exc()
+        raise ReportProcessingError()
+
+    def stream():
+        try:
+            for event, data in events:
+                yield sse_event(event, data)
+        except LLMUnavailableError as e:
+            yield sse_event("error", e.to_dict())
+        except Exception:
+            traceback.print_exc()
+            yield sse_event("error", {"error": ReportProcessingError.message})
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 # Dropdown list
 # @report_bp.route("", methods=["GET"])
 # @auth_required
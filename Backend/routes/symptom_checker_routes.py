@@ -1,27 +1,107 @@
-from flask import Blueprint, request, g
+from flask import Blueprint, Response, request, g, stream_with_context
 from middleware.auth_middleware import auth_required
-from utils.response import success_response
-from services.gemini_service import analyze_symptoms
+from utils.exception import LLMUnavailableError
+from utils.response import success_response, sse_event, start_stream
+from services.gemini_service import analyze_symptoms, stream_symptom_analysis
+from services.symptom_triage import check_red_flags
 
 symptom_checker_bp = Blueprint("symptom_checker", __name__, url_prefix="/symptom-checker")
 
+
+def _triage_fields(red_flags) -> dict:
+    return {
+        "emergency": red_flags is not None,
+        "redFlags": red_flags["categories"] if red_flags else [],
+    }
+
+
 @symptom_checker_bp.route("/analyze", methods=["POST"])
 @auth_required
 def analyze_symptoms_route():
     """
     Analyze symptoms and provide possible conditions
+    Body: { symptoms, language, explain }
+
+    Descriptions with red flags (chest pain, can't breathe, ...) are
+    answered at once with emergency guidance and no LLM call. Pass
+    "explain": true to also wait for the LLM explanation, or use
+    /analyze/stream to get the guidance first and the explanation after.
     """
     data = request.json
     symptoms = data.get("symptoms")
     language = data.get("language", "en")
-    
+
     if not symptoms:
         return {"error": "symptoms description is required"}, 400
-    
-    analysis = analyze_symptoms(symptoms, language)
-    
+
+    red_flags = check_red_flags(symptoms, language)
+    if red_flags and not data.get("explain"):
+        analysis = red_flags["guidance"]
+    elif red_flags:
+        analysis = red_flags["guidance"] + "\n\n" + analyze_symptoms(symptoms, language)
+    else:
+        analysis = analyze_symptoms(symptoms, language)
+
     return success_response({
         "symptoms": symptoms,
         "analysis": analysis,
-        "language": language
-    })
\ No newline at end of file
+        "language": language,
+        **_triage_fields(red_flags)
+    })
+
+
+@symptom_checker_bp.route("/analyze/stream", methods=["POST"])
+@auth_required
+def analyze_symptoms_stream():
+    """
+    Streaming version of /analyze over Server-Sent Events.
+    Body: { symptoms, language }
+
+    Emits one `triage` event ({"emergency", "redFlags", "guidance"}) before
+    any LLM call, then `token` events ({"text"}) of the explanation, then
+    one `done` event ({"analysis"}), or an `error` event ({"error"}).
+    Without red flags a rejected or failed LLM call is answered before the
+    stream starts (429 with Retry-After, or 503).
+    """
+    data = request.json
+    symptoms = data.get("symptoms")
+    language = data.get("language", "en")
+
+    if not symptoms:
+        return {"error": "symptoms description is required"}, 400
+
+    red_flags = check_red_flags(symptoms, language)
+
+    tokens = stream_symptom_analysis(symptoms, language)
+    if not red_flags:
+        # Admission and the first chunk happen before the response starts.
+        # Emergency guidance is never held back for them: with red flags
+        # the triage event goes out first, whatever the LLM does.
+        tokens = start_stream(tokens)
+
+    def events():
+        yield sse_event("triage", {
+            **_triage_fields(red_flags),
+            "guidance": red_flags["guidance"] if red_flags else None
+        })
+
+        parts = []
+        try:
+            for text in tokens:
+                parts.append(text)
+                yield sse_event("token", {"text": text})
+        except LLMUnavailableError as e:
+            yield sse_event("error", e.to_dict())
+            return
+        except Exception as e:
+            print(f"❌ Error streaming symptom analysis: {str(e)}")
+            yield sse_event("error", {"error": f"Failed to analyze symptoms: {str(e)}"})
+            return
+
+        yield sse_event("done", {"analysis": "".join(parts)})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
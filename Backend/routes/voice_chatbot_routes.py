@@ -238,6 +238,7 @@ from services.chatbot_repository import (
     get_chat_session,
     add_message_to_session
 )
+from utils.exception import LLMUnavailableError
 from utils.response import success_response
 import base64
 
@@ -378,6 +379,8 @@ def send_voice_message():
             "language": language
         })
     
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         print(f"❌ Error in voice message: {str(e)}")
         import traceback
@@ -58,7 +58,10 @@
 #     except Exception as e:
 #         raise Exception(f"Error generating chat response: {str(e)}")
 
-from services.gemini_service import client
+import time
+from services.llm_gateway import generate_content, generate_content_stream
+from services.model_router import route
+from utils.exception import LLMUnavailableError
 from utils.language import get_language_instruction
 
 def generate_chat_response(
@@ -68,6 +71,54 @@ def generate_chat_response(
     language: str = "en"
 ) -> str:
 
+    prompt = _chat_prompt(user_message, report_summary, conversation_history, language)
+
+    try:
+        response = generate_content(**route("chat", prompt))
+
+        if not hasattr(response, "text") or not response.text:
+            raise ValueError("Empty or invalid response from Gemini API")
+
+        return response.text
+
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        raise Exception(f"Error generating chat response: {str(e)}")
+
+
+def stream_chat_response(
+    user_message: str,
+    report_summary: str,
+    conversation_history: list = None,
+    language: str = "en"
+):
+    """
+    Same answer as generate_chat_response, yielded as text chunks while
+    Gemini generates it. Logs time-to-first-token and total time.
+    """
+    prompt = _chat_prompt(user_message, report_summary, conversation_history, language)
+
+    started = time.perf_counter()
+    first_token = None
+    chunks = 0
+
+    for chunk in generate_content_stream(**route("chat", prompt)):
+        text = chunk.text
+        if not text:
+            continue
+        if first_token is None:
+            first_token = time.perf_counter() - started
+            print(f"⏱️ Chat time to first token: {first_token:.2f}s")
+        chunks += 1
+        yield text
+
+    if first_token is None:
+        raise ValueError("Empty or invalid response from Gemini API")
+    print(f"✅ Chat stream finished: {chunks} chunks in {time.perf_counter() - started:.2f}s")
+
+
+def _chat_prompt(user_message: str, report_summary: str, conversation_history: list, language: str) -> str:
     # Build conversation context
     history_context = ""
     if conversation_history:
@@ -174,17 +225,4 @@ User Question: {user_message}
 
 Provide a comprehensive, empathetic, and clear response. End with: "Please discuss these specific findings with your doctor for a proper diagnosis."
 """
-
-    try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt
-        )
-
-        if not hasattr(response, "text") or not response.text:
-            raise ValueError("Empty or invalid response from Gemini API")
-
-        return response.text
-
-    except Exception as e:
-        raise Exception(f"Error generating chat response: {str(e)}")
+    return prompt
@@ -2,20 +2,76 @@
 
 import re
 
-def anonymize(text: str) -> str:
-    rules = [
-        r"(Patient Name|Name)\s*[:\-].*",
-        r"(Age|DOB)\s*[:\-].*",
-        r"(Gender|Sex)\s*[:\-].*",
-        r"(UHID|Patient ID|MRN)\s*[:\-].*",
-        r"\b\d{10}\b",
-        r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b",
-        r"(Dr\.?\s+[A-Za-z ]+)",
-        r"(Hospital|Clinic)\s*[:\-].*"
-    ]
+REDACTED = "[REDACTED]"
+
+# Applied in order, each on the output of the previous one. Rules that
+# start with a fixed label list the (lowercase) literals every match must
+# start with, so they can be located with str.find instead of a regex scan.
+RULES = [
+    (r"(Patient Name|Name)\s*[:\-].*", ("patient name", "name")),
+    (r"(Age|DOB)\s*[:\-].*", ("age", "dob")),
+    (r"(Gender|Sex)\s*[:\-].*", ("gender", "sex")),
+    (r"(UHID|Patient ID|MRN)\s*[:\-].*", ("uhid", "patient id", "mrn")),
+    (r"\b\d{10}\b", None),
+    (r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b", None),
+    (r"(Dr\.?\s+[A-Za-z ]+)", ("dr",)),
+    (r"(Hospital|Clinic)\s*[:\-].*", ("hospital", "clinic")),
+]
+
+_COMPILED_RULES = [(re.compile(rule, re.IGNORECASE), literals) for rule, literals in RULES]
+
+
+def _find_all(haystack: str, needle: str):
+    i = haystack.find(needle)
+    while i != -1:
+        yield i
+        i = haystack.find(needle, i + 1)
+
+
+def _sub_anchored(pattern, literals, text: str) -> str:
+    # Same result as pattern.sub(REDACTED, text) for ASCII text: a match can
+    # only start where one of its literals occurs, so only those positions
+    # are tried, left to right, skipping any inside the previous match.
+    lowered = text.lower()
+    starts = sorted({i for literal in literals for i in _find_all(lowered, literal)})
+
+    parts = []
+    last = 0
+    for pos in starts:
+        if pos < last:
+            continue
+        match = pattern.match(text, pos)
+        if match:
+            parts.append(text[last:pos])
+            parts.append(REDACTED)
+            last = match.end()
+
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+def _anonymize_one(text: str) -> str:
+    # Case-insensitive matching and str.lower() only agree on ASCII, so
+    # anything else takes the plain regex path.
+    anchored = text.isascii()
 
     sanitized = text
-    for rule in rules:
-        sanitized = re.sub(rule, "[REDACTED]", sanitized, flags=re.IGNORECASE)
+    for pattern, literals in _COMPILED_RULES:
+        if anchored and literals:
+            sanitized = _sub_anchored(pattern, literals, sanitized)
+        else:
+            sanitized = pattern.sub(REDACTED, sanitized)
 
     return sanitized
+
+
+def anonymize(text):
+    """
+    Redact patient identifiers from report text.
+    Accepts a single string or a list of strings (returns the same shape).
+    """
+    if isinstance(text, (list, tuple)):
+        return [_anonymize_one(t) for t in text]
+    return _anonymize_one(text)
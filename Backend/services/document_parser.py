@@ -1,8 +1,12 @@
 from PyPDF2 import PdfReader
 
-def extract_text(file):
+def extract_pages(file):
     reader = PdfReader(file)
-    text = "\n".join(page.extract_text() or "" for page in reader.pages)
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+def extract_text(file):
+    text = "\n".join(extract_pages(file))
 
     if not text.strip():
         raise ValueError("No readable text found in PDF")
@@ -0,0 +1,243 @@
+# Offline stand-in for the Gemini client (LLM_BACKEND=fake), for load tests
+# and benchmarks on one box without network access or an API key.
+#
+# It exposes the same surface the gateway uses (models.generate_content,
+# models.generate_content_stream, aio.models.generate_content) and answers
+# every prompt with a canned response of the right shape after a random
+# delay, failing a configurable share of calls with a 503.
+
+import asyncio
+import json
+import random
+import threading
+import time
+
+from google.genai import errors, types
+
+from utils.constants import (
+    FAKE_LLM_ERROR_RATE,
+    FAKE_LLM_LATENCY_MS,
+    FAKE_LLM_LATENCY_SIGMA,
+    FAKE_LLM_SEED,
+    FAKE_LLM_STREAM_CHUNKS,
+)
+
+_SUMMARY = {
+    "insights": [
+        {
+            "category": "Blood Health",
+            "emoji": "🩸",
+            "insight": "Hemoglobin and blood cell counts are within the reference ranges.",
+            "status": "positive",
+        },
+        {
+            "category": "Blood Sugar",
+            "emoji": "🍬",
+            "insight": "Fasting glucose is slightly above the reference range.",
+            "status": "warning",
+        },
+        {
+            "category": "Kidney Function",
+            "emoji": "🫘",
+            "insight": "Creatinine and urea are within the reference ranges.",
+            "status": "positive",
+        },
+    ],
+    "summary_text": (
+        "1. **What the Report Is About**\nThis is a routine blood test.\n\n"
+        "2. **Key Findings**\nMost values are within range.\n\n"
+        "3. **Values Outside Range**\nFasting glucose is slightly high.\n\n"
+        "4. **Doctor Notes**\nNot mentioned in the report.\n\n"
+        "5. **Disclaimer**\nThis explanation is for understanding only. Please consult your doctor."
+    ),
+}
+
+_COMPARISON = {
+    "overall_status": "Improved",
+    "status_color": "green",
+    "changes": [
+        {
+            "parameter": "Hemoglobin",
+            "change_type": "Improved",
+            "details": "Increased from 11.2 to 13.5 g/dL",
+            "significance": "Now within the normal range.",
+        }
+    ],
+    "visualizations": [
+        {"label": "Hemoglobin", "old_value": 11.2, "new_value": 13.5, "unit": "g/dL"}
+    ],
+    "summary_markdown": "Your **hemoglobin** has improved since the last report.",
+    "recommendation": "Keep following your doctor's advice.",
+    "disclaimer": "This comparison is for understanding only. Please consult your doctor.",
+}
+
+_MEDICINE = {
+    "purpose": "Pain relief & fever",
+    "best_time": "After food",
+    "side_effects": "Nausea, Gastric irritation",
+    "name_confirmed": "Paracetamol",
+}
+
+
+def _term_explanations(prompt: str) -> dict:
+    # Batch medical term prompt: answer every "- term" line under "Medical Terms:".
+    listed = prompt.split("Medical Terms:", 1)[1].split("\n\n", 1)[0]
+    terms = [line[2:].strip() for line in listed.strip().splitlines() if line.startswith("- ")]
+    return {
+        "explanations": [
+            {"term": term, "explanation": f"{term} is a placeholder explanation from the offline test backend."}
+            for term in terms
+        ]
+    }
+
+
+# JSON responses by the name of the requested response_schema
+# (services/llm_schemas.py), which also covers schema repair prompts.
+_SCHEMA_RESPONSES = {
+    "ReportSummary": _SUMMARY,
+    "ComparisonAnalysis": _COMPARISON,
+    "MedicineInfo": _MEDICINE,
+}
+
+# Prompts without a schema: (marker found only in that prompt, JSON response
+# or a function building it from the prompt), checked in order; JSON prompts
+# matching none of them get the summary.
+_JSON_RESPONSES = [
+    ('"overall_status"', _COMPARISON),
+    ('"name_confirmed"', _MEDICINE),
+    ('"explanations"', _term_explanations),
+]
+
+_TEXT_RESPONSE = (
+    "This is a placeholder answer from the offline test backend. "
+    "It does not reflect the report. "
+    "Please discuss these specific findings with your doctor for a proper diagnosis."
+)
+
+
+def _prompt_text(contents) -> str:
+    if isinstance(contents, str):
+        return contents
+    if isinstance(contents, list):
+        return "\n".join(_prompt_text(part) for part in contents)
+    return str(contents)
+
+
+def _config_value(config, name: str):
+    if config is None:
+        return None
+    if isinstance(config, dict):
+        return config.get(name)
+    return getattr(config, name, None)
+
+
+def _wants_json(config) -> bool:
+    return _config_value(config, "response_mime_type") == "application/json"
+
+
+def canned_response_text(contents, config=None) -> str:
+    """The text the fake backend answers `contents` with."""
+    if not _wants_json(config):
+        return _TEXT_RESPONSE
+
+    schema = getattr(_config_value(config, "response_schema"), "__name__", None)
+    if schema in _SCHEMA_RESPONSES:
+        return json.dumps(_SCHEMA_RESPONSES[schema], ensure_ascii=False)
+
+    prompt = _prompt_text(contents)
+    for marker, payload in _JSON_RESPONSES:
+        if marker in prompt:
+            if callable(payload):
+                payload = payload(prompt)
+            return json.dumps(payload, ensure_ascii=False)
+    return json.dumps(_SUMMARY, ensure_ascii=False)
+
+
+def _response(text: str, prompt_chars: int) -> types.GenerateContentResponse:
+    return types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(role="model", parts=[types.Part(text=text)]),
+                finish_reason=types.FinishReason.STOP,
+            )
+        ],
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt_chars // 4,
+            candidates_token_count=len(text) // 4,
+            total_token_count=(prompt_chars + len(text)) // 4,
+        ),
+    )
+
+
+class _FakeBehaviour:
+    # Latency and failures shared by the sync and async faces.
+
+    def __init__(self):
+        self._random = random.Random(FAKE_LLM_SEED)
+        self._lock = threading.Lock()
+
+    def latency(self) -> float:
+        # Log-normal around FAKE_LLM_LATENCY_MS, which gives the long right
+        # tail real LLM latencies have; sigma 0 means a fixed delay.
+        with self._lock:
+            factor = self._random.lognormvariate(0, FAKE_LLM_LATENCY_SIGMA) if FAKE_LLM_LATENCY_SIGMA > 0 else 1
+        return FAKE_LLM_LATENCY_MS * factor / 1000
+
+    def maybe_fail(self):
+        with self._lock:
+            failed = self._random.random() < FAKE_LLM_ERROR_RATE
+        if failed:
+            raise errors.ServerError(
+                503, {"error": {"code": 503, "message": "Fake backend error", "status": "UNAVAILABLE"}}
+            )
+
+
+class _FakeModels:
+    def __init__(self, behaviour: _FakeBehaviour):
+        self._behaviour = behaviour
+
+    def generate_content(self, model: str, contents, config=None):
+        time.sleep(self._behaviour.latency())
+        self._behaviour.maybe_fail()
+        return _response(canned_response_text(contents, config), len(_prompt_text(contents)))
+
+    def generate_content_stream(self, model: str, contents, config=None):
+        # Most of the latency is spent before the first chunk, the rest is
+        # spread over the remaining chunks.
+        total = self._behaviour.latency()
+        time.sleep(total * 0.5)
+        self._behaviour.maybe_fail()
+
+        text = canned_response_text(contents, config)
+        size = max(1, -(-len(text) // FAKE_LLM_STREAM_CHUNKS))
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+        prompt_chars = len(_prompt_text(contents))
+
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(total * 0.5 / max(1, len(pieces) - 1))
+            yield _response(piece, prompt_chars)
+
+
+class _FakeAsyncModels:
+    def __init__(self, behaviour: _FakeBehaviour):
+        self._behaviour = behaviour
+
+    async def generate_content(self, model: str, contents, config=None):
+        await asyncio.sleep(self._behaviour.latency())
+        self._behaviour.maybe_fail()
+        return _response(canned_response_text(contents, config), len(_prompt_text(contents)))
+
+
+class _FakeAio:
+    def __init__(self, behaviour: _FakeBehaviour):
+        self.models = _FakeAsyncModels(behaviour)
+
+
+class FakeClient:
+    """Drop-in for genai.Client as far as services/llm_gateway.py uses it."""
+
+    def __init__(self):
+        behaviour = _FakeBehaviour()
+        self.models = _FakeModels(behaviour)
+        self.aio = _FakeAio(behaviour)
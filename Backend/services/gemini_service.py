@@ -71,12 +71,273 @@
 #     response = model.generate_content(prompt)
 #     return response.text
 
-from google import genai
-import os
+import asyncio
+import json
+from pydantic import ValidationError
+from services.llm_gateway import generate_content, generate_content_async, generate_content_stream, run_async
+from services.llm_metrics import record_schema_validation
+from services.llm_schemas import ComparisonAnalysis, MedicalTermExplanations, MedicineInfo, ReportSummary
+from services.model_router import route
+from utils.constants import (
+    LLM_SCHEMA_REPAIR_ATTEMPTS,
+    SUMMARY_CHUNK_CHARS,
+    SUMMARY_MAP_REDUCE_CHARS,
+    SUMMARY_MAP_WORKERS,
+)
+from utils.exception import LLMOutputInvalidError
+
+# Bump whenever the generate_summary prompt changes so cached summaries
+# produced by the old prompt are no longer served.
+SUMMARY_PROMPT_VERSION = "v3"
+
+# Same for the cached medical term and medicine prompts (services/response_cache.py).
+MEDICAL_TERM_PROMPT_VERSION = "v1"
+MEDICINE_PROMPT_VERSION = "v2"
+
+
+def _strip_json_fences(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:].strip()
+    elif text.startswith("```"):
+        text = text[3:].strip()
+    if text.endswith("```"):
+        text = text[:-3].strip()
+    return text
+
+
+def _validate(schema, text: str) -> dict:
+    # An answer cut off by max_output_tokens can come back without text.
+    return schema.model_validate_json(_strip_json_fences(text or "")).model_dump()
+
+
+def _structured(schema, text: str) -> dict:
+    """
+    Validate a JSON answer against `schema` and return it as a dict. An
+    answer that does not validate is sent back to the model together with
+    the errors, up to LLM_SCHEMA_REPAIR_ATTEMPTS times, before giving up
+    with LLMOutputInvalidError.
+    """
+    for attempt in range(LLM_SCHEMA_REPAIR_ATTEMPTS + 1):
+        try:
+            data = _validate(schema, text)
+        except ValidationError as e:
+            error = e
+        else:
+            record_schema_validation(schema.__name__, "valid" if attempt == 0 else "repaired")
+            return data
+
+        print(f"⚠️ {schema.__name__} answer failed validation ({error.error_count()} errors)")
+        if attempt < LLM_SCHEMA_REPAIR_ATTEMPTS:
+            text = generate_content(**_repair_request(schema, text, error)).text
+
+    record_schema_validation(schema.__name__, "invalid")
+    raise LLMOutputInvalidError()
+
+
+async def _structured_async(schema, text: str) -> dict:
+    for attempt in range(LLM_SCHEMA_REPAIR_ATTEMPTS + 1):
+        try:
+            data = _validate(schema, text)
+        except ValidationError as e:
+            error = e
+        else:
+            record_schema_validation(schema.__name__, "valid" if attempt == 0 else "repaired")
+            return data
+
+        print(f"⚠️ {schema.__name__} answer failed validation ({error.error_count()} errors)")
+        if attempt < LLM_SCHEMA_REPAIR_ATTEMPTS:
+            text = (await generate_content_async(**_repair_request(schema, text, error))).text
+
+    record_schema_validation(schema.__name__, "invalid")
+    raise LLMOutputInvalidError()
+
+
+def _repair_request(schema, text: str, error: ValidationError) -> dict:
+    # Only the broken answer and what is wrong with it are sent back, not
+    # the original (possibly very long) prompt.
+    problems = "\n".join(
+        f"- {'.'.join(str(part) for part in item['loc']) or '(root)'}: {item['msg']}"
+        for item in error.errors(include_url=False)
+    )
+
+    prompt = f"""
+The JSON below was supposed to match the required response schema but failed validation.
+
+Problems:
+{problems}
+
+JSON:
+{text}
+
+Return the corrected JSON only. Keep the content as it is; change only what is needed to fix the problems listed.
+"""
+
+    return route("schema_repair", prompt, {
+        'response_mime_type': 'application/json',
+        'response_schema': schema
+    })
+
+
+def validate_summary(text: str) -> dict:
+    """
+    Validate summary JSON that was produced by generate_summary_stream,
+    repairing it like generate_summary does.
+    """
+    return _structured(ReportSummary, text)
+
+
+def generate_summary(text: str, language: str) -> dict:
+    """
+    Summarize a report as a validated {insights, summary_text} dict.
+    Reports longer than SUMMARY_MAP_REDUCE_CHARS are summarized in chunks
+    (see generate_chunked_summary).
+    """
+    if len(text) > SUMMARY_MAP_REDUCE_CHARS:
+        return generate_chunked_summary(text, language)
+    return _generate_single_summary(text, language)
+
+
+async def generate_summary_async(text: str, language: str) -> dict:
+    if len(text) > SUMMARY_MAP_REDUCE_CHARS:
+        return await generate_chunked_summary_async(text, language)
+    return await _generate_single_summary_async(text, language)
+
+
+def split_report_text(text: str, max_chars: int = SUMMARY_CHUNK_CHARS) -> list:
+    """
+    Split report text into chunks of at most max_chars, breaking only at
+    line boundaries and preferring to start a chunk at a section heading.
+    """
+    chunks = []
+    current = []
+    size = 0
+
+    for line in text.splitlines():
+        is_heading = line.isupper() and len(line.strip()) > 3
+        # Close the chunk early at a heading once it is reasonably full, so
+        # sections are not cut in half.
+        if current and (size + len(line) > max_chars or (is_heading and size > max_chars * 0.6)):
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def generate_chunked_summary(text: str, language: str) -> dict:
+    """
+    Map-reduce summary for very long reports: every chunk is summarized
+    concurrently (up to SUMMARY_MAP_WORKERS calls at once), then one more
+    call merges the partial results into a single JSON summary.
+    """
+    return run_async(generate_chunked_summary_async(text, language))
+
+
+async def generate_chunked_summary_async(text: str, language: str) -> dict:
+    partials = await _summarize_chunks_async(text, language)
+    return await _merge_summaries_async(partials, language)
+
+
+async def _summarize_chunks_async(text: str, language: str) -> list:
+    chunks = split_report_text(text)
+    print(f"🧩 Summarizing {len(text)} chars in {len(chunks)} chunks")
+
+    limit = asyncio.Semaphore(SUMMARY_MAP_WORKERS)
+
+    async def summarize_chunk(chunk):
+        async with limit:
+            return await _generate_single_summary_async(chunk, language)
+
+    return await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks))
+
+
+def generate_summary_stream(text: str, language: str):
+    """
+    generate_summary, yielding the raw JSON text as Gemini produces it
+    (see services/summary_stream_parser.py); pass the full text to
+    validate_summary once it is done. For long reports the chunk summaries
+    are made first and only the merge call is streamed.
+    """
+    if len(text) > SUMMARY_MAP_REDUCE_CHARS:
+        partials = run_async(_summarize_chunks_async(text, language))
+        request = _merge_request(partials, language)
+    else:
+        request = _single_summary_request(text, language)
+
+    for chunk in generate_content_stream(**request):
+        if chunk.text:
+            yield chunk.text
+
+
+def _merge_summaries(partials: list, language: str) -> dict:
+    return _structured(ReportSummary, generate_content(**_merge_request(partials, language)).text)
+
+
+async def _merge_summaries_async(partials: list, language: str) -> dict:
+    response = await generate_content_async(**_merge_request(partials, language))
+    return await _structured_async(ReportSummary, response.text)
+
+
+def _merge_request(partials: list, language: str) -> dict:
+    parts = "\n\n".join(
+        f"PART {i + 1} of {len(partials)}:\n{json.dumps(partial, ensure_ascii=False)}"
+        for i, partial in enumerate(partials)
+    )
+
+    prompt = f"""
+You are a medical report explanation assistant for patients.
+
+The medical report below was too long to read at once, so each part of it
+was analyzed separately. Merge these partial analyses into ONE analysis of
+the whole report.
+
+Input Language: {language}
+Partial Analyses (JSON, in report order):
+{parts}
+
+JSON STRUCTURE (STRICTLY FOLLOW THIS):
+{{
+  "insights": [
+    {{
+      "category": "String (e.g., Blood Health, Liver Function, Vitals)",
+      "emoji": "String (e.g., 🩸, 🫀, 🫁)",
+      "insight": "String (Brief, 1-sentence summary of this aspect)",
+      "status": "String ('positive', 'warning', 'negative', 'neutral')"
+    }}
+  ],
+  "summary_text": "Markdown string containing: \\n\\n1. **What the Report Is About**\\n2. **Key Findings**\\n3. **Values Outside Range**\\n4. **Doctor Notes**\\n5. **Disclaimer**"
+}}
+
+RULES:
+- Use ONLY information present in the partial analyses.
+- Ignore parts that say the document is not a medical report, unless ALL parts say so.
+- Combine insights about the same category into one block; keep 3-5 insight blocks max.
+- When parts disagree, prefer the more specific finding and mention both values.
+- summary_text: simple language, no diagnosis, no treatment advice, Markdown formatting.
+
+OUTPUT MUST BE VALID JSON ONLY. NO MARKDOWN CODE BLOCKS around the JSON.
+"""
+
+    return route("summary_merge", prompt, {
+        'response_mime_type': 'application/json',
+        'response_schema': ReportSummary
+    })
 
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
 
-def generate_summary(text: str, language: str) -> str:
+def _generate_single_summary(text: str, language: str) -> dict:
+    return _structured(ReportSummary, generate_content(**_single_summary_request(text, language)).text)
+
+
+async def _generate_single_summary_async(text: str, language: str) -> dict:
+    response = await generate_content_async(**_single_summary_request(text, language))
+    return await _structured_async(ReportSummary, response.text)
+
+
+def _single_summary_request(text: str, language: str) -> dict:
 #     prompt = f"""
 # You are a medical report explanation assistant.
 
@@ -163,10 +424,9 @@ Medical Report Text:
 
 
 TASK:
-Analyze the report and output a JSON object with three parts:
+Analyze the report and output a JSON object with two parts:
 1. `insights`: A list of modular blocks for quick scanning.
 2. `summary_text`: A detailed, patient-friendly explanation in Markdown.
-3. `visualizations`: A list of numerical data points extracted from the report for plotting.
 
 JSON STRUCTURE (STRICTLY FOLLOW THIS):
 {{
@@ -178,16 +438,6 @@ JSON STRUCTURE (STRICTLY FOLLOW THIS):
       "status": "String ('positive', 'warning', 'negative', 'neutral')"
     }}
   ],
-  "visualizations": [
-    {{
-      "label": "String (e.g., 'Hemoglobin')",
-      "value": Number (The numerical value extracted),
-      "unit": "String (e.g., 'g/dL', '%', 'mg/dL')",
-      "min_range": Number (Lower bound of normal range, or null if N/A),
-      "max_range": Number (Upper bound of normal range, or null if N/A),
-      "status": "String ('Normal', 'High', 'Low')"
-    }}
-  ],
   "summary_text": "Markdown string containing: \\n\\n1. **What the Report Is About**\\n2. **Key Findings**\\n3. **Values Outside Range**\\n4. **Doctor Notes**\\n5. **Disclaimer**"
 }}
 
@@ -198,11 +448,6 @@ RULES FOR INSIGHTS:
 - If values are critical/high/low, status is "warning" or "negative".
 - Create 3-5 insight blocks max.
 
-RULES FOR VISUALIZATIONS:
-- Extract up to 10 key numerical parameters.
-- Ensure 'value', 'min_range', and 'max_range' are clean numbers (no strings like '<5').
-- If a range is single-sided (e.g., '< 200'), set min_range=0 and max_range=200.
-
 RULES FOR SUMMARY_TEXT:
 - Same rules as before: Simple language, No diagnosis, No treatment advice.
 - Use Markdown formatting.
@@ -210,40 +455,38 @@ RULES FOR SUMMARY_TEXT:
 OUTPUT MUST BE VALID JSON ONLY. NO MARKDOWN CODE BLOCKS around the JSON.
 """
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=prompt,
-        config={
-            'response_mime_type': 'application/json'
-        }
-    )
-    
-    text = response.text.strip()
-    # Remove markdown code formatting if present
-    if text.startswith("```json"):
-        text = text[7:].strip()
-    elif text.startswith("```"):
-        text = text[3:].strip()
-    if text.endswith("```"):
-        text = text[:-3].strip()
-
-    return text
+    return route("summary", prompt, {
+        'response_mime_type': 'application/json',
+        'response_schema': ReportSummary
+    })
 
 
 def explain_medical_term(term: str, language: str = "en") -> str:
     """
     Explain a medical term in simple, patient-friendly language
     """
-    prompt = f"""
-You are a medical terminology explainer for patients.
+    return generate_content(**_medical_term_request(term, language)).text
 
-RULES:
+
+async def explain_medical_term_async(term: str, language: str = "en") -> str:
+    return (await generate_content_async(**_medical_term_request(term, language))).text
+
+
+# Shared by the single and the batch medical term prompts.
+_MEDICAL_TERM_RULES = """RULES:
 - Explain in VERY simple, everyday language
 - Avoid using complex medical jargon
 - Use analogies or comparisons when helpful
 - Keep the explanation concise (2-4 sentences)
 - If it's a test/measurement, mention what it measures
-- Do NOT provide medical advice or diagnosis
+- Do NOT provide medical advice or diagnosis"""
+
+
+def _medical_term_request(term: str, language: str) -> dict:
+    prompt = f"""
+You are a medical terminology explainer for patients.
+
+{_MEDICAL_TERM_RULES}
 
 Language: {language}
 
@@ -252,18 +495,93 @@ Medical Term: {term}
 Provide a simple explanation that a patient without medical knowledge can understand.
 """
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=prompt
-    )
+    return route("medical_term", prompt)
+
+
+def explain_medical_terms(terms: list, language: str = "en") -> dict:
+    """
+    Explain several medical terms with a single Gemini call, validated
+    (and repaired) against MedicalTermExplanations like the other JSON
+    answers.
+
+    Returns:
+        {term: explanation} for every term the model answered; terms it
+        skipped are left out.
+    """
+    response = generate_content(**_medical_terms_request(terms, language))
+    # A blocked or empty candidate has no text: no term was answered.
+    if not response.text or not response.text.strip():
+        return {}
+    return _explanations_by_term(terms, _structured(MedicalTermExplanations, response.text))
+
+
+async def explain_medical_terms_async(terms: list, language: str = "en") -> dict:
+    response = await generate_content_async(**_medical_terms_request(terms, language))
+    if not response.text or not response.text.strip():
+        return {}
+    return _explanations_by_term(terms, await _structured_async(MedicalTermExplanations, response.text))
+
+
+def _explanations_by_term(terms: list, data: dict) -> dict:
+    by_term = {}
+    for item in data["explanations"]:
+        if item["explanation"].strip():
+            by_term[_term_key(item["term"])] = item["explanation"].strip()
+
+    return {term: by_term[_term_key(term)] for term in terms if _term_key(term) in by_term}
+
 
-    return response.text
+def _term_key(term: str) -> str:
+    return " ".join(term.split()).casefold()
+
+
+def _medical_terms_request(terms: list, language: str) -> dict:
+    term_list = "\n".join(f"- {term}" for term in terms)
+
+    prompt = f"""
+You are a medical terminology explainer for patients.
+
+{_MEDICAL_TERM_RULES}
+- Explain every term on its own; do not refer to the other terms
+
+Language: {language}
+
+Medical Terms:
+{term_list}
+
+Return JSON only, with one entry per term, using each term exactly as written above:
+{{
+  "explanations": [
+    {{"term": "String", "explanation": "String (simple explanation, 2-4 sentences)"}}
+  ]
+}}
+"""
+
+    return route("medical_terms", prompt, {
+        'response_mime_type': 'application/json',
+        'response_schema': MedicalTermExplanations
+    })
 
 
 def analyze_symptoms(symptoms: str, language: str = "en") -> str:
     """
     Analyze symptoms and provide possible conditions (educational only)
     """
+    return generate_content(**_symptoms_request(symptoms, language)).text
+
+
+async def analyze_symptoms_async(symptoms: str, language: str = "en") -> str:
+    return (await generate_content_async(**_symptoms_request(symptoms, language))).text
+
+
+def stream_symptom_analysis(symptoms: str, language: str = "en"):
+    """analyze_symptoms, yielding text chunks as Gemini produces them."""
+    for chunk in generate_content_stream(**_symptoms_request(symptoms, language)):
+        if chunk.text:
+            yield chunk.text
+
+
+def _symptoms_request(symptoms: str, language: str) -> dict:
     prompt = f"""
 You are a symptom analysis assistant for educational purposes.
 
@@ -283,28 +601,33 @@ Symptoms Described: {symptoms}
 Remember: Be helpful but cautious. Patient safety is paramount.
 """
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=prompt
-    )
-
-
-    return response.text
+    return route("symptoms", prompt)
 
 
-def generate_comparison_analysis(old_summary: str, new_summary: str, language: str = "en") -> str:
+def generate_comparison_analysis(old_summary: str, new_summary: str, language: str = "en") -> dict:
     """
-    Compare two medical reports and return a structured JSON analysis.
+    Compare two medical reports and return the validated analysis
+    (see services/llm_schemas.ComparisonAnalysis).
     """
+    response = generate_content(**_comparison_request(old_summary, new_summary, language))
+    return _structured(ComparisonAnalysis, response.text)
+
+
+async def generate_comparison_analysis_async(old_summary: str, new_summary: str, language: str = "en") -> dict:
+    response = await generate_content_async(**_comparison_request(old_summary, new_summary, language))
+    return await _structured_async(ComparisonAnalysis, response.text)
+
+
+def _comparison_request(old_summary: str, new_summary: str, language: str) -> dict:
     prompt = f"""
 You are a highly intelligent medical comparison assistant.
 
 CRITICAL CONTEXT:
 - Comparing medical reports for the SAME patient.
 - Goal: Identify changes, trends, and health progress.
-- Old Report (Base): {{old_summary}}
-- New Report (Current): {{new_summary}}
-- Language: {{language}}
+- Old Report (Base): {old_summary}
+- New Report (Current): {new_summary}
+- Language: {language}
 
 TASK:
 Analyze the differences and output a STRICT JSON object.
@@ -343,26 +666,22 @@ RULES:
 6. NO MARKDOWN CODE BLOCKS (` ```json `). JUST THE RAW JSON STRING.
 """
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=prompt,
-        config={
-            'response_mime_type': 'application/json'
-        }
-    )
-    
-    text = response.text.strip()
-    # Remove markdown code formatting if present
-    if text.startswith("```json"):
-        text = text[7:].strip()
-    elif text.startswith("```"):
-        text = text[3:].strip()
-    if text.endswith("```"):
-        text = text[:-3].strip()
+    return route("comparison", prompt, {
+        'response_mime_type': 'application/json',
+        'response_schema': ComparisonAnalysis
+    })
 
-    return text
 
-def identify_medicine(medicine_name: str, language: str = 'en') -> str:
+def identify_medicine(medicine_name: str, language: str = 'en') -> dict:
+    return _structured(MedicineInfo, generate_content(**_medicine_request(medicine_name, language)).text)
+
+
+async def identify_medicine_async(medicine_name: str, language: str = 'en') -> dict:
+    response = await generate_content_async(**_medicine_request(medicine_name, language))
+    return await _structured_async(MedicineInfo, response.text)
+
+
+def _medicine_request(medicine_name: str, language: str) -> dict:
     prompt = f"""
 You are a helpful medical assistant.
 User wants to know about the medicine: "{medicine_name}".
@@ -384,11 +703,7 @@ Example JSON:
   "name_confirmed": "Dolo 650 (Paracetamol)"
 }}
 """
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=prompt,
-        config={
-            'response_mime_type': 'application/json'
-        }
-    )
-    return response.text.strip()
+    return route("medicine", prompt, {
+        'response_mime_type': 'application/json',
+        'response_schema': MedicineInfo
+    })
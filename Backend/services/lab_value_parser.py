@@ -0,0 +1,219 @@
+# Deterministic extraction of numeric lab values from report text.
+# Produces the same `visualizations` items the summary prompt used to ask
+# Gemini for, so charts no longer depend on (or wait for) the LLM.
+
+import re
+
+MAX_VISUALIZATIONS = 10
+
+# (label shown on the chart, aliases as they appear at the start of a row).
+# More specific names come before the generic ones they contain.
+_PARAMETERS = [
+    # CBC
+    ("Hemoglobin", r"ha?emoglobin|hgb|hb"),
+    ("RBC Count", r"(?:total\s+)?rbc(?:\s+count)?|red\s+blood\s+cell(?:s|\s+count)?|erythrocyte\s+count"),
+    ("WBC Count", r"(?:total\s+)?wbc(?:\s+count)?|white\s+blood\s+cell(?:s|\s+count)?|total\s+leu[ck]ocyte\s+count|tlc"),
+    ("Platelet Count", r"platelet(?:s|\s+count)?|plt"),
+    ("Hematocrit", r"ha?ematocrit|pcv|hct|packed\s+cell\s+volume"),
+    ("MCHC", r"mchc"),
+    ("MCV", r"mcv"),
+    ("MCH", r"mch"),
+    ("RDW", r"rdw(?:\s*-?\s*cv)?"),
+    ("Neutrophils", r"neutrophils?"),
+    ("Lymphocytes", r"lymphocytes?"),
+    ("ESR", r"esr|erythrocyte\s+sedimentation\s+rate"),
+    # LFT
+    ("Direct Bilirubin", r"(?:direct|conjugated)\s+bilirubin|bilirubin,?\s*(?:direct|conjugated)"),
+    ("Indirect Bilirubin", r"(?:indirect|unconjugated)\s+bilirubin|bilirubin,?\s*(?:indirect|unconjugated)"),
+    ("Total Bilirubin", r"(?:total\s+|serum\s+)?bilirubin(?:,?\s*total)?"),
+    ("SGOT (AST)", r"sgot|ast|aspartate\s+aminotransferase"),
+    ("SGPT (ALT)", r"sgpt|alt|alanine\s+aminotransferase"),
+    ("Alkaline Phosphatase", r"alkaline\s+phosphatase|alp"),
+    ("GGT", r"ggt|gamma\s+glutamyl\s+transferase"),
+    ("Total Protein", r"(?:total\s+|serum\s+)protein(?:s)?|protein,?\s*total"),
+    ("Albumin", r"(?:serum\s+)?albumin"),
+    ("Globulin", r"(?:serum\s+)?globulin"),
+    # KFT
+    ("BUN", r"bun|blood\s+urea\s+nitrogen"),
+    ("Urea", r"(?:blood\s+|serum\s+)?urea"),
+    ("Creatinine", r"(?:serum\s+)?creatinine"),
+    ("Uric Acid", r"(?:serum\s+)?uric\s+acid"),
+    ("eGFR", r"e\s*gfr"),
+    ("Sodium", r"(?:serum\s+)?sodium|na\+?"),
+    ("Potassium", r"(?:serum\s+)?potassium|k\+?"),
+    ("Chloride", r"(?:serum\s+)?chloride|cl-?"),
+    ("Calcium", r"(?:serum\s+)?calcium"),
+    # Lipid profile
+    ("VLDL Cholesterol", r"vldl(?:\s*-?\s*c(?:holesterol)?)?"),
+    ("HDL Cholesterol", r"hdl(?:\s*-?\s*c(?:holesterol)?)?|high\s+density\s+lipoprotein"),
+    ("LDL Cholesterol", r"ldl(?:\s*-?\s*c(?:holesterol)?)?|low\s+density\s+lipoprotein"),
+    ("Total Cholesterol", r"(?:total\s+|serum\s+)?cholesterol(?:,?\s*total)?"),
+    ("Triglycerides", r"triglycerides?|tg"),
+    # Diabetes / thyroid
+    ("HbA1c", r"hba1c|glycated\s+ha?emoglobin|glycosylated\s+ha?emoglobin"),
+    ("Fasting Glucose", r"fasting\s+(?:blood|plasma)\s+(?:sugar|glucose)|(?:blood\s+|plasma\s+)?(?:sugar|glucose),?\s*\(?fasting\)?|fbs"),
+    ("Post-prandial Glucose", r"post\s*-?\s*prandial\s+(?:blood\s+|plasma\s+)?(?:sugar|glucose)|ppbs"),
+    ("Random Glucose", r"random\s+(?:blood\s+|plasma\s+)?(?:sugar|glucose)|rbs"),
+    ("TSH", r"tsh|thyroid\s+stimulating\s+hormone"),
+    ("Free T3", r"free\s+t3|ft3|free\s+triiodothyronine|t3,?\s*free"),
+    ("Free T4", r"free\s+t4|ft4|free\s+thyroxine|t4,?\s*free"),
+    ("T3", r"(?:total\s+)?t3|(?:total\s+)?triiodothyronine"),
+    ("T4", r"(?:total\s+)?t4|(?:total\s+)?thyroxine"),
+    # Vitamins
+    ("Vitamin D", r"(?:25\s*-?\s*(?:oh|hydroxy)\s+)?vit(?:amin|\.)?\s*d3?"),
+    ("Vitamin B12", r"vit(?:amin|\.)?\s*b\s*-?\s*12|(?:cyano)?cobalamin|b12"),
+]
+
+_LABEL_PATTERNS = [
+    (label, re.compile(rf"^[\s\-•*\d.)]*?(?:{aliases})\b(?!\s*/)", re.IGNORECASE))
+    for label, aliases in _PARAMETERS
+]
+
+_RATIO_RE = re.compile(r"\bratio\b", re.IGNORECASE)
+
+_NUMBER = r"\d+(?:,\d+)*(?:\.\d+)?"
+
+# Words with digits that are still part of the label, not its value:
+# ordinals ("TSH 3rd Generation"), "25-OH" and names like "D3" or "B12".
+_LABEL_WORD = r"\d+(?:st|nd|rd|th)\b|\d+\s*-\s*(?:oh|hydroxy)\b|[a-z]\d+"
+
+# Anything between the label and the value: punctuation, method names,
+# label words with digits, bracketed notes (which may contain digits,
+# e.g. "(CKD-EPI 2021)"). The value is a number of its own.
+_VALUE_RE = re.compile(
+    rf"^(?:\([^)\n]{{0,40}}\)|\[[^\]\n]{{0,40}}\]|{_LABEL_WORD}|[^\d(\[\n]){{0,60}}?"
+    rf"(?<![a-z\d])(?P<value>{_NUMBER})(?!\.?\d|,\d|(?:st|nd|rd|th)\b|\s*-\s*(?:oh|hydroxy)\b)"
+    rf"(?!\s*(?:-|–|to)\s*\d)\s*(?P<flag>\b(?:H|L|High|Low)\b)?",
+    re.IGNORECASE,
+)
+_RANGE_RE = re.compile(rf"(?P<low>{_NUMBER})\s*(?:-|–|to)\s*(?P<high>{_NUMBER})", re.IGNORECASE)
+_BOUND_RE = re.compile(
+    rf"(?P<op><=|>=|<|>|≤|≥|up\s*to|less\s+than|more\s+than|below|above)\s*(?P<bound>{_NUMBER})",
+    re.IGNORECASE,
+)
+_UNIT_RE = re.compile(r"(?:x\s*)?(?:10\s*\^?\s*\d+\s*)?/?\s*[a-zµμ%][\w/µμ%.²³^]*", re.IGNORECASE)
+_NOT_UNITS = {"h", "l", "high", "low", "normal", "to", "and", "or", "up", "upto", "less", "more", "than", "below", "above"}
+
+
+def _number(text: str) -> float:
+    value = float(text.replace(",", ""))
+    return int(value) if value.is_integer() else value
+
+
+def _unit(text: str) -> str:
+    for match in _UNIT_RE.finditer(text):
+        token = match.group(0).strip().strip(".")
+        if token and token.lower() not in _NOT_UNITS:
+            return token
+    return ""
+
+
+def _parse_row(label: str, rest: str):
+    value_match = _VALUE_RE.match(rest)
+    if not value_match:
+        return None
+
+    value = _number(value_match.group("value"))
+    flag = (value_match.group("flag") or "").lower()
+    after = rest[value_match.end():]
+
+    min_range = max_range = None
+    range_match = _RANGE_RE.search(after)
+    bound_match = _BOUND_RE.search(after)
+    if range_match and (not bound_match or range_match.start() <= bound_match.start()):
+        min_range = _number(range_match.group("low"))
+        max_range = _number(range_match.group("high"))
+        range_start = range_match.start()
+    elif bound_match:
+        bound = _number(bound_match.group("bound"))
+        op = bound_match.group("op").lower()
+        if op in ("<", "<=", "≤", "less than", "below") or op.replace(" ", "") == "upto":
+            min_range, max_range = 0, bound
+        else:
+            min_range = bound
+        range_start = bound_match.start()
+    else:
+        range_start = len(after)
+
+    # Units sit either between the value and the range or right after it.
+    unit = _unit(after[:range_start])
+    if not unit and range_start < len(after):
+        end = (range_match or bound_match).end()
+        unit = _unit(after[end:end + 20])
+
+    if min_range is not None and value < min_range:
+        status = "Low"
+    elif max_range is not None and value > max_range:
+        status = "High"
+    elif min_range is not None or max_range is not None:
+        status = "Normal"
+    elif flag in ("h", "high"):
+        status = "High"
+    elif flag in ("l", "low"):
+        status = "Low"
+    else:
+        # No reference range and no flag: nothing meaningful to plot.
+        return None
+
+    return {
+        "label": label,
+        "value": value,
+        "unit": unit,
+        "min_range": min_range,
+        "max_range": max_range,
+        "status": status,
+    }
+
+
+def _match_label(line: str):
+    if _RATIO_RE.search(line):
+        return None, None
+    for label, pattern in _LABEL_PATTERNS:
+        match = pattern.match(line)
+        if match:
+            return label, match.end()
+    return None, None
+
+
+def is_lab_parameter(line: str) -> bool:
+    """True if the line starts with one of the known lab parameter names."""
+    return _match_label(line.strip())[0] is not None
+
+
+def extract_lab_values(text: str, limit: int = MAX_VISUALIZATIONS) -> list:
+    """
+    Extract numeric lab parameters from report text.
+
+    Handles both one-row-per-line layouts ("Hemoglobin 13.5 g/dL 12.0-15.5")
+    and tables where PyMuPDF puts every cell on its own line, by joining a
+    parameter line with the following lines up to the next parameter.
+
+    Returns:
+        A list of {label, value, unit, min_range, max_range, status} dicts,
+        at most `limit` long, one per parameter.
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line]
+
+    results = []
+    seen = set()
+
+    for i, line in enumerate(lines):
+        label, end = _match_label(line)
+        if not label or label in seen:
+            continue
+
+        row = line[end:]
+        for following in lines[i + 1:i + 4]:
+            if _match_label(following)[0]:
+                break
+            row += " " + following
+
+        item = _parse_row(label, row)
+        if item:
+            seen.add(label)
+            results.append(item)
+            if len(results) >= limit:
+                break
+
+    return results
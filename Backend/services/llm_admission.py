@@ -0,0 +1,227 @@
+# Admission control in front of the LLM upstream, so a burst of uploads
+# cannot take the whole Gemini quota and block every worker thread.
+#
+# Each worker process allows at most LLM_MAX_CONCURRENT calls in flight, at
+# most LLM_MAX_CONCURRENT_PER_USER of them for one user, and (optionally)
+# LLM_REQUESTS_PER_MINUTE call starts through a token bucket. Background
+# tasks (summaries, comparisons) may only fill LLM_BACKGROUND_SHARE of the
+# slots, so interactive ones (chat, voice, lookups) always find room.
+#
+# The first call of a request waits at most LLM_ADMISSION_WAIT_SECONDS and
+# is then rejected with LLMRateLimitedError (429 + Retry-After). Later calls
+# of an admitted request wait for a slot instead, since rejecting them would
+# throw away the work already paid for (e.g. the chunks of a long summary).
+
+import asyncio
+import contextvars
+import math
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from utils.constants import (
+    LLM_ADMISSION_WAIT_SECONDS,
+    LLM_BACKGROUND_SHARE,
+    LLM_DEADLINE_SECONDS,
+    LLM_MAX_CONCURRENT,
+    LLM_MAX_CONCURRENT_PER_USER,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_RETRY_AFTER_SECONDS,
+)
+from utils.exception import LLMRateLimitedError
+
+# Model routes (services/model_router.py) a user is actively waiting on;
+# everything else is background.
+INTERACTIVE_TASKS = {"chat", "voice_chat", "symptoms", "medical_term", "medical_terms", "medicine"}
+
+# {"user": uid or None, "admitted": bool} for the current request, set in
+# app.py. It is a shared dict rather than plain values so that coroutines
+# started with llm_gateway.run_async (which get a copy of the context) see
+# and update the same request.
+_request = contextvars.ContextVar("llm_admission_request", default=None)
+
+_POLL_SECONDS = 0.05
+
+
+def start_request():
+    _request.set({"user": None, "admitted": False})
+
+
+def set_request_user(user_id: str):
+    state = _request.get()
+    if state is not None:
+        state["user"] = user_id
+
+
+def priority_of(task: str) -> str:
+    return "interactive" if task in INTERACTIVE_TASKS else "background"
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent: int, max_per_user: int, background_share: float,
+                 requests_per_minute: float):
+        self.max_concurrent = max_concurrent
+        self.max_background = max(1, int(max_concurrent * background_share))
+        self.max_per_user = max_per_user
+        self.rate = requests_per_minute / 60
+        self.burst = max(1.0, self.rate * 10)
+
+        self._cond = threading.Condition()
+        self._active = 0
+        self._active_background = 0
+        self._per_user = {}
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+        self._stats = {"admitted": 0, "waited": 0, "rejected": {}}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _blocked_by(self, priority: str, user: str):
+        # Name of the limit that keeps this call out right now, or None.
+        if self._active >= self.max_concurrent:
+            return "global"
+        if priority == "background" and self._active_background >= self.max_background:
+            return "background"
+        if user is not None and self._per_user.get(user, 0) >= self.max_per_user:
+            return "user"
+        if self.rate:
+            self._refill()
+            if self._tokens < 1:
+                return "rate"
+        return None
+
+    def _take(self, priority: str, user: str):
+        self._active += 1
+        if priority == "background":
+            self._active_background += 1
+        if user is not None:
+            self._per_user[user] = self._per_user.get(user, 0) + 1
+        if self.rate:
+            self._tokens -= 1
+        self._stats["admitted"] += 1
+
+    def _try_acquire(self, priority: str, user: str):
+        with self._cond:
+            blocked = self._blocked_by(priority, user)
+            if blocked is None:
+                self._take(priority, user)
+            return blocked
+
+    def _reject(self, reason: str):
+        with self._cond:
+            self._stats["rejected"][reason] = self._stats["rejected"].get(reason, 0) + 1
+            if reason == "rate":
+                retry_after = math.ceil((1 - self._tokens) / self.rate)
+            else:
+                retry_after = LLM_RETRY_AFTER_SECONDS
+        print(f"🚦 LLM call rejected ({reason} limit), retry after {retry_after}s")
+        raise LLMRateLimitedError(max(1, retry_after))
+
+    def acquire(self, priority: str, user: str, timeout: float):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            blocked = self._blocked_by(priority, user)
+            if blocked is not None:
+                self._stats["waited"] += 1
+            while blocked is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # Token refills do not notify, so wake up now and then.
+                self._cond.wait(min(remaining, _POLL_SECONDS if blocked == "rate" else remaining))
+                blocked = self._blocked_by(priority, user)
+            if blocked is None:
+                self._take(priority, user)
+                return
+        self._reject(blocked)
+
+    async def acquire_async(self, priority: str, user: str, timeout: float):
+        # Polls instead of blocking, so waiting never holds the event loop.
+        deadline = time.monotonic() + timeout
+        blocked = self._try_acquire(priority, user)
+        if blocked is not None:
+            with self._cond:
+                self._stats["waited"] += 1
+        while blocked is not None and time.monotonic() < deadline:
+            await asyncio.sleep(_POLL_SECONDS)
+            blocked = self._try_acquire(priority, user)
+        if blocked is not None:
+            self._reject(blocked)
+
+    def release(self, priority: str, user: str):
+        with self._cond:
+            self._active -= 1
+            if priority == "background":
+                self._active_background -= 1
+            if user is not None:
+                self._per_user[user] -= 1
+                if not self._per_user[user]:
+                    del self._per_user[user]
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "active": self._active,
+                "active_background": self._active_background,
+                "users": len(self._per_user),
+                "limits": {
+                    "global": self.max_concurrent,
+                    "background": self.max_background,
+                    "per_user": self.max_per_user,
+                    "requests_per_minute": self.rate * 60,
+                },
+                "admitted": self._stats["admitted"],
+                "waited": self._stats["waited"],
+                "rejected": dict(self._stats["rejected"]),
+            }
+
+
+controller = AdmissionController(
+    LLM_MAX_CONCURRENT, LLM_MAX_CONCURRENT_PER_USER, LLM_BACKGROUND_SHARE, LLM_REQUESTS_PER_MINUTE
+)
+
+
+def _admission(task: str):
+    # (priority, user, how long to wait) for a call of `task` made now.
+    state = _request.get()
+    if state is None:
+        return priority_of(task), None, LLM_DEADLINE_SECONDS
+    timeout = LLM_DEADLINE_SECONDS if state["admitted"] else LLM_ADMISSION_WAIT_SECONDS
+    return priority_of(task), state["user"], timeout
+
+
+def _mark_admitted():
+    state = _request.get()
+    if state is not None:
+        state["admitted"] = True
+
+
+@contextmanager
+def admit(task: str = None):
+    """Hold an upstream slot for one call, or raise LLMRateLimitedError."""
+    priority, user, timeout = _admission(task)
+    controller.acquire(priority, user, timeout)
+    _mark_admitted()
+    try:
+        yield
+    finally:
+        controller.release(priority, user)
+
+
+@asynccontextmanager
+async def admit_async(task: str = None):
+    priority, user, timeout = _admission(task)
+    await controller.acquire_async(priority, user, timeout)
+    _mark_admitted()
+    try:
+        yield
+    finally:
+        controller.release(priority, user)
+
+
+def get_admission_stats() -> dict:
+    return controller.stats()
@@ -0,0 +1,512 @@
+# Single entry point for every Gemini call: owns the shared genai.Client
+# (one pooled HTTP connection set per worker), enforces per-call deadlines,
+# retries transient failures with jittered backoff and fails fast while the
+# upstream is degraded.
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+
+import httpx
+from google import genai
+from google.genai import errors, types
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    stop_before_delay,
+    wait_random_exponential,
+)
+
+from utils.constants import (
+    LLM_BREAKER_FAILURES,
+    LLM_BACKEND,
+    LLM_BREAKER_RESET_SECONDS,
+    LLM_DEADLINE_SECONDS,
+    LLM_MAX_ATTEMPTS,
+    LLM_MAX_CONNECTIONS,
+    LLM_RETRY_BASE_SECONDS,
+    LLM_RETRY_MAX_SECONDS,
+    LLM_TIMEOUT_SECONDS,
+)
+from services.llm_admission import admit, admit_async, get_admission_stats
+from services.llm_metrics import record_llm_call, usage_tokens
+from utils.exception import LLMUnavailableError
+
+
+def _gemini_client():
+    limits = httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_CONNECTIONS,
+    )
+    return genai.Client(
+        api_key=os.getenv("GEMINI_API_KEY"),
+        http_options=types.HttpOptions(
+            timeout=int(LLM_TIMEOUT_SECONDS * 1000),
+            client_args={"limits": limits},
+            async_client_args={"limits": limits},
+        ),
+    )
+
+
+def _fake_client():
+    from services.fake_llm_backend import FakeClient
+    return FakeClient()
+
+
+# Model backends by name; see LLM_BACKEND. A backend is a factory for an
+# object with the genai.Client surface used here: models.generate_content,
+# models.generate_content_stream and aio.models.generate_content.
+BACKENDS = {
+    "gemini": _gemini_client,
+    "fake": _fake_client,
+}
+
+
+def register_backend(name: str, factory):
+    BACKENDS[name] = factory
+
+
+def _new_client():
+    if LLM_BACKEND not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {LLM_BACKEND}")
+    return BACKENDS[LLM_BACKEND]()
+
+
+client = _new_client()
+
+# The async HTTP pool is bound to the event loop it was first used on, so
+# every loop gets its own client. In practice that is the gateway's own loop
+# (see run_async) plus whatever loop an async server runs.
+_loop_clients = weakref.WeakKeyDictionary()
+_loop_clients_lock = threading.Lock()
+
+
+def _async_models():
+    loop = asyncio.get_running_loop()
+    with _loop_clients_lock:
+        loop_client = _loop_clients.get(loop)
+        if loop_client is None:
+            loop_client = client if not _loop_clients else _new_client()
+            _loop_clients[loop] = loop_client
+    return loop_client.aio.models
+
+
+# 408 request timeout, 429 rate limited; every 5xx is retried as well.
+_RETRYABLE_CLIENT_CODES = {408, 429}
+
+
+def is_transient(error: Exception) -> bool:
+    """True for failures worth retrying: timeouts, dropped connections, 429 and 5xx."""
+    if isinstance(error, errors.ServerError):
+        return True
+    if isinstance(error, errors.ClientError):
+        return error.code in _RETRYABLE_CLIENT_CODES
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` transient failures in a row. While open,
+    calls are rejected immediately; after `reset_seconds` one trial call is
+    let through (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    print(f"⛔ Gemini circuit breaker open after {self._failures} failures")
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def release(self):
+        # A trial call that failed for a non-transient reason says nothing
+        # about upstream health; let the next call try again.
+        with self._lock:
+            self._trial_running = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state(),
+                "consecutive_failures": self._failures,
+                "rejected": self.rejected,
+            }
+
+
+breaker = CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_RESET_SECONDS)
+
+
+def _with_timeout(config, seconds: float):
+    timeout_ms = max(1, int(seconds * 1000))
+    if config is None:
+        return {"http_options": {"timeout": timeout_ms}}
+    if isinstance(config, dict):
+        http_options = dict(config.get("http_options") or {})
+        http_options["timeout"] = timeout_ms
+        return {**config, "http_options": http_options}
+    http_options = (config.http_options or types.HttpOptions()).model_copy(update={"timeout": timeout_ms})
+    return config.model_copy(update={"http_options": http_options})
+
+
+def _log_retry(retry_state):
+    error = retry_state.outcome.exception()
+    print(
+        f"🔁 Gemini attempt {retry_state.attempt_number} failed ({type(error).__name__}: {error}), "
+        f"retrying in {retry_state.next_action.sleep:.1f}s"
+    )
+
+
+def _retry_policy(deadline: float) -> dict:
+    return dict(
+        retry=retry_if_exception(is_transient),
+        wait=wait_random_exponential(multiplier=LLM_RETRY_BASE_SECONDS, max=LLM_RETRY_MAX_SECONDS),
+        stop=stop_after_attempt(LLM_MAX_ATTEMPTS) | stop_before_delay(deadline),
+        before_sleep=_log_retry,
+        reraise=True,
+    )
+
+
+def _start_attempt(config, started: float, deadline: float):
+    # Returns the config for one attempt, with its timeout clipped to the
+    # time left before the deadline.
+    if not breaker.allow():
+        raise LLMUnavailableError()
+
+    remaining = deadline - (time.monotonic() - started)
+    if remaining <= 0:
+        breaker.release()
+        raise LLMUnavailableError()
+    return _with_timeout(config, min(LLM_TIMEOUT_SECONDS, remaining))
+
+
+def _attempt_failed(error: Exception):
+    if is_transient(error):
+        breaker.record_failure()
+    else:
+        breaker.release()
+
+
+def _log_exhausted(error: Exception, started: float):
+    print(f"❌ Gemini call failed after {time.monotonic() - started:.1f}s: {error}")
+
+
+# Single flight: identical prompts already in flight are not sent again;
+# later callers (threads or coroutines) wait for the first call's result.
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+_flight_stats = {"calls": 0, "coalesced": 0}
+
+
+def prompt_key(model: str, contents, config=None) -> str:
+    payload = json.dumps([model, contents, config], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _join_flight(key: str):
+    # Returns (future, True) for the caller that has to make the call, or
+    # (future, False) for a duplicate that should wait on it.
+    with _in_flight_lock:
+        _flight_stats["calls"] += 1
+        future = _in_flight.get(key)
+        if future is not None:
+            _flight_stats["coalesced"] += 1
+            return future, False
+        future = Future()
+        _in_flight[key] = future
+        return future, True
+
+
+def _land_flight(key: str, future: Future, response=None, error: BaseException = None):
+    with _in_flight_lock:
+        _in_flight.pop(key, None)
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(response)
+
+
+def generate_content(model: str, contents, config=None, deadline: float = LLM_DEADLINE_SECONDS, task: str = None):
+    """
+    Drop-in replacement for client.models.generate_content.
+
+    Each attempt is limited to LLM_TIMEOUT_SECONDS and never runs past
+    `deadline` seconds from the start of the call. Transient errors are
+    retried with jittered exponential backoff; when they persist, or the
+    circuit breaker is open, LLMUnavailableError (HTTP 503) is raised.
+    Other errors (bad request, safety blocks, ...) are raised as-is.
+
+    Concurrent calls with the same model, contents and config share one
+    upstream call. That call needs a slot from the admission controller
+    (services/llm_admission.py) and raises LLMRateLimitedError (HTTP 429)
+    when it cannot get one in time. `task` names the route
+    (services/model_router.py), which sets the call's priority and is used
+    for metrics.
+    """
+    started = time.monotonic()
+    key = prompt_key(model, contents, config)
+    future, leader = _join_flight(key)
+    try:
+        if not leader:
+            response = future.result()
+        else:
+            try:
+                with admit(task):
+                    response = _generate_content(model, contents, config, deadline)
+            except BaseException as e:
+                _land_flight(key, future, error=e)
+                raise
+            _land_flight(key, future, response)
+    except BaseException as e:
+        _record(model, task, started, "generate", leader, error=e)
+        raise
+    _record(model, task, started, "generate", leader, response)
+    return response
+
+
+async def generate_content_async(model: str, contents, config=None, deadline: float = LLM_DEADLINE_SECONDS,
+                                 task: str = None):
+    """
+    generate_content on the SDK's async client (client.aio): same deadline,
+    retry, circuit breaker and single-flight behaviour, but waiting does not
+    hold a thread.
+    """
+    started = time.monotonic()
+    key = prompt_key(model, contents, config)
+    future, leader = _join_flight(key)
+    try:
+        if not leader:
+            response = await asyncio.wrap_future(future)
+        else:
+            try:
+                async with admit_async(task):
+                    response = await _generate_content_async(model, contents, config, deadline)
+            except BaseException as e:
+                _land_flight(key, future, error=e)
+                raise
+            _land_flight(key, future, response)
+    except BaseException as e:
+        _record(model, task, started, "async", leader, error=e)
+        raise
+    _record(model, task, started, "async", leader, response)
+    return response
+
+
+def _record(model: str, task: str, started: float, kind: str, leader: bool = True, response=None,
+            error: BaseException = None):
+    if error is not None:
+        outcome = type(error).__name__
+    else:
+        outcome = "ok" if leader else "coalesced"
+    # Coalesced calls did not spend any tokens of their own.
+    prompt_tokens, candidate_tokens = usage_tokens(response) if leader else (0, 0)
+    record_llm_call(model, time.monotonic() - started, prompt_tokens, candidate_tokens, outcome, kind, task=task)
+
+
+def _generate_content(model: str, contents, config, deadline: float):
+    started = time.monotonic()
+
+    def attempt():
+        attempt_config = _start_attempt(config, started, deadline)
+        try:
+            response = client.models.generate_content(model=model, contents=contents, config=attempt_config)
+        except Exception as e:
+            _attempt_failed(e)
+            raise
+        breaker.record_success()
+        return response
+
+    try:
+        return Retrying(**_retry_policy(deadline))(attempt)
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        if is_transient(e):
+            _log_exhausted(e, started)
+            raise LLMUnavailableError() from e
+        raise
+
+
+async def _generate_content_async(model: str, contents, config, deadline: float):
+    started = time.monotonic()
+    models = _async_models()
+
+    async def attempt():
+        attempt_config = _start_attempt(config, started, deadline)
+        try:
+            response = await models.generate_content(model=model, contents=contents, config=attempt_config)
+        except Exception as e:
+            _attempt_failed(e)
+            raise
+        breaker.record_success()
+        return response
+
+    try:
+        return await AsyncRetrying(**_retry_policy(deadline))(attempt)
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        if is_transient(e):
+            _log_exhausted(e, started)
+            raise LLMUnavailableError() from e
+        raise
+
+
+def generate_content_stream(model: str, contents, config=None, deadline: float = LLM_DEADLINE_SECONDS,
+                            task: str = None):
+    """
+    Streaming counterpart of generate_content: yields response chunks as
+    Gemini produces them.
+
+    Failures before the first chunk are retried like generate_content.
+    Once a chunk has been handed out an error is raised as-is, since the
+    caller may already have forwarded the text. Streams are not coalesced;
+    each one holds an admission slot until it ends.
+    """
+    started = time.monotonic()
+    # Usage metadata on a stream is cumulative; the last chunk carrying it
+    # has the totals.
+    last_usage = None
+    try:
+        with admit(task):
+            for chunk in _generate_content_stream(model, contents, config, deadline):
+                if getattr(chunk, "usage_metadata", None) is not None:
+                    last_usage = chunk
+                yield chunk
+    except BaseException as e:
+        _record(model, task, started, "stream", response=last_usage, error=e)
+        raise
+    _record(model, task, started, "stream", response=last_usage)
+
+
+def _generate_content_stream(model: str, contents, config, deadline: float):
+    started = time.monotonic()
+
+    def open_stream():
+        attempt_config = _start_attempt(config, started, deadline)
+        try:
+            stream = client.models.generate_content_stream(model=model, contents=contents, config=attempt_config)
+            first = next(stream, None)
+        except Exception as e:
+            _attempt_failed(e)
+            raise
+        breaker.record_success()
+        return stream, first
+
+    try:
+        stream, first = Retrying(**_retry_policy(deadline))(open_stream)
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        if is_transient(e):
+            _log_exhausted(e, started)
+            raise LLMUnavailableError() from e
+        raise
+
+    if first is None:
+        return
+    yield first
+    try:
+        yield from stream
+    except Exception as e:
+        if is_transient(e):
+            breaker.record_failure()
+        raise
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-gateway-loop", daemon=True).start()
+        return _loop
+
+
+def submit_async(coroutine):
+    """
+    Start a coroutine from synchronous code without waiting for it.
+    Returns a concurrent.futures.Future for its result.
+    """
+    # Context variables (e.g. the calling endpoint for metrics) do not cross
+    # into the loop thread by themselves.
+    context = contextvars.copy_context()
+
+    async def run_in_context():
+        for var, value in context.items():
+            var.set(value)
+        return await coroutine
+
+    return asyncio.run_coroutine_threadsafe(run_in_context(), _background_loop())
+
+
+def run_async(coroutine):
+    """
+    Run a coroutine from synchronous code (Flask views) and wait for it.
+
+    All such coroutines share one event loop thread per worker, so LLM calls
+    fanned out with asyncio.gather share the async connection pool instead
+    of each needing a thread.
+    """
+    return submit_async(coroutine).result()
+
+
+def get_gateway_stats() -> dict:
+    with _in_flight_lock:
+        single_flight = dict(_flight_stats, in_flight=len(_in_flight))
+    return {
+        "circuit_breaker": breaker.stats(),
+        "single_flight": single_flight,
+        "admission": get_admission_stats(),
+    }
@@ -0,0 +1,159 @@
+# Per-call instrumentation for LLM traffic: wall time, token usage, model,
+# outcome, cache hits and schema validation, aggregated per calling endpoint
+# into histograms (served at /metrics/llm) and logged one JSON line per call.
+# Latency is also kept per model route (services/model_router.py) at
+# /metrics/llm/routes.
+
+import contextvars
+import json
+import logging
+import threading
+
+logger = logging.getLogger("llm_metrics")
+
+# Flask endpoint the current call is made for; set per request in app.py and
+# carried into coroutines started with llm_gateway.run_async.
+current_endpoint = contextvars.ContextVar("llm_endpoint", default=None)
+
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+TOKEN_BUCKETS = (128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+_lock = threading.Lock()
+_endpoints = {}
+_routes = {}
+
+
+def _endpoint_name(endpoint: str = None) -> str:
+    return endpoint or current_endpoint.get() or "background"
+
+
+def _histogram(buckets) -> dict:
+    return {"buckets": list(buckets), "counts": [0] * (len(buckets) + 1), "sum": 0}
+
+
+def _observe(histogram: dict, value):
+    for i, bound in enumerate(histogram["buckets"]):
+        if value <= bound:
+            break
+    else:
+        i = len(histogram["buckets"])
+    histogram["counts"][i] += 1
+    histogram["sum"] += value
+
+
+def _entry(endpoint: str) -> dict:
+    entry = _endpoints.get(endpoint)
+    if entry is None:
+        entry = _endpoints[endpoint] = {
+            "calls": 0,
+            "errors": 0,
+            "coalesced": 0,
+            "models": {},
+            "cache": {},
+            "structured_output": {},
+            "latency_seconds": _histogram(LATENCY_BUCKETS),
+            "prompt_tokens": _histogram(TOKEN_BUCKETS),
+            "candidate_tokens": _histogram(TOKEN_BUCKETS),
+        }
+    return entry
+
+
+def _route_entry(task: str) -> dict:
+    entry = _routes.get(task)
+    if entry is None:
+        entry = _routes[task] = {
+            "calls": 0,
+            "errors": 0,
+            "models": {},
+            "latency_seconds": _histogram(LATENCY_BUCKETS),
+        }
+    return entry
+
+
+def usage_tokens(response) -> tuple:
+    """(prompt_tokens, candidate_tokens) from a response's usage_metadata, 0 when absent."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return 0, 0
+    return usage.prompt_token_count or 0, usage.candidates_token_count or 0
+
+
+def record_llm_call(model: str, seconds: float, prompt_tokens: int = 0, candidate_tokens: int = 0,
+                    outcome: str = "ok", kind: str = "generate", endpoint: str = None, task: str = None):
+    """
+    Record one LLM call. `outcome` is "ok", "coalesced" (answered by an
+    identical call already in flight) or the error class name; `kind` is
+    "generate", "async" or "stream"; `task` is the model route, if any.
+    """
+    endpoint = _endpoint_name(endpoint)
+
+    with _lock:
+        entry = _entry(endpoint)
+        entry["calls"] += 1
+        entry["models"][model] = entry["models"].get(model, 0) + 1
+        if outcome == "coalesced":
+            entry["coalesced"] += 1
+        elif outcome != "ok":
+            entry["errors"] += 1
+        _observe(entry["latency_seconds"], seconds)
+        if outcome == "ok":
+            _observe(entry["prompt_tokens"], prompt_tokens)
+            _observe(entry["candidate_tokens"], candidate_tokens)
+
+        if task is not None and outcome != "coalesced":
+            route = _route_entry(task)
+            route["calls"] += 1
+            route["models"][model] = route["models"].get(model, 0) + 1
+            if outcome != "ok":
+                route["errors"] += 1
+            _observe(route["latency_seconds"], seconds)
+
+    logger.info(json.dumps({
+        "event": "llm_call",
+        "endpoint": endpoint,
+        "task": task,
+        "model": model,
+        "kind": kind,
+        "outcome": outcome,
+        "seconds": round(seconds, 3),
+        "prompt_tokens": prompt_tokens,
+        "candidate_tokens": candidate_tokens,
+    }))
+
+
+def record_cache_lookup(cache: str, hit: bool, endpoint: str = None):
+    """Record a hit or miss of a cache that sits in front of the LLM."""
+    endpoint = _endpoint_name(endpoint)
+
+    with _lock:
+        counts = _entry(endpoint)["cache"].setdefault(cache, {"hits": 0, "misses": 0})
+        counts["hits" if hit else "misses"] += 1
+
+    logger.info(json.dumps({"event": "llm_cache", "endpoint": endpoint, "cache": cache, "hit": hit}))
+
+
+def record_schema_validation(schema: str, outcome: str, endpoint: str = None):
+    """
+    Record how a structured answer fared against its schema: "valid" on the
+    first try, "repaired" after one or more repair calls, or "invalid" when
+    it never validated.
+    """
+    endpoint = _endpoint_name(endpoint)
+
+    with _lock:
+        counts = _entry(endpoint)["structured_output"].setdefault(
+            schema, {"valid": 0, "repaired": 0, "invalid": 0}
+        )
+        counts[outcome] += 1
+
+    logger.info(json.dumps({"event": "llm_schema", "endpoint": endpoint, "schema": schema, "outcome": outcome}))
+
+
+def get_llm_metrics() -> dict:
+    with _lock:
+        return json.loads(json.dumps(_endpoints))
+
+
+def get_llm_route_metrics() -> dict:
+    with _lock:
+        return json.loads(json.dumps(_routes))
@@ -0,0 +1,60 @@
+# Shapes of the JSON answers Gemini gives for summaries, comparisons,
+# medicine lookups and batch term explanations. Each model is passed to Gemini as the response_schema and
+# used once on the server to validate the answer (services/gemini_service.py),
+# so callers get checked dicts instead of raw JSON text.
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class Insight(BaseModel):
+    category: str
+    emoji: str
+    insight: str
+    status: Literal["positive", "warning", "negative", "neutral"]
+
+
+class ReportSummary(BaseModel):
+    insights: List[Insight]
+    summary_text: str
+
+
+class ComparisonChange(BaseModel):
+    parameter: str
+    change_type: Literal["Improved", "Stable", "Worsened", "New Finding"]
+    details: str
+    significance: str
+
+
+class ComparisonVisualization(BaseModel):
+    label: str
+    old_value: Optional[float]
+    new_value: Optional[float]
+    unit: str
+
+
+class ComparisonAnalysis(BaseModel):
+    overall_status: Literal["Improved", "Stable", "Worsened", "Mixed"]
+    status_color: Literal["green", "blue", "red", "orange"]
+    changes: List[ComparisonChange]
+    visualizations: List[ComparisonVisualization]
+    summary_markdown: str
+    recommendation: str
+    disclaimer: str
+
+
+class MedicineInfo(BaseModel):
+    purpose: str
+    best_time: str
+    side_effects: str
+    name_confirmed: str
+
+
+class TermExplanation(BaseModel):
+    term: str
+    explanation: str
+
+
+class MedicalTermExplanations(BaseModel):
+    explanations: List[TermExplanation]
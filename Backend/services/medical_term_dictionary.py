@@ -0,0 +1,240 @@
+# Bundled dictionary of common medical terms (data/medical_terms.json) with
+# patient-friendly explanations in English, Hindi and Marathi. It is loaded
+# once per worker into an in-memory index, so the lab terms that make up
+# most lookups are answered without calling Gemini; only terms the
+# dictionary does not know go to the LLM (services/response_cache.py).
+#
+# Lookups try the exact (normalized) name or alias first, then a typo-
+# tolerant match: candidates sharing trigrams with the query are checked
+# with a bounded edit distance. The sorted name list also serves prefix
+# autocomplete.
+
+import bisect
+import json
+import re
+import threading
+
+from services.llm_metrics import record_cache_lookup
+from utils.constants import MEDICAL_TERM_DICTIONARY_PATH
+
+# Candidates must share at least this share of trigrams with the query
+# before their edit distance is computed.
+_MIN_TRIGRAM_SIMILARITY = 0.3
+
+
+def normalize_term(term: str) -> str:
+    # "S. Creatinine", "s creatinine" and "S-CREATININE" are the same name.
+    return " ".join(re.sub(r"[^0-9a-z+]+", " ", str(term).casefold()).split())
+
+
+def _trigrams(name: str) -> set:
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _max_distance(name: str) -> int:
+    # Short abbreviations are never fuzzy-matched: ALT/AST, T3/T4 and
+    # HDL/LDL are one letter apart and mean different things.
+    if len(name) <= 4:
+        return 0
+    if len(name) <= 8:
+        return 1
+    return 2
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent swaps),
+    or limit + 1 as soon as it is known to exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class TermIndex:
+    """
+    In-memory index over dictionary entries ({"term", "aliases",
+    "explanations": {language: text}}). Every name and alias is stored once,
+    normalized, in a sorted list; `_exact` maps a name to its entry and
+    `_trigrams` maps a trigram to the positions of the names containing it.
+    `_word_starts` holds the later words of multi-word names ("glucose"
+    from "fasting glucose"), also sorted, for autocomplete.
+
+    Typo-tolerant matches are at most `max_distance` edits away and, with
+    `same_word_count`, have as many words as the query.
+    """
+
+    def __init__(self, entries: list, version: str = None, max_distance: int = 2,
+                 same_word_count: bool = False):
+        self.version = version
+        self.entries = entries
+        self.max_distance = max_distance
+        self.same_word_count = same_word_count
+        self._exact = {}
+        for entry_id, entry in enumerate(entries):
+            for name in [entry["term"]] + entry.get("aliases", []):
+                self._exact.setdefault(normalize_term(name), entry_id)
+
+        self._names = sorted(self._exact)
+        self._trigrams = {}
+        self._trigram_counts = []
+        self._word_starts = []
+        for position, name in enumerate(self._names):
+            trigrams = _trigrams(name)
+            self._trigram_counts.append(len(trigrams))
+            for trigram in trigrams:
+                self._trigrams.setdefault(trigram, []).append(position)
+            for match in re.finditer(r" (?=\S)", name):
+                self._word_starts.append((name[match.end():], position))
+        self._word_starts.sort()
+
+    def lookup(self, term: str):
+        """The entry for `term`, allowing small typos, or None."""
+        name = normalize_term(term)
+        if not name:
+            return None
+
+        entry_id = self._exact.get(name)
+        if entry_id is None:
+            entry_id = self._fuzzy(name)
+        return None if entry_id is None else self.entries[entry_id]
+
+    def _candidates(self, name: str) -> list:
+        # (trigram similarity, position) of names sharing enough trigrams
+        # with `name`, most similar first.
+        query = _trigrams(name)
+        shared = {}
+        for trigram in query:
+            for position in self._trigrams.get(trigram, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        candidates = []
+        for position, count in shared.items():
+            similarity = count / (len(query) + self._trigram_counts[position] - count)
+            if similarity >= _MIN_TRIGRAM_SIMILARITY:
+                candidates.append((similarity, position))
+        candidates.sort(reverse=True)
+        return candidates
+
+    def _fuzzy(self, name: str):
+        limit = min(_max_distance(name), self.max_distance)
+        if not limit:
+            return None
+
+        best, matches = limit + 1, set()
+        for _, position in self._candidates(name):
+            candidate = self._names[position]
+            # A wrong first letter is more often a different term than a typo.
+            if candidate[0] != name[0] or _max_distance(candidate) == 0:
+                continue
+            if self.same_word_count and candidate.count(" ") != name.count(" "):
+                continue
+            distance = _edit_distance(name, candidate, limit)
+            if distance < best:
+                best, matches = distance, {self._exact[candidate]}
+            elif distance == best and distance <= limit:
+                matches.add(self._exact[candidate])
+
+        # Two different terms equally close: better to ask the LLM than guess.
+        return matches.pop() if len(matches) == 1 else None
+
+    def complete(self, prefix: str, limit: int = 10) -> list:
+        """
+        Up to `limit` entries for an autocomplete box: names starting with
+        `prefix` (canonical names before aliases, shorter first), then names
+        with a later word starting with it, then typo-tolerant matches if
+        there is room.
+        """
+        name = normalize_term(prefix)
+        if not name:
+            return []
+
+        start = bisect.bisect_left(self._names, name)
+        stop = bisect.bisect_left(self._names, name + "\uffff")
+        ranked = sorted(
+            self._names[start:stop],
+            key=lambda candidate: (normalize_term(self.entries[self._exact[candidate]]["term"]) != candidate,
+                                   len(candidate), candidate),
+        )
+        entry_ids = list(dict.fromkeys(self._exact[candidate] for candidate in ranked))
+
+        start = bisect.bisect_left(self._word_starts, (name,))
+        stop = bisect.bisect_left(self._word_starts, (name + "\uffff",))
+        for _, position in self._word_starts[start:stop]:
+            entry_id = self._exact[self._names[position]]
+            if entry_id not in entry_ids:
+                entry_ids.append(entry_id)
+
+        if len(entry_ids) < limit and len(name) >= 3:
+            for _, position in self._candidates(name):
+                entry_id = self._exact[self._names[position]]
+                if entry_id not in entry_ids:
+                    entry_ids.append(entry_id)
+
+        return [self.entries[entry_id] for entry_id in entry_ids[:limit]]
+
+
+def _load_index(path: str) -> TermIndex:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    index = TermIndex(data["terms"], data.get("version"))
+    print(f"📖 Loaded medical term dictionary v{index.version}: {len(index.entries)} terms")
+    return index
+
+
+_index = None
+_index_lock = threading.Lock()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def get_index() -> TermIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = _load_index(MEDICAL_TERM_DICTIONARY_PATH)
+        return _index
+
+
+def explain_from_dictionary(term: str, language: str = "en"):
+    """The bundled explanation of `term` in `language`, or None to ask the LLM."""
+    entry = get_index().lookup(term)
+    explanation = entry["explanations"].get(language) if entry else None
+
+    with _lock:
+        _stats["hits" if explanation is not None else "misses"] += 1
+    record_cache_lookup("medical_term_dictionary", explanation is not None)
+    return explanation
+
+
+def autocomplete_terms(prefix: str, limit: int = 10) -> list:
+    return [entry["term"] for entry in get_index().complete(prefix, limit)]
+
+
+def get_dictionary_stats() -> dict:
+    index = get_index()
+    with _lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {
+        "version": index.version,
+        "terms": len(index.entries),
+        "names": len(index._names),
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0
+    }
@@ -0,0 +1,205 @@
+# Bundled catalog of common medicines (data/medicines.json): generic name,
+# Indian brand names, and purpose / best time / side effects in English,
+# Hindi and Marathi. /medicine/identify answers from it without calling
+# Gemini; only medicines the catalog does not know go to the LLM, and their
+# answers are kept in the response cache (services/response_cache.py).
+#
+# Every brand and generic name is indexed on its own with the term
+# dictionary's TermIndex (exact name, then trigrams + edit distance), so the
+# name that matched is known for "name_confirmed". Queries still unmatched
+# are compared by a rough sound-alike key ("sitrizin" -> cetirizine), and
+# finally retried without strength and dosage form ("crocin 500mg tab").
+#
+# Brands differ by a suffix letter or a strength ("Telma" / "Telma H",
+# "Dolo 650" / "Dolo 500") and generics by two letters ("ampicillin" /
+# amoxicillin), so typo and sound-alike matches must have the query's words
+# and at most one edit, and a strength in the query must be the brand's.
+
+import json
+import re
+import threading
+
+from services.llm_metrics import record_cache_lookup
+from services.medical_term_dictionary import TermIndex, normalize_term
+from utils.constants import MEDICINE_CATALOG_PATH
+
+# Names shorter than this are only matched exactly, as in the term dictionary.
+_MIN_PHONETIC_LENGTH = 5
+
+# Most edits between a query and the name it is matched to.
+_MAX_TYPO_DISTANCE = 1
+
+_PHONETIC_RULES = [
+    (r"ph", "f"),
+    (r"c(?=[eiy])", "s"),
+    (r"ck|c|q", "k"),
+    (r"x", "ks"),
+    (r"z", "s"),
+    (r"y", "i"),
+    (r"(?<=.)h", ""),
+]
+
+_STRENGTH = re.compile(
+    r"\b(?:\d+(?:\.\d+)?\s*(?:mg|mcg|g|ml|iu|k)?|tab|tabs|tablet|tablets|cap|caps|capsule|capsules"
+    r"|syrup|syp|suspension|drops|inhaler|sachet|injection|inj|sr|er|xr|cr|od|ds|forte)\b"
+)
+_NUMBER = re.compile(r"(?<![a-z\d])\d+")
+
+
+def phonetic_key(name: str) -> str:
+    """
+    A sound-alike key per word: common spelling variants are folded
+    (ph/f, soft c/s, c/k, z/s, y/i), silent h and vowels after the first
+    letter are dropped, and doubled letters collapsed. Every word keeps at
+    least its first letter, so "telma h" and "telma" have different keys.
+    """
+    words = []
+    for word in normalize_term(name).split():
+        if word.isdigit():
+            words.append(word)
+            continue
+        for pattern, replacement in _PHONETIC_RULES:
+            word = re.sub(pattern, replacement, word)
+        word = word[0] + re.sub(r"[aeiou]", "", word[1:])
+        words.append(re.sub(r"(.)\1+", r"\1", word))
+    return " ".join(words)
+
+
+def strip_strength(name: str) -> str:
+    # "Crocin 500mg tablet" -> "crocin"
+    return " ".join(_STRENGTH.sub(" ", normalize_term(name)).split())
+
+
+def _same_strength(query: str, name: str) -> bool:
+    # "dolo 650 tab" and "dolo" may be Dolo 650; "dolo 500" and "dolo 65" may not.
+    strength, query_strength = _NUMBER.findall(normalize_term(name)), _NUMBER.findall(normalize_term(query))
+    return not strength or not query_strength or strength == query_strength
+
+
+class MedicineCatalog:
+    """
+    Index over catalog entries ({"generic", "brands", "aliases", "purpose",
+    "best_time", "side_effects"}, the last three keyed by language). Each
+    brand and generic name is one TermIndex entry pointing back at its
+    medicine; a brand with a strength ("Dolo 650") is also reachable by its
+    bare name ("dolo") when no other medicine's brand starts with it.
+    """
+
+    def __init__(self, medicines: list, version: str = None):
+        self.version = version
+        self.medicines = medicines
+
+        records = []
+        bare = {}
+        for medicine in medicines:
+            records.append({"term": medicine["generic"], "aliases": medicine.get("aliases", []),
+                            "medicine": medicine, "brand": None})
+            for brand in medicine.get("brands", []):
+                name = strip_strength(brand)
+                records.append({"term": brand, "aliases": [], "medicine": medicine, "brand": brand})
+                if name and name != normalize_term(brand):
+                    bare.setdefault(name, set()).add(len(records) - 1)
+        for name, record_ids in bare.items():
+            # "pan" is Pan 40 (pantoprazole) but also the start of Pan D
+            # (pantoprazole + domperidone): only a bare name every brand
+            # starting with it shares a generic with is an alias.
+            generics = {record["medicine"]["generic"] for record in records if record["brand"]
+                        and (normalize_term(record["brand"]) + " ").startswith(name + " ")}
+            if len(record_ids) == 1 and len(generics) == 1:
+                records[record_ids.pop()]["aliases"].append(name)
+
+        self._index = TermIndex(records, version, max_distance=_MAX_TYPO_DISTANCE, same_word_count=True)
+        self._phonetic = {}
+        for record in records:
+            for name in [record["term"]] + record["aliases"]:
+                if len(normalize_term(name)) >= _MIN_PHONETIC_LENGTH:
+                    self._phonetic.setdefault(phonetic_key(name), []).append(record)
+
+    def lookup(self, name: str):
+        """The catalog record for a medicine name, allowing typos, or None."""
+        record = self._index.lookup(name) or self._phonetic_lookup(name)
+        if record is None:
+            stripped = strip_strength(name)
+            if stripped and stripped != normalize_term(name):
+                record = self._index.lookup(stripped) or self._phonetic_lookup(stripped)
+
+        if record is None or not _same_strength(name, record["term"]):
+            return None
+        return record
+
+    def _phonetic_lookup(self, name: str):
+        if len(normalize_term(name)) < _MIN_PHONETIC_LENGTH:
+            return None
+        records = self._phonetic.get(phonetic_key(name), [])
+        # Sound-alikes of two different medicines: leave it to the LLM.
+        if len({id(record["medicine"]) for record in records}) != 1:
+            return None
+        return records[0]
+
+    def identify(self, name: str, language: str = "en"):
+        """
+        The /medicine/identify answer for `name` in `language` (same fields
+        as gemini_service.identify_medicine), or None if the catalog does not
+        know the medicine or has no text in that language.
+        """
+        record = self.lookup(name)
+        if record is None:
+            return None
+
+        medicine = record["medicine"]
+        fields = {field: medicine[field].get(language) for field in ("purpose", "best_time", "side_effects")}
+        if None in fields.values():
+            return None
+
+        if record["brand"]:
+            fields["name_confirmed"] = f"{record['brand']} ({medicine['generic']})"
+        else:
+            fields["name_confirmed"] = medicine["generic"]
+        return fields
+
+
+def _load_catalog(path: str) -> MedicineCatalog:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    catalog = MedicineCatalog(data["medicines"], data.get("version"))
+    print(f"💊 Loaded medicine catalog v{catalog.version}: {len(catalog.medicines)} medicines")
+    return catalog
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def get_catalog() -> MedicineCatalog:
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = _load_catalog(MEDICINE_CATALOG_PATH)
+        return _catalog
+
+
+def identify_from_catalog(medicine_name: str, language: str = "en"):
+    """The catalog answer for `medicine_name`, or None to ask the LLM."""
+    result = get_catalog().identify(medicine_name, language)
+
+    with _lock:
+        _stats["hits" if result is not None else "misses"] += 1
+    record_cache_lookup("medicine_catalog", result is not None)
+    return result
+
+
+def get_catalog_stats() -> dict:
+    catalog = get_catalog()
+    with _lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {
+        "version": catalog.version,
+        "medicines": len(catalog.medicines),
+        "names": len(catalog._index._names),
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0
+    }
@@ -0,0 +1,75 @@
+# Picks the model and generation settings for every kind of Gemini call.
+# Short answers (medicine lookups, term explanations, voice replies) go to
+# the light tier; summaries, comparisons and chat go to the heavy tier.
+#
+# Each route names a tier (or an explicit model) plus GenerateContentConfig
+# fields. Thinking tokens count against max_output_tokens on 2.5 models, so
+# the light routes turn thinking off and the heavy ones leave headroom.
+
+import copy
+import json
+
+from utils.constants import LLM_HEAVY_MODEL, LLM_LIGHT_MODEL, LLM_ROUTES
+
+TIERS = {
+    "light": LLM_LIGHT_MODEL,
+    "heavy": LLM_HEAVY_MODEL,
+}
+
+_NO_THINKING = {"thinking_config": {"thinking_budget": 0}}
+
+ROUTES = {
+    "summary": {"tier": "heavy", "max_output_tokens": 16384},
+    "summary_merge": {"tier": "heavy", "max_output_tokens": 16384},
+    "comparison": {"tier": "heavy", "max_output_tokens": 8192},
+    "chat": {"tier": "heavy", "max_output_tokens": 4096},
+    "symptoms": {"tier": "heavy", "max_output_tokens": 4096},
+    "medical_term": {"tier": "light", "max_output_tokens": 512, **_NO_THINKING},
+    "medical_terms": {"tier": "light", "max_output_tokens": 4096, **_NO_THINKING},
+    "medicine": {"tier": "light", "max_output_tokens": 512, **_NO_THINKING},
+    "voice_chat": {"tier": "light", "max_output_tokens": 256, **_NO_THINKING},
+    "schema_repair": {"tier": "light", "max_output_tokens": 16384, **_NO_THINKING},
+}
+
+if LLM_ROUTES:
+    for task, overrides in json.loads(LLM_ROUTES).items():
+        ROUTES[task] = {**ROUTES.get(task, {}), **overrides}
+
+for task, settings in ROUTES.items():
+    if "model" not in settings and settings.get("tier") not in TIERS:
+        raise ValueError(f"LLM route {task!r} needs a model or one of the tiers {sorted(TIERS)}")
+
+
+def route_model(task: str) -> str:
+    settings = ROUTES[task]
+    return settings.get("model") or TIERS[settings["tier"]]
+
+
+def route(task: str, contents, config: dict = None) -> dict:
+    """
+    Keyword arguments for llm_gateway.generate_content (and its async and
+    streaming variants) for one `task`: the routed model, the route's
+    generation settings with `config` (response schema etc.) on top, and
+    the task name for per-route metrics.
+    """
+    if task not in ROUTES:
+        raise ValueError(f"Unknown LLM task: {task}")
+
+    settings = copy.deepcopy(ROUTES[task])
+    settings.pop("tier", None)
+    settings.pop("model", None)
+
+    return dict(
+        model=route_model(task),
+        contents=contents,
+        config={**settings, **(config or {})},
+        task=task,
+    )
+
+
+def get_routes() -> dict:
+    """The resolved routing table: task -> model and generation settings."""
+    return {
+        task: {"model": route_model(task), **{k: v for k, v in settings.items() if k != "model"}}
+        for task, settings in ROUTES.items()
+    }
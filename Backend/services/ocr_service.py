@@ -0,0 +1,69 @@
+# OCR for pages that have no usable text layer (scanned reports).
+# Only the pages handed in here are rendered and OCRed.
+
+import time
+from contextlib import nullcontext
+
+import fitz
+import pytesseract
+from PIL import Image
+
+from services.pdf_workers import DocumentSource, WorkerPool, open_document
+from utils.constants import OCR_LANGUAGES, OCR_PAGE_TIMEOUT, OCR_WORKERS
+
+_ocr_pool = WorkerPool(OCR_WORKERS)
+
+
+def _ocr_page(doc, page_number: int, dpi: int):
+    # Render one page to grayscale and OCR it.
+    start = time.perf_counter()
+    pix = doc[page_number].get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+    image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+
+    try:
+        text = pytesseract.image_to_string(image, lang=OCR_LANGUAGES, timeout=OCR_PAGE_TIMEOUT)
+    except Exception as e:
+        # pytesseract's own exceptions do not survive pickling back to the parent.
+        raise RuntimeError(f"OCR failed on page {page_number + 1}: {e}") from None
+    return page_number, text, time.perf_counter() - start
+
+
+def _ocr_pool_page(source: tuple, page_number: int, dpi: int):
+    # Runs in a pool process, which keeps the document open between pages.
+    return _ocr_page(open_document(source), page_number, dpi)
+
+
+def ocr_pages(doc, page_dpis: dict, source: DocumentSource = None) -> dict:
+    """
+    OCR the given pages of an open PDF.
+
+    With OCR_WORKERS > 1 the pages are OCRed by a shared pool of processes
+    that is started once and reused for every document. Pass `source` to
+    share one DocumentSource with other pool work on the same document.
+
+    Args:
+        doc: Open PyMuPDF document
+        page_dpis: {page_number: dpi} for every page to OCR
+        source: Optional DocumentSource for `doc`
+
+    Returns:
+        {page_number: text}
+    """
+    if not page_dpis:
+        return {}
+
+    jobs = sorted(page_dpis.items())
+
+    if min(OCR_WORKERS, len(jobs)) <= 1:
+        results = [_ocr_page(doc, page_number, dpi) for page_number, dpi in jobs]
+    else:
+        with DocumentSource(doc) if source is None else nullcontext(source) as source:
+            futures = [_ocr_pool.submit(_ocr_pool_page, source.get(), page_number, dpi) for page_number, dpi in jobs]
+            results = [future.result() for future in futures]
+
+    texts = {}
+    for page_number, text, seconds in results:
+        print(f"🔎 OCR page {page_number + 1}: {seconds:.2f}s at {page_dpis[page_number]} dpi, {len(text.strip())} chars")
+        texts[page_number] = text
+
+    return texts
@@ -1,12 +1,253 @@
 # We extract text first, never send raw PDF to AI.
 
-import fitz  
+import io
+import mmap
+from contextlib import contextmanager
+from tempfile import SpooledTemporaryFile
 
-def extract_text_from_pdf(file_path: str) -> str:
+import fitz
+
+from services.document_parser import extract_pages as pypdf2_extract_pages
+from services.ocr_service import ocr_pages
+from services.pdf_workers import DocumentSource, WorkerPool, open_document
+from utils.constants import (
+    OCR_MAX_DPI,
+    OCR_MIN_DPI,
+    OCR_MIN_PAGE_CHARS,
+    OCR_TARGET_PIXELS,
+    PDF_EXTRACT_WORKERS,
+    PDF_EXTRACTOR,
+    PDF_PARALLEL_MIN_PAGES,
+    PDF_STREAM_BATCH_PAGES,
+)
+
+
+_extract_pool = WorkerPool(PDF_EXTRACT_WORKERS)
+
+
+def _extract_page_range(source: tuple, start: int, stop: int) -> list:
+    # Runs in a pool process (see services/pdf_workers.py).
+    doc = open_document(source)
+    return [doc[i].get_text() for i in range(start, stop)]
+
+
+def _page_ranges(page_count: int, parts: int) -> list:
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def iter_pages(doc, batch_pages: int = PDF_STREAM_BATCH_PAGES, source: DocumentSource = None):
+    """
+    Yield the text of every page of an open document, in page order.
+
+    Documents with fewer than PDF_PARALLEL_MIN_PAGES pages are read in the
+    calling thread. Larger ones are extracted by the shared pool of
+    PDF_EXTRACT_WORKERS processes, batch_pages pages at a time, so at most
+    one batch of page text is held in memory. Pass `source` to share one
+    DocumentSource with other pool work on the same document.
+    """
+    page_count = doc.page_count
+    workers = min(PDF_EXTRACT_WORKERS, page_count)
+
+    if page_count < PDF_PARALLEL_MIN_PAGES or workers <= 1:
+        for page in doc:
+            yield page.get_text()
+        return
+
+    if source is None:
+        with DocumentSource(doc) as source:
+            yield from iter_pages(doc, batch_pages, source)
+        return
+
+    batch_pages = max(batch_pages, workers)
+    for batch_start in range(0, page_count, batch_pages):
+        batch_size = min(batch_pages, page_count - batch_start)
+        futures = [
+            _extract_pool.submit(_extract_page_range, source.get(), batch_start + start, batch_start + stop)
+            for start, stop in _page_ranges(batch_size, min(workers, batch_size))
+        ]
+        for future in futures:
+            yield from future.result()
+
+
+def extract_pages(doc) -> list:
+    return list(iter_pages(doc, batch_pages=doc.page_count))
+
+
+def _ocr_dpi(page) -> int:
+    long_edge = max(page.rect.width, page.rect.height)
+    dpi = round(OCR_TARGET_PIXELS * 72 / long_edge) if long_edge else OCR_MAX_DPI
+    return max(OCR_MIN_DPI, min(OCR_MAX_DPI, dpi))
+
+
+def fill_sparse_pages(doc, pages: list, first_page: int = 0, source: DocumentSource = None) -> list:
+    """
+    Replace the text of pages with an empty or near-empty text layer
+    (fewer than OCR_MIN_PAGE_CHARS characters) by OCR output.
+    Pages that already have text are left alone.
+
+    `pages` may be a slice of the document starting at `first_page`.
+    """
+    sparse = {
+        first_page + i: _ocr_dpi(doc[first_page + i])
+        for i, text in enumerate(pages)
+        if len(text.strip()) < OCR_MIN_PAGE_CHARS
+    }
+    if not sparse:
+        return pages
+
+    print(f"🔎 OCR needed for {len(sparse)} of {len(pages)} pages")
+    try:
+        texts = ocr_pages(doc, sparse, source)
+    except Exception as e:
+        print(f"⚠️ OCR failed, keeping text layer only: {e}")
+        return pages
+
+    pages = list(pages)
+    for page_number, text in texts.items():
+        i = page_number - first_page
+        text = text.strip()
+        if len(text) > len(pages[i].strip()):
+            pages[i] = text + "\n"
+    return pages
+
+
+def _auto_extractor(doc):
+    # OCR is batched per window of pages so scanned pages are still OCRed
+    # in parallel without holding the whole document's text. Extraction and
+    # OCR share one DocumentSource, so the document reaches the pools once.
+    with DocumentSource(doc) as source:
+        window = []
+        first_page = 0
+        for text in iter_pages(doc, source=source):
+            window.append(text)
+            if len(window) == PDF_STREAM_BATCH_PAGES:
+                yield from fill_sparse_pages(doc, window, first_page, source)
+                first_page += len(window)
+                window = []
+        if window:
+            yield from fill_sparse_pages(doc, window, first_page, source)
+
+
+def _pypdf2_extractor(doc) -> list:
+    pages = pypdf2_extract_pages(doc.name if doc.name else io.BytesIO(doc.stream))
+    return [text + "\n" for text in pages]
+
+
+def _ocr_extractor(doc) -> list:
+    texts = ocr_pages(doc, {i: _ocr_dpi(doc[i]) for i in range(doc.page_count)})
+    return [texts.get(i, "").strip() + "\n" for i in range(doc.page_count)]
+
+
+# Every extractor takes an open PyMuPDF document and returns (or yields)
+# one string per page, in page order.
+EXTRACTORS = {
+    "auto": _auto_extractor,
+    "pymupdf": iter_pages,
+    "pypdf2": _pypdf2_extractor,
+    "ocr": _ocr_extractor,
+}
+
+
+def register_extractor(name: str, extractor):
+    EXTRACTORS[name] = extractor
+
+
+def iter_document_pages(doc, extractor: str = None):
+    """
+    Iterate per-page text with the named extractor, or PDF_EXTRACTOR when
+    none is given.
+    """
+    name = extractor or PDF_EXTRACTOR
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown PDF extractor: {name}")
+    return iter(EXTRACTORS[name](doc))
+
+
+def extract_document_pages(doc, extractor: str = None) -> list:
+    return list(iter_document_pages(doc, extractor))
+
+
+def extract_text_from_pdf(file_path: str, extractor: str = None) -> str:
     doc = fitz.open(file_path)
-    text = ""
+    try:
+        return "".join(extract_document_pages(doc, extractor)).strip()
+    finally:
+        doc.close()
+
+
+def _underlying_file(stream):
+    # Werkzeug wraps uploads in a SpooledTemporaryFile; look through it to the
+    # BytesIO (still in memory) or the real temp file (rolled over to disk).
+    # SpooledTemporaryFile has no public accessor for either (its fileno()
+    # rolls an in-memory upload over to disk), so this reads the private
+    # `_file` when it is there and otherwise falls back to the public API.
+    if isinstance(stream, SpooledTemporaryFile):
+        inner = getattr(stream, "_file", None)
+        if isinstance(inner, io.BytesIO) or hasattr(inner, "fileno"):
+            return inner
+    return stream
+
+
+@contextmanager
+def open_uploaded_pdf(file):
+    """
+    Open an uploaded Werkzeug FileStorage as a PyMuPDF document without
+    writing it to our own storage.
+
+    In-memory uploads are passed to PyMuPDF as a memoryview over the
+    request buffer, spooled uploads are memory-mapped. Only streams that
+    expose neither are read into a bytes object.
+    """
+    raw = _underlying_file(file.stream)
+    mapped = None
+
+    if isinstance(raw, io.BytesIO):
+        view = raw.getbuffer()
+    else:
+        try:
+            fileno = raw.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            fileno = None
+
+        if fileno is not None:
+            raw.flush()
+            mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped)
+        else:
+            file.stream.seek(0)
+            view = memoryview(file.stream.read())
+
+    if not len(view):
+        view.release()
+        if mapped is not None:
+            mapped.close()
+        raise ValueError("Empty PDF")
+
+    doc = fitz.open(stream=view, filetype="pdf")
+    try:
+        yield doc
+    finally:
+        doc.close()
+        del doc
+        view.release()
+        if mapped is not None:
+            mapped.close()
+
+
+def extract_pages_from_upload(file, extractor: str = None) -> list:
+    """
+    Extract per-page text straight from an uploaded PDF (see open_uploaded_pdf).
+    """
+    with open_uploaded_pdf(file) as doc:
+        return extract_document_pages(doc, extractor)
 
-    for page in doc:
-        text += page.get_text()
 
-    return text.strip()
+def extract_text_from_upload(file, extractor: str = None) -> str:
+    return "".join(extract_pages_from_upload(file, extractor)).strip()
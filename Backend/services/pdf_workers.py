@@ -0,0 +1,111 @@
+# Long-lived process pools for PDF work (page text extraction in
+# pdf_service, OCR in ocr_service) and the way a document reaches them.
+#
+# Pools are created on first use and kept for the life of the worker
+# process, so a large upload does not pay for spawning processes. Tasks
+# never carry the PDF itself: they carry a small (path, key) source. Files
+# on disk are passed by path; in-memory uploads are written once per
+# document to shared memory (/dev/shm where available), and each pool
+# process opens a document once and keeps it until a task for another
+# document arrives.
+
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz
+
+_SHARED_MEMORY_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+class WorkerPool:
+    """A ProcessPoolExecutor created on first use and reused afterwards."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+            return self._executor
+
+    def submit(self, fn, *args):
+        executor = self.executor()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # A pool process died (e.g. killed for memory): start a new pool.
+            print("⚠️ PDF worker pool broken, restarting it")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            return self.executor().submit(fn, *args)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+class DocumentSource:
+    """
+    Picklable handle through which pool processes open `doc`. Nothing is
+    copied until get() is first called, so documents handled entirely in
+    the calling thread never leave it.
+    """
+
+    def __init__(self, doc):
+        self._doc = doc
+        self._file = None
+        self._source = None
+
+    def get(self) -> tuple:
+        if self._source is None:
+            if self._doc.name:
+                stat = os.stat(self._doc.name)
+                self._source = (self._doc.name, f"{stat.st_mtime_ns}:{stat.st_size}")
+            else:
+                self._file = tempfile.NamedTemporaryFile(dir=_SHARED_MEMORY_DIR, suffix=".pdf")
+                self._file.write(self._doc.stream)
+                self._file.flush()
+                self._source = (self._file.name, uuid.uuid4().hex)
+        return self._source
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# The document a pool process currently has open: (source, fitz.Document).
+_open = None
+
+
+def _init_worker():
+    # Forked pool processes must not inherit the parent's open document.
+    global _open
+    _open = None
+
+
+def open_document(source: tuple):
+    """In a pool process: the document for `source`, reopened only when it changes."""
+    global _open
+    if _open is None or _open[0] != source:
+        if _open is not None:
+            _open[1].close()
+        _open = (source, fitz.open(source[0]))
+    return _open[1]
@@ -42,42 +42,189 @@
 #    raise ReportProcessingError()
 
 
-import os, uuid, traceback
-from services.pdf_service import extract_text_from_pdf
+import asyncio, itertools, json, traceback
+from services.pdf_service import iter_document_pages, open_uploaded_pdf
+from services.text_compaction import iter_compacted_pages
 from services.deidentification_service import anonymize
-from services.gemini_service import generate_summary
+from services.lab_value_parser import extract_lab_values
+from services.gemini_service import generate_summary_stream, validate_summary
+from services.llm_gateway import run_async, submit_async
+from services.response_cache import get_or_explain_medical_terms_async
+from services.summary_cache import cache_summary, get_cached_summary_for, get_or_generate_summary_async
+from services.summary_stream_parser import SummaryStreamParser
 from services.report_repository import save_report
-from utils.exception import ReportProcessingError
+from utils.constants import MEDICAL_TERM_BATCH_MAX
+from utils.exception import LLMUnavailableError, ReportProcessingError
 
-UPLOAD_DIR = "storage/uploads"
 
-def process_report(file, user_id, report_type, language):
+def attach_visualizations(summary: str, visualizations: list, term_explanations: dict = None) -> str:
+    """
+    Put locally parsed lab values into the summary JSON under `visualizations`,
+    and explanations of the flagged ones under `term_explanations`.
+    Summaries that are not JSON objects are returned unchanged.
+    """
+    try:
+        data = json.loads(summary)
+    except ValueError:
+        return summary
+    if not isinstance(data, dict):
+        return summary
+
+    data["visualizations"] = visualizations
+    if term_explanations is not None:
+        data["term_explanations"] = term_explanations
+    return json.dumps(data, ensure_ascii=False)
+
+
+def flagged_terms(visualizations: list) -> list:
+    # Lab parameters outside their reference range, once each, in report order.
+    terms = []
+    for item in visualizations:
+        if item["status"] != "Normal" and item["label"] not in terms:
+            terms.append(item["label"])
+    return terms[:MEDICAL_TERM_BATCH_MAX]
+
+
+async def explain_terms_async(terms: list, language: str) -> dict:
+    """
+    Explain terms with one batched call (dictionary and cache hits first,
+    see response_cache.get_or_explain_medical_terms_async). Terms that
+    cannot be explained are left out rather than failing the report.
+    """
+    if not terms:
+        return {}
     try:
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        return await get_or_explain_medical_terms_async(terms, language)
+    except Exception as e:
+        print(f"⚠️ Could not explain {len(terms)} flagged terms: {e}")
+        return {}
+
+
+async def summarize_report_async(safe_text: str, visualizations: list, language: str) -> str:
+    # The summary and the flagged terms' explanations are independent calls.
+    summary, term_explanations = await asyncio.gather(
+        get_or_generate_summary_async(safe_text, language),
+        explain_terms_async(flagged_terms(visualizations), language),
+    )
+    return attach_visualizations(summary, visualizations, term_explanations)
+
+
+def iter_sanitized_pages(doc, compaction: dict = None):
+    """
+    Extract -> compact -> anonymize one page at a time, so only a bounded
+    window of page text (the extraction/OCR batch and the compaction
+    lookahead) is in memory while the PDF is being read.
+    """
+    pages = iter_document_pages(doc)
+    for page in iter_compacted_pages(pages, compaction):
+        yield anonymize(page)
+
+
+def prepare_report(file):
+    """
+    Everything before the summary: extract, compact and anonymize the
+    upload, then parse lab values locally.
+
+    Returns:
+        (safe_text, visualizations)
+    """
+    filename = file.filename
+
+    # Read the upload in place; nothing is persisted under storage/.
+    compaction = {}
+    with open_uploaded_pdf(file) as doc:
+        safe_text = "\n".join(iter_sanitized_pages(doc, compaction))
 
-        filename = file.filename
-        file_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}.pdf")
-        file.save(file_path)
+    if not safe_text.strip():
+        raise ValueError("Empty PDF")
+    print(
+        f"✂️ Compacted {filename}: {compaction['tokens_before']} -> "
+        f"{compaction['tokens_after']} tokens (saved ~{compaction['tokens_saved']})"
+    )
 
-        raw_text = extract_text_from_pdf(file_path)
-        if not raw_text.strip():
-            raise ValueError("Empty PDF")
+    return safe_text, extract_lab_values(safe_text)
 
-        safe_text = anonymize(raw_text)
-        summary = generate_summary(safe_text, language)
 
-        report_data = {
-            "userId": user_id,
-            "reportType": report_type.strip().upper(),     # ✅ normalize
-    "reportName": filename.strip().lower(),
-            "summary": summary,
-            "sanitizedText": safe_text,
-            "language": language
-        }
+def save_processed_report(user_id, filename, report_type, language, safe_text, summary):
+    report_data = {
+        "userId": user_id,
+        "reportType": report_type.strip().upper(),     # ✅ normalize
+        "reportName": filename.strip().lower(),
+        "summary": summary,
+        "sanitizedText": safe_text,
+        "language": language
+    }
+    return save_report(report_data)
 
-        report_id = save_report(report_data)
+
+def process_report(file, user_id, report_type, language):
+    try:
+        safe_text, visualizations = prepare_report(file)
+
+        summary = run_async(summarize_report_async(safe_text, visualizations, language))
+
+        report_id = save_processed_report(user_id, file.filename, report_type, language, safe_text, summary)
         return report_id, summary
 
+    except LLMUnavailableError:
+        raise
     except Exception:
         traceback.print_exc()
         raise ReportProcessingError()
+
+
+def stream_report_summary(safe_text, visualizations, user_id, filename, report_type, language):
+    """
+    Generate, save and stream a prepared report's summary as (event, data)
+    pairs, in the order the upload screen can show them:
+
+    - "visualization": one chart datum (already known, sent first)
+    - "insight": one insight block, as soon as Gemini has finished it
+    - "summary_text": {"summary_text"} once the whole summary is in
+    - "done": the saved report, same fields as /reports/upload returns
+    """
+    # The summary stream is opened (admission and first chunk) before the
+    # first event, so a route that starts this generator before its
+    # response can answer a rejected LLM call with 429.
+    summary = get_cached_summary_for(safe_text, language)
+    if summary is None:
+        chunks = generate_summary_stream(safe_text, language)
+        first_chunk = next(chunks, "")
+
+    # Explained while the summary streams; attached before saving.
+    term_explanations = submit_async(explain_terms_async(flagged_terms(visualizations), language))
+
+    for item in visualizations:
+        yield "visualization", item
+
+    if summary is not None:
+        try:
+            data = json.loads(summary)
+        except ValueError:
+            data = {}
+        data = data if isinstance(data, dict) else {}
+        for insight in data.get("insights", []):
+            yield "insight", insight
+    else:
+        parser = SummaryStreamParser()
+        for chunk in itertools.chain([first_chunk], chunks):
+            for key, item in parser.feed(chunk):
+                if key == "insights":
+                    yield "insight", item
+        data = validate_summary(parser.text())
+        summary = json.dumps(data, ensure_ascii=False)
+        cache_summary(safe_text, language, summary)
+
+    yield "summary_text", {"summary_text": data.get("summary_text", "")}
+
+    summary = attach_visualizations(summary, visualizations, term_explanations.result())
+    report_id = save_processed_report(user_id, filename, report_type, language, safe_text, summary)
+
+    yield "done", {
+        "id": report_id,
+        "reportName": filename.strip().lower(),
+        "reportType": report_type.strip().upper(),
+        "summary": summary,
+        "userId": user_id,
+        "language": language
+    }
@@ -0,0 +1,327 @@
+# Bounded LRU + TTL cache for Gemini answers that depend only on their
+# (normalized) input and language, e.g. medical term explanations and
+# medicine lookups. The prompt version is part of every key, so changing a
+# prompt stops old answers from being served.
+#
+# Two backends:
+# - "memory": per-process cachetools TTLCache (default)
+# - "sqlite": one SQLite file shared by every worker on the host
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from cachetools import TTLCache
+from pydantic import ValidationError
+from services.gemini_service import (
+    MEDICAL_TERM_PROMPT_VERSION,
+    MEDICINE_PROMPT_VERSION,
+    explain_medical_term,
+    explain_medical_term_async,
+    explain_medical_terms,
+    explain_medical_terms_async,
+    identify_medicine,
+    identify_medicine_async,
+)
+from services.llm_gateway import run_async
+from services.medical_term_dictionary import explain_from_dictionary
+from services.medicine_catalog import identify_from_catalog
+from services.llm_metrics import record_cache_lookup
+from utils.constants import (
+    RESPONSE_CACHE_BACKEND,
+    RESPONSE_CACHE_PATH,
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_TTL_SECONDS,
+)
+from utils.exception import LLMOutputInvalidError
+
+
+class MemoryCacheBackend:
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._cache[key] = value
+
+    def size(self) -> int:
+        with self._lock:
+            self._cache.expire()
+            return len(self._cache)
+
+
+class SqliteCacheBackend:
+    """
+    LRU + TTL on a SQLite file, so all gunicorn workers on a host share
+    one cache. Entries past their TTL are never returned; once there are
+    more than `maxsize` entries the least recently read ones are dropped.
+    """
+
+    def __init__(self, path: str, maxsize: int, ttl: float):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS response_cache_accessed ON response_cache (accessed_at)")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM response_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE response_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl, now),
+            )
+            conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                " SELECT key FROM response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def size(self) -> int:
+        with self._connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM response_cache WHERE expires_at > ?", (time.time(),)
+            ).fetchone()[0]
+
+
+# Backends by name; see RESPONSE_CACHE_BACKEND.
+BACKENDS = {
+    "memory": lambda: MemoryCacheBackend(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS),
+    "sqlite": lambda: SqliteCacheBackend(RESPONSE_CACHE_PATH, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS),
+}
+
+if RESPONSE_CACHE_BACKEND not in BACKENDS:
+    raise ValueError(f"Unknown response cache backend: {RESPONSE_CACHE_BACKEND}")
+
+_backend = BACKENDS[RESPONSE_CACHE_BACKEND]()
+_lock = threading.Lock()
+_stats = {}
+
+
+def normalize_key_part(value: str) -> str:
+    # "  HbA1c " and "hba1c" are the same question.
+    return " ".join(str(value).split()).casefold()
+
+
+def response_cache_key(namespace: str, prompt_version: str, *parts) -> str:
+    return "|".join([namespace, prompt_version] + [normalize_key_part(part) for part in parts])
+
+
+def _count(namespace: str, field: str):
+    with _lock:
+        counts = _stats.setdefault(namespace, {"hits": 0, "misses": 0})
+        counts[field] += 1
+
+
+def get_cached(namespace: str, key: str):
+    try:
+        value = _backend.get(key)
+    except Exception as e:
+        print(f"⚠️ Response cache lookup failed: {e}")
+        value = None
+    _count(namespace, "hits" if value is not None else "misses")
+    record_cache_lookup(namespace, value is not None)
+    return value
+
+
+def set_cached(key: str, value: str):
+    try:
+        _backend.set(key, value)
+    except Exception as e:
+        print(f"⚠️ Response cache write failed: {e}")
+
+
+def cached_call(namespace: str, prompt_version: str, parts: tuple, compute):
+    """
+    Return the cached answer for (namespace, prompt_version, *parts), or
+    call compute() and cache its result.
+    """
+    key = response_cache_key(namespace, prompt_version, *parts)
+    value = get_cached(namespace, key)
+    if value is None:
+        value = compute()
+        set_cached(key, value)
+    return value
+
+
+async def cached_call_async(namespace: str, prompt_version: str, parts: tuple, compute):
+    """cached_call for an async compute()."""
+    key = response_cache_key(namespace, prompt_version, *parts)
+    value = get_cached(namespace, key)
+    if value is None:
+        value = await compute()
+        set_cached(key, value)
+    return value
+
+
+def get_or_explain_medical_term(term: str, language: str = "en") -> str:
+    # Terms in the bundled dictionary never reach the cache or the LLM.
+    explanation = explain_from_dictionary(term, language)
+    if explanation is not None:
+        return explanation
+    return cached_call(
+        "medical_term", MEDICAL_TERM_PROMPT_VERSION, (term, language),
+        lambda: explain_medical_term(term, language),
+    )
+
+
+async def get_or_explain_medical_term_async(term: str, language: str = "en") -> str:
+    explanation = explain_from_dictionary(term, language)
+    if explanation is not None:
+        return explanation
+    return await cached_call_async(
+        "medical_term", MEDICAL_TERM_PROMPT_VERSION, (term, language),
+        lambda: explain_medical_term_async(term, language),
+    )
+
+
+def _local_term_explanations(terms: list, language: str):
+    # (cache keys, {term: explanation} from the dictionary or the cache,
+    # the other terms once per key) for a batch of terms.
+    keys = {term: response_cache_key("medical_term", MEDICAL_TERM_PROMPT_VERSION, term, language) for term in terms}
+
+    explanations = {}
+    misses = []
+    seen = set()
+    for term in terms:
+        value = explain_from_dictionary(term, language)
+        if value is None:
+            value = get_cached("medical_term", keys[term])
+        if value is not None:
+            explanations[term] = value
+        elif keys[term] not in seen:
+            misses.append(term)
+        seen.add(keys[term])
+    return keys, explanations, misses
+
+
+def _cache_batch_answer(answered: dict, keys: dict, explanations: dict):
+    for term, value in answered.items():
+        explanations[term] = value
+        set_cached(keys[term], value)
+
+
+def _by_term(terms: list, keys: dict, explanations: dict) -> dict:
+    # Spellings that differ only in case/whitespace share one answer.
+    by_key = {keys[term]: value for term, value in explanations.items()}
+    return {term: by_key[keys[term]] for term in terms if keys[term] in by_key}
+
+
+def get_or_explain_medical_terms(terms: list, language: str = "en") -> dict:
+    """
+    Explain a batch of terms: dictionary and cache hits are answered
+    locally and all misses go to Gemini in one call (explain_medical_terms).
+    Terms the batch answer leaves out are explained one by one, concurrently.
+
+    Returns:
+        {term: explanation}, keyed by the terms as given.
+    """
+    keys, explanations, misses = _local_term_explanations(terms, language)
+
+    if misses:
+        try:
+            answered = explain_medical_terms(misses, language)
+        except (ValueError, ValidationError, LLMOutputInvalidError) as e:
+            # No usable JSON even after repair: fall back to single-term calls below.
+            print(f"⚠️ Batch term explanation unusable: {e}")
+            answered = {}
+        _cache_batch_answer(answered, keys, explanations)
+
+        left = [term for term in misses if term not in answered]
+        if left:
+            async def explain_left():
+                return await asyncio.gather(*(get_or_explain_medical_term_async(term, language) for term in left))
+
+            for term, value in zip(left, run_async(explain_left())):
+                explanations[term] = value
+
+    return _by_term(terms, keys, explanations)
+
+
+async def get_or_explain_medical_terms_async(terms: list, language: str = "en") -> dict:
+    """
+    get_or_explain_medical_terms for the event loop, with at most one
+    Gemini call: terms the batch answer leaves out are not retried one by
+    one, so they are missing from the result.
+    """
+    keys, explanations, misses = _local_term_explanations(terms, language)
+    if misses:
+        _cache_batch_answer(await explain_medical_terms_async(misses, language), keys, explanations)
+    return _by_term(terms, keys, explanations)
+
+
+def get_or_identify_medicine(medicine_name: str, language: str = "en") -> dict:
+    # Catalog medicines never reach the cache or the LLM; LLM answers for
+    # the rest are stored as JSON text, since both backends hold strings.
+    result = identify_from_catalog(medicine_name, language)
+    if result is not None:
+        return result
+    return json.loads(cached_call(
+        "medicine", MEDICINE_PROMPT_VERSION, (medicine_name, language),
+        lambda: json.dumps(identify_medicine(medicine_name, language), ensure_ascii=False),
+    ))
+
+
+async def get_or_identify_medicine_async(medicine_name: str, language: str = "en") -> dict:
+    result = identify_from_catalog(medicine_name, language)
+    if result is not None:
+        return result
+
+    async def identify():
+        return json.dumps(await identify_medicine_async(medicine_name, language), ensure_ascii=False)
+
+    return json.loads(await cached_call_async(
+        "medicine", MEDICINE_PROMPT_VERSION, (medicine_name, language), identify,
+    ))
+
+
+def get_response_cache_stats():
+    with _lock:
+        stats = {namespace: dict(counts) for namespace, counts in _stats.items()}
+    for counts in stats.values():
+        total = counts["hits"] + counts["misses"]
+        counts["hit_ratio"] = counts["hits"] / total if total else 0.0
+
+    try:
+        size = _backend.size()
+    except Exception:
+        size = None
+    return {"backend": RESPONSE_CACHE_BACKEND, "size": size, "namespaces": stats}
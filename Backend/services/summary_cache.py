@@ -0,0 +1,101 @@
+# Content-addressed cache in front of generate_summary.
+# Identical report text (after anonymization) in the same language and with
+# the same prompt version always maps to the same summary, so re-uploads
+# skip the LLM entirely.
+
+import asyncio
+import hashlib
+import json
+import threading
+from cachetools import LRUCache
+from services.gemini_service import generate_summary, generate_summary_async, SUMMARY_PROMPT_VERSION
+from services.llm_metrics import record_cache_lookup
+from services.summary_cache_repository import get_cached_summary, save_cached_summary
+from utils.constants import SUMMARY_CACHE_LOCAL_SIZE
+
+_local = LRUCache(maxsize=SUMMARY_CACHE_LOCAL_SIZE)
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def summary_cache_key(text: str, language: str, prompt_version: str = SUMMARY_PROMPT_VERSION) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{digest}_{language}_{prompt_version}"
+
+
+def _count(field):
+    with _lock:
+        _stats[field] += 1
+
+
+def get_summary_cache_stats():
+    with _lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0
+    }
+
+
+def get_cached_summary_for(safe_text: str, language: str):
+    """
+    Look a summary up in this process, then in Firestore. Returns None on a
+    miss; hits and misses are counted.
+    """
+    key = summary_cache_key(safe_text, language)
+
+    with _lock:
+        summary = _local.get(key)
+
+    if summary is None:
+        try:
+            summary = get_cached_summary(key)
+        except Exception as e:
+            print(f"⚠️ Summary cache lookup failed: {e}")
+            summary = None
+
+        if summary is not None:
+            with _lock:
+                _local[key] = summary
+
+    if summary is not None:
+        _count("hits")
+        print(f"✅ Summary cache hit: {key[:12]}")
+    else:
+        _count("misses")
+    record_cache_lookup("summary", summary is not None)
+    return summary
+
+
+def cache_summary(safe_text: str, language: str, summary: str):
+    key = summary_cache_key(safe_text, language)
+
+    with _lock:
+        _local[key] = summary
+    try:
+        save_cached_summary(key, summary, language, SUMMARY_PROMPT_VERSION)
+    except Exception as e:
+        print(f"⚠️ Summary cache write failed: {e}")
+
+
+def get_or_generate_summary(safe_text: str, language: str) -> str:
+    """
+    Return the summary for already-anonymized report text, calling Gemini
+    only when neither this process nor Firestore has seen it before.
+    """
+    summary = get_cached_summary_for(safe_text, language)
+    if summary is None:
+        summary = json.dumps(generate_summary(safe_text, language), ensure_ascii=False)
+        cache_summary(safe_text, language, summary)
+    return summary
+
+
+async def get_or_generate_summary_async(safe_text: str, language: str) -> str:
+    # Firestore lookups and writes block, so they run off the event loop.
+    summary = await asyncio.to_thread(get_cached_summary_for, safe_text, language)
+    if summary is None:
+        summary = json.dumps(await generate_summary_async(safe_text, language), ensure_ascii=False)
+        await asyncio.to_thread(cache_summary, safe_text, language, summary)
+    return summary
@@ -0,0 +1,18 @@
+from firebase_admin_init import db
+from datetime import datetime
+
+
+def get_cached_summary(cache_key):
+    doc = db.collection("summary_cache").document(cache_key).get()
+    if not doc.exists:
+        return None
+    return doc.to_dict().get("summary")
+
+
+def save_cached_summary(cache_key, summary, language, prompt_version):
+    db.collection("summary_cache").document(cache_key).set({
+        "summary": summary,
+        "language": language,
+        "promptVersion": prompt_version,
+        "createdAt": datetime.utcnow()
+    })
@@ -0,0 +1,94 @@
+# Incremental parser for the summary JSON while Gemini is still streaming it.
+# Each object inside the top-level "insights" (or "visualizations") array is
+# handed out as soon as its closing brace arrives, instead of waiting for
+# the whole document.
+
+import json
+
+
+class SummaryStreamParser:
+    """
+    Feed raw text chunks with feed(); it returns the (key, item) pairs that
+    were completed by that chunk, e.g. ("insights", {...}). text() returns
+    everything fed so far, for validating the finished document.
+
+    Only the top-level object is tracked, so text outside it (such as a
+    ```json fence) is ignored.
+    """
+
+    def __init__(self, array_keys=("insights", "visualizations")):
+        self.array_keys = set(array_keys)
+        self._buffer = []
+        self._length = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._expect_key = False
+        self._key = None
+        self._array_key = None
+        self._item_start = None
+        self._started = False
+        self._done = False
+
+    def feed(self, chunk: str) -> list:
+        items = []
+        base = self._length
+        self._buffer.append(chunk)
+        self._length += len(chunk)
+
+        for offset, char in enumerate(chunk):
+            if self._done:
+                break
+            position = base + offset
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        self._key = json.loads(self._text(self._string_start, position + 1))
+                        self._expect_key = False
+                continue
+
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = position
+            elif char in "{[":
+                if char == "[" and self._depth == 1 and self._key in self.array_keys:
+                    self._array_key = self._key
+                elif char == "{" and self._depth == 2 and self._array_key:
+                    self._item_start = position
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if char == "}" and self._depth == 2 and self._item_start is not None:
+                    item = json.loads(self._text(self._item_start, position + 1))
+                    items.append((self._array_key, item))
+                    self._item_start = None
+                elif char == "]" and self._depth == 1:
+                    self._array_key = None
+                elif self._depth == 0:
+                    self._done = True
+            elif char == "," and self._depth == 1:
+                self._expect_key = True
+
+        return items
+
+    def _text(self, start: int, stop: int) -> str:
+        if len(self._buffer) > 1:
+            self._buffer = ["".join(self._buffer)]
+        return self._buffer[0][start:stop]
+
+    def text(self) -> str:
+        return "".join(self._buffer)
@@ -0,0 +1,178 @@
+# Emergency fast path for the symptom checker. Red-flag phrases
+# (data/red_flags.json: chest pain, can't breathe, severe bleeding, ... in
+# English, Hindi, Marathi and romanized Hindi/Marathi) are found with one
+# Aho-Corasick pass over the description, so urgent-care guidance is
+# returned in microseconds instead of after a full Gemini round-trip
+# (routes/symptom_checker_routes.py).
+#
+# Matching only ever adds a warning: a description without red flags still
+# goes to the LLM as before, whose prompt also asks for urgent-care advice.
+# A red flag is only ignored when a negation directly precedes it in the
+# same clause ("no chest pain", but not "No, chest pain since morning").
+
+import json
+import re
+import threading
+import unicodedata
+from collections import deque
+
+from utils.constants import SYMPTOM_RED_FLAGS_PATH
+
+# A red flag right after one of these words ("no chest pain") is not reported.
+_NEGATIONS = {"no", "not", "without", "denies", "denied", "never"}
+
+# Negations do not carry over punctuation, so the raw text is split into
+# clauses here before it is normalized.
+_CLAUSE_BREAK = re.compile(r"[.,;:!?।\n]+")
+
+
+def normalize_text(text: str) -> str:
+    # Case, punctuation and spacing do not matter, and "can't" matches
+    # "cant". Only punctuation is removed, so Devanagari vowel signs stay.
+    text = unicodedata.normalize("NFC", str(text)).casefold()
+    text = re.sub(r"['’`]", "", text)
+    text = re.sub(r"[\s.,;:!?\"()\[\]{}/\\|*_+=<>-]+", " ", text)
+    return " ".join(text.split())
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over normalized phrases. A phrase only matches
+    from the start of a word but may end inside one, so "chest pain" also
+    finds "chest pains" and "दौरा पड़" finds "दौरा पड़ा".
+    """
+
+    def __init__(self, phrases: dict):
+        # phrases: {phrase: value}. State 0 is the root.
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for phrase, value in phrases.items():
+            key = " " + normalize_text(phrase)
+            state = 0
+            for char in key:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append((len(key), phrase, value))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> list:
+        """(start, phrase, value) of every phrase in `text`, in order of their end."""
+        text = " " + normalize_text(text)
+        matches = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, phrase, value in self._output[state]:
+                matches.append((position - length + 1, phrase, value))
+        return matches
+
+    @property
+    def states(self) -> int:
+        return len(self._goto)
+
+
+def _negated(text: str, start: int) -> bool:
+    previous = text[:start].split()
+    return bool(previous) and previous[-1] in _NEGATIONS
+
+
+class RedFlagTriage:
+    def __init__(self, data: dict):
+        self.version = data.get("version")
+        self.guidance = data["guidance"]
+        self.categories = {category["id"]: category for category in data["categories"]}
+        self._matcher = PhraseMatcher({
+            phrase: category["id"]
+            for category in data["categories"] for phrase in category["phrases"]
+        })
+
+    def check(self, symptoms: str, language: str = "en"):
+        """
+        None if `symptoms` contains no red flag, otherwise
+        {"categories", "phrases", "guidance"} with the guidance in
+        `language` (English if the file has no text for it).
+        """
+        categories, phrases = [], []
+        for clause in _CLAUSE_BREAK.split(str(symptoms)):
+            text = " " + normalize_text(clause)
+            for start, phrase, category in self._matcher.find(clause):
+                if _negated(text, start):
+                    continue
+                if category not in categories:
+                    categories.append(category)
+                if phrase not in phrases:
+                    phrases.append(phrase)
+        if not categories:
+            return None
+
+        lines = [self.guidance.get(language) or self.guidance["en"]]
+        for category in categories:
+            advice = self.categories[category]["advice"]
+            lines.append(advice.get(language) or advice["en"])
+        return {"categories": categories, "phrases": phrases, "guidance": "\n\n".join(lines)}
+
+
+def _load_triage(path: str) -> RedFlagTriage:
+    with open(path, encoding="utf-8") as f:
+        triage = RedFlagTriage(json.load(f))
+    print(f"🚑 Loaded red-flag triage v{triage.version}: {len(triage.categories)} categories, "
+          f"{triage._matcher.states} matcher states")
+    return triage
+
+
+_triage = None
+_triage_lock = threading.Lock()
+_lock = threading.Lock()
+_stats = {"checked": 0, "emergencies": 0, "categories": {}}
+
+
+def get_triage() -> RedFlagTriage:
+    global _triage
+    with _triage_lock:
+        if _triage is None:
+            _triage = _load_triage(SYMPTOM_RED_FLAGS_PATH)
+        return _triage
+
+
+def check_red_flags(symptoms: str, language: str = "en"):
+    """Emergency guidance if `symptoms` has red flags, else None (ask the LLM)."""
+    result = get_triage().check(symptoms, language)
+
+    with _lock:
+        _stats["checked"] += 1
+        if result is not None:
+            _stats["emergencies"] += 1
+            for category in result["categories"]:
+                _stats["categories"][category] = _stats["categories"].get(category, 0) + 1
+    if result is not None:
+        print(f"🚑 Symptom red flags: {', '.join(result['categories'])}")
+    return result
+
+
+def get_triage_stats() -> dict:
+    triage = get_triage()
+    with _lock:
+        return {
+            "version": triage.version,
+            "categories": len(triage.categories),
+            "checked": _stats["checked"],
+            "emergencies": _stats["emergencies"],
+            "by_category": dict(_stats["categories"]),
+        }
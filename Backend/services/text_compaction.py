@@ -0,0 +1,155 @@
+# Shrinks extracted report text before it is anonymized and sent to Gemini:
+# letterheads, addresses and table headers that every page repeats are kept
+# only once, page footers are dropped and whitespace is collapsed.
+
+import re
+from collections import deque
+from services.lab_value_parser import is_lab_parameter
+from utils.constants import (
+    COMPACTION_LOOKAHEAD_PAGES,
+    COMPACTION_MIN_LINE_CHARS,
+    COMPACTION_REPEAT_RATIO,
+)
+
+# Candidate line states: not emitted yet (0), emitted once, and since
+# dropped from a later page as repeated.
+_EMITTED = 1
+_DROPPED = 2
+
+_WHITESPACE_RE = re.compile(r"[ \t\u00a0]+")
+
+_FOOTER_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in [
+        r"^page\s*(no\.?\s*)?:?\s*\d+(\s*(of|/)\s*\d+)?$",
+        r"^\d+\s*of\s*\d+$",
+        r"^\**\s*end of (the )?report\s*\**$",
+        r".*computer[\s-]generated report.*",
+        r".*does not require (a )?signature.*",
+        r".*not (valid )?for medico[\s-]?legal purposes?.*",
+        r"^(printed|print date|report printed)\s*(on|date)?\s*:.*",
+    ]
+]
+
+
+def estimate_tokens(chars: int) -> int:
+    # Rough Gemini tokenizer estimate (about 4 characters per token for
+    # English); good enough to compare before/after sizes.
+    return (chars + 3) // 4
+
+
+def _normalize(line: str) -> str:
+    return _WHITESPACE_RE.sub(" ", line).strip()
+
+
+def _is_footer(line: str) -> bool:
+    return any(pattern.match(line) for pattern in _FOOTER_PATTERNS)
+
+
+def _is_boilerplate_candidate(line: str) -> bool:
+    # Short lines and lab parameter names repeat legitimately in tables.
+    return len(line) >= COMPACTION_MIN_LINE_CHARS and not is_lab_parameter(line)
+
+
+def _forget_lines(counts: dict, before_page: int, threshold: float):
+    # Forget lines that are not repeated (yet) and were last seen before
+    # `before_page`. Repeated lines are kept: there can only be a few of
+    # them per page, however long the document.
+    for line in [line for line, (seen, last_page, _) in counts.items()
+                 if last_page < before_page and seen < threshold]:
+        del counts[line]
+
+
+def _compact_page(lines: list, counts: dict, threshold: float, stats: dict) -> str:
+    kept = []
+    for line in lines:
+        entry = counts.get(line)
+        if entry is not None:
+            if entry[2] and entry[0] >= threshold:
+                if entry[2] == _EMITTED:
+                    entry[2] = _DROPPED
+                    stats["repeated_lines"] += 1
+                continue
+            entry[2] = entry[2] or _EMITTED
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def iter_compacted_pages(pages, stats: dict = None, lookahead: int = COMPACTION_LOOKAHEAD_PAGES):
+    """
+    Compact pages one at a time, yielding each non-empty page's text.
+
+    - Lines present on at least COMPACTION_REPEAT_RATIO of the pages (and on
+      two or more) are treated as header/footer boilerplate and kept only
+      where they first appear.
+      Short lines and lab parameter names are never dropped this way,
+      because table layouts legitimately repeat them.
+    - Page numbers and known disclaimer lines are dropped.
+    - Runs of spaces and blank lines are collapsed.
+
+    A page is compacted once `lookahead` further pages have been read, with
+    the ratio taken over every page read so far: for documents of up to
+    lookahead + 1 pages that is the whole document. Only the pages in that
+    window and the counts of lines that are repeated or still in the window
+    are held, so memory does not grow with the length of the document.
+    If `stats` is given it is filled with chars/tokens before and after.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(chars_before=0, chars_after=0, pages=0, repeated_lines=0)
+
+    counts = {}  # candidate line -> [pages it is on, last page it is on, state]
+    window = deque()
+
+    def emit():
+        text = _compact_page(window.popleft(), counts, max(2, COMPACTION_REPEAT_RATIO * stats["pages"]), stats)
+        if text:
+            stats["chars_after"] += len(text) + (1 if stats["chars_after"] else 0)
+        return text
+
+    for number, page in enumerate(pages):
+        stats["chars_before"] += len(page)
+        stats["pages"] += 1
+
+        lines = []
+        for line in page.splitlines():
+            line = _normalize(line)
+            if line and not _is_footer(line):
+                lines.append(line)
+
+        for line in set(lines):
+            if _is_boilerplate_candidate(line):
+                entry = counts.setdefault(line, [0, number, 0])
+                entry[0] += 1
+                entry[1] = number
+        window.append(lines)
+
+        if len(window) > lookahead:
+            text = emit()
+            if text:
+                yield text
+        # Every `lookahead` pages, forget lines absent from the window and
+        # the `lookahead` pages before it.
+        period = max(lookahead, 1)
+        if (number + 1) % period == 0:
+            _forget_lines(counts, number + 1 - len(window) - period, max(2, COMPACTION_REPEAT_RATIO * stats["pages"]))
+
+    while window:
+        text = emit()
+        if text:
+            yield text
+
+    stats["tokens_before"] = estimate_tokens(stats["chars_before"])
+    stats["tokens_after"] = estimate_tokens(stats["chars_after"])
+    stats["tokens_saved"] = stats["tokens_before"] - stats["tokens_after"]
+
+
+def compact_pages(pages: list):
+    """
+    Join per-page text into one compacted string (see iter_compacted_pages).
+
+    Returns:
+        (text, stats) where stats has chars/tokens before and after.
+    """
+    stats = {}
+    text = "\n".join(iter_compacted_pages(pages, stats))
+    return text, stats
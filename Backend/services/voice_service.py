@@ -143,7 +143,9 @@
 from google.cloud import speech
 
 from gtts import gTTS
-from services.gemini_service import client
+from services.llm_gateway import generate_content
+from services.model_router import route
+from utils.exception import LLMUnavailableError
 from utils.language import get_language_instruction
 import os
 import io
@@ -347,10 +349,7 @@ Give a SHORT, clear, voice-friendly answer (2 sentences maximum).
 Remember: This will be spoken out loud, so keep it brief and conversational."""
 
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt
-        )
+        response = generate_content(**route("voice_chat", prompt))
         
         if not hasattr(response, "text") or not response.text:
             raise ValueError("Empty or invalid response from Gemini API")
@@ -374,6 +373,8 @@ Remember: This will be spoken out loud, so keep it brief and conversational."""
         
         return voice_response
     
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         print(f"❌ Error generating voice response: {str(e)}")
         raise Exception(f"Error generating chat response: {str(e)}")
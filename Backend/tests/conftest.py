@@ -0,0 +1,31 @@
+# Run from Backend/ with `python -m pytest -q tests`. Everything runs
+# offline: LLM calls go to the fake backend without artificial delay.
+
+import os
+import sys
+import types
+
+import pytest
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY_MS", "0")
+os.environ.setdefault("FAKE_LLM_LATENCY_SIGMA", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    """
+    A test client for app.py. firebase_admin_init needs the service account
+    key, so Firestore is left out (tests that reach a repository replace
+    it themselves) and any bearer token is accepted as user "test-user".
+    """
+    if "firebase_admin_init" not in sys.modules:
+        monkeypatch.setitem(sys.modules, "firebase_admin_init", types.SimpleNamespace(db=None))
+    from app import app
+    from middleware import auth_middleware
+
+    monkeypatch.setattr(auth_middleware, "verify_firebase_token", lambda token: {"uid": "test-user"})
+    app.testing = True
+    return app.test_client()
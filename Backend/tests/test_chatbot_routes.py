@@ -0,0 +1,49 @@
+import pytest
+
+AUTH = {"Authorization": "Bearer test-token"}
+BODY = {"sessionId": "session-1", "message": "Is my hemoglobin fine?"}
+
+
+@pytest.fixture
+def chatbot_routes(app_client):
+    # Imported after app_client has left Firestore out.
+    from routes import chatbot_routes
+    return chatbot_routes
+
+
+@pytest.fixture
+def chat_session(chatbot_routes, monkeypatch):
+    # One session on a saved report, without Firestore; saved messages are
+    # kept as (role, content).
+    saved = []
+    monkeypatch.setattr(chatbot_routes, "get_chat_session",
+                        lambda session_id, user_id: {"reportId": "report-1", "messages": []})
+    monkeypatch.setattr(chatbot_routes, "get_report_with_retry",
+                        lambda *args, **kwargs: {"id": "report-1", "summary": "Hemoglobin is normal."})
+    monkeypatch.setattr(chatbot_routes, "add_message_to_session",
+                        lambda session_id, role, content, user_id: saved.append((role, content)) or True)
+    return saved
+
+
+def test_stream_answers_token_events_then_done(app_client, chat_session):
+    response = app_client.post("/chatbot/message/stream", json=BODY, headers=AUTH)
+
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    assert "event: token" in body
+    assert body.rstrip().split("\n\n")[-1].startswith("event: done")
+    assert [role for role, _ in chat_session] == ["user", "assistant"]
+
+
+def test_error_before_the_first_token_is_a_json_500(app_client, chatbot_routes, chat_session, monkeypatch):
+    def no_tokens(*args):
+        raise ValueError("Empty or invalid response from Gemini API")
+        yield
+
+    monkeypatch.setattr(chatbot_routes, "stream_chat_response", no_tokens)
+    response = app_client.post("/chatbot/message/stream", json=BODY, headers=AUTH)
+
+    assert response.status_code == 500
+    assert response.is_json
+    assert "Empty or invalid response" in response.get_json()["error"]
+    assert [role for role, _ in chat_session] == ["user"]
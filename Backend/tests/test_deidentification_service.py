@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from benchmarks.anonymize import original_anonymize
+from services.deidentification_service import anonymize
+
+# Fragments that exercise every rule, their labels in odd casing and
+# spacing, near-misses, and non-ASCII text (which takes the plain regex path).
+_FRAGMENTS = [
+    "Name", "name", "NAME", "Patient Name", "patient  name", "Surname", "Age", "age", "DOB", "Dob", "Gender",
+    "Sex", "sex", "UHID", "Patient ID", "MRN", "mrn", "Dr", "dr.", "Dr.", "DR", "Doctor", "Hospital", "Clinic",
+    "clinical", ":", " :", "-", " - ", "  ", " ", "\n", "\n\n", "\t", ".", ",", "/",
+    "9876543210", "98765432101", "987654321", "12/05/2024", "1-2-24", "31/12/99", "2024-05-12",
+    "Ravi Kumar", "Hemoglobin 13.5 g/dL", "Sunita", "Pune", "x", "A", "é", "İ", "Straße", "नाम:", "ﬁ",
+]
+
+
+def _random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(1, 40)))
+
+
+@pytest.mark.parametrize("text", [
+    "Patient Name: Ravi Kumar\nAge: 45\nHemoglobin 13.5",
+    "Consultant: Dr. Asha Kulkarni, MD\nHospital: City Care",
+    "Call 9876543210 on 12/05/2024",
+    "9876543210Sex: M",
+    "NAME - Ravi\nname:Sunita\nSurname: Patil",
+    "Dr.Ravi\nDr Ravi Kumar\nDR. ravi",
+    "Straße Name: Müller\nİ Age: 40",
+    "",
+])
+def test_matches_original_output(text):
+    assert anonymize(text) == original_anonymize(text)
+
+
+def test_matches_original_output_on_random_text():
+    rng = random.Random(20241018)
+    for _ in range(20000):
+        text = _random_text(rng)
+        assert anonymize(text) == original_anonymize(text), text
+
+
+def test_batch_returns_one_result_per_text():
+    rng = random.Random(7)
+    texts = [_random_text(rng) for _ in range(50)]
+    assert anonymize(texts) == [original_anonymize(text) for text in texts]
+    assert anonymize(tuple(texts)) == [original_anonymize(text) for text in texts]
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services import gemini_service
+from services.llm_schemas import MedicalTermExplanations
+from utils.exception import LLMOutputInvalidError
+
+
+def _answer(monkeypatch, text):
+    monkeypatch.setattr(gemini_service, "generate_content", lambda **request: SimpleNamespace(text=text))
+
+
+@pytest.mark.parametrize("text", [None, "", "  \n"])
+def test_batch_explanation_without_text_answers_nothing(monkeypatch, text):
+    _answer(monkeypatch, text)
+    assert gemini_service.explain_medical_terms(["TSH", "ESR"]) == {}
+
+
+def test_batch_explanation_maps_answers_back_to_the_terms_as_asked(monkeypatch):
+    _answer(monkeypatch, '```json\n{"explanations": [{"term": "tsh", "explanation": " Thyroid hormone. "},'
+                         ' {"term": "ESR", "explanation": ""}]}\n```')
+    assert gemini_service.explain_medical_terms(["TSH ", "ESR"]) == {"TSH ": "Thyroid hormone."}
+
+
+def test_batch_explanation_is_repaired_against_the_schema(monkeypatch):
+    answers = iter(['{"explanations": [{"term": "TSH"}]}',
+                    '{"explanations": [{"term": "TSH", "explanation": "Thyroid hormone."}]}'])
+    requests = []
+
+    def generate_content(**request):
+        requests.append(request)
+        return SimpleNamespace(text=next(answers))
+
+    monkeypatch.setattr(gemini_service, "generate_content", generate_content)
+    assert gemini_service.explain_medical_terms(["TSH"]) == {"TSH": "Thyroid hormone."}
+    assert requests[0]["config"]["response_schema"] is MedicalTermExplanations
+    assert "explanations.0.explanation" in requests[1]["contents"]
+
+
+@pytest.mark.parametrize("text", ["not json", '{"explanations": "TSH is a hormone"}', "[]"])
+def test_unusable_batch_explanation_raises_output_invalid(monkeypatch, text):
+    _answer(monkeypatch, text)
+    with pytest.raises(LLMOutputInvalidError):
+        gemini_service.explain_medical_terms(["TSH"])
+
+
+def test_unusable_batch_falls_back_to_single_term_calls(monkeypatch):
+    from services import response_cache
+
+    def explain_medical_terms(terms, language):
+        raise LLMOutputInvalidError()
+
+    async def explain_medical_term_async(term, language):
+        return f"{term} explained alone"
+
+    monkeypatch.setattr(response_cache, "explain_medical_terms", explain_medical_terms)
+    monkeypatch.setattr(response_cache, "explain_medical_term_async", explain_medical_term_async)
+    assert response_cache.get_or_explain_medical_terms(["Batch fallback marker"]) == {
+        "Batch fallback marker": "Batch fallback marker explained alone"
+    }
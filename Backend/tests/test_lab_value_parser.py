@@ -0,0 +1,65 @@
+import pytest
+
+from services.lab_value_parser import _unit, extract_lab_values
+
+
+@pytest.mark.parametrize("text, unit", [
+    (" g/dL", "g/dL"),
+    (" H g/dL", "g/dL"),
+    (" L  mg/dL.", "mg/dL"),
+    (" High", ""),
+])
+def test_unit_skips_flags_and_whitespace(text, unit):
+    assert _unit(text) == unit
+
+
+@pytest.mark.parametrize("row, expected", [
+    ("Hemoglobin 10.2 L g/dL 13.0-17.0",
+     {"label": "Hemoglobin", "value": 10.2, "unit": "g/dL", "min_range": 13, "max_range": 17, "status": "Low"}),
+    ("Hemoglobin 13.5 g/dL 12.0-15.5",
+     {"label": "Hemoglobin", "value": 13.5, "unit": "g/dL", "min_range": 12, "max_range": 15.5, "status": "Normal"}),
+    ("Creatinine 1.4 H 0.6-1.2 mg/dL",
+     {"label": "Creatinine", "value": 1.4, "unit": "mg/dL", "min_range": 0.6, "max_range": 1.2, "status": "High"}),
+    ("Total Cholesterol 182 mg/dL < 200",
+     {"label": "Total Cholesterol", "value": 182, "unit": "mg/dL", "min_range": 0, "max_range": 200,
+      "status": "Normal"}),
+    ("Total WBC Count 7,400 /cumm 4000-11000",
+     {"label": "WBC Count", "value": 7400, "unit": "/cumm", "min_range": 4000, "max_range": 11000,
+      "status": "Normal"}),
+])
+def test_rows_are_parsed(row, expected):
+    assert extract_lab_values(row) == [expected]
+
+
+def test_cell_per_line_tables_are_joined():
+    text = "Hemoglobin\n11.0\nL g/dL\n12.0-15.5\nTSH\n2.1\nuIU/mL\n0.4-4.0"
+    assert [(item["label"], item["unit"], item["status"]) for item in extract_lab_values(text)] == [
+        ("Hemoglobin", "g/dL", "Low"),
+        ("TSH", "uIU/mL", "Normal"),
+    ]
+
+
+@pytest.mark.parametrize("row, expected", [
+    ("TSH 3rd Generation 2.5 uIU/mL 0.27 - 4.2",
+     {"label": "TSH", "value": 2.5, "unit": "uIU/mL", "min_range": 0.27, "max_range": 4.2, "status": "Normal"}),
+    ("2. TSH (4th Gen) 5.6 uIU/mL 0.4-4.0",
+     {"label": "TSH", "value": 5.6, "unit": "uIU/mL", "min_range": 0.4, "max_range": 4, "status": "High"}),
+    ("25-OH Vitamin D 18.4 ng/mL 30-100",
+     {"label": "Vitamin D", "value": 18.4, "unit": "ng/mL", "min_range": 30, "max_range": 100, "status": "Low"}),
+    ("Vitamin D, 25-Hydroxy 32 ng/mL 30-100",
+     {"label": "Vitamin D", "value": 32, "unit": "ng/mL", "min_range": 30, "max_range": 100, "status": "Normal"}),
+    ("Vitamin D3 12 ng/mL 30-100",
+     {"label": "Vitamin D", "value": 12, "unit": "ng/mL", "min_range": 30, "max_range": 100, "status": "Low"}),
+    ("T3 1.1 ng/mL 0.8-2.0",
+     {"label": "T3", "value": 1.1, "unit": "ng/mL", "min_range": 0.8, "max_range": 2, "status": "Normal"}),
+    ("Free T4 1.9 ng/dL 0.9-1.7",
+     {"label": "Free T4", "value": 1.9, "unit": "ng/dL", "min_range": 0.9, "max_range": 1.7, "status": "High"}),
+    ("Vitamin B12 150 pg/mL 211-911",
+     {"label": "Vitamin B12", "value": 150, "unit": "pg/mL", "min_range": 211, "max_range": 911, "status": "Low"}),
+])
+def test_digits_in_labels_are_not_values(row, expected):
+    assert extract_lab_values(row) == [expected]
+
+
+def test_ratio_rows_are_skipped():
+    assert extract_lab_values("LDL/HDL Ratio 3.2 0-3.5\nA/G Ratio 1.2 1.0-2.0") == []
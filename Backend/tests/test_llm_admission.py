@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services import llm_admission
+from services.llm_admission import AdmissionController
+from utils.constants import LLM_RETRY_AFTER_SECONDS
+from utils.exception import LLMRateLimitedError
+
+AUTH = {"Authorization": "Bearer test-token"}
+
+
+def _rejected(controller, priority="interactive", user=None) -> LLMRateLimitedError:
+    with pytest.raises(LLMRateLimitedError) as error:
+        controller.acquire(priority, user, 0)
+    return error.value
+
+
+def test_global_limit():
+    controller = AdmissionController(2, 10, 1.0, 0)
+    controller.acquire("interactive", "a", 0)
+    controller.acquire("interactive", "b", 0)
+
+    assert _rejected(controller, user="c").retry_after == LLM_RETRY_AFTER_SECONDS
+    assert controller.stats()["rejected"] == {"global": 1}
+
+    controller.release("interactive", "a")
+    controller.acquire("interactive", "c", 0)
+    assert controller.stats()["active"] == 2
+
+
+def test_per_user_limit():
+    controller = AdmissionController(10, 2, 1.0, 0)
+    controller.acquire("interactive", "a", 0)
+    controller.acquire("background", "a", 0)
+
+    _rejected(controller, user="a")
+    assert controller.stats()["rejected"] == {"user": 1}
+    controller.acquire("interactive", "b", 0)
+    controller.acquire("interactive", None, 0)
+
+    controller.release("background", "a")
+    controller.acquire("interactive", "a", 0)
+
+
+def test_background_share_leaves_room_for_interactive_calls():
+    controller = AdmissionController(4, 10, 0.5, 0)
+    controller.acquire("background", None, 0)
+    controller.acquire("background", None, 0)
+
+    _rejected(controller, priority="background")
+    assert controller.stats()["rejected"] == {"background": 1}
+    controller.acquire("interactive", None, 0)
+    controller.acquire("interactive", None, 0)
+    _rejected(controller)
+
+    stats = controller.stats()
+    assert (stats["active"], stats["active_background"], stats["limits"]["background"]) == (4, 2, 2)
+
+
+def test_token_bucket_refills_and_sets_retry_after(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(llm_admission, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    # 6 per minute: one call start every 10 seconds, a burst of one.
+    controller = AdmissionController(10, 10, 1.0, 6)
+
+    controller.acquire("interactive", None, 0)
+    controller.release("interactive", None)
+    error = _rejected(controller)
+    assert error.retry_after == 10
+    assert controller.stats()["rejected"] == {"rate": 1}
+
+    clock.now += 4
+    assert _rejected(controller).retry_after == 6
+
+    clock.now += 6
+    controller.acquire("interactive", None, 0)
+    controller.release("interactive", None)
+    _rejected(controller)
+
+
+def test_burst_is_capped(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(llm_admission, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    # 60 per minute: a burst of ten, even after a long idle time.
+    controller = AdmissionController(100, 100, 1.0, 60)
+    clock.now += 3600
+
+    for _ in range(10):
+        controller.acquire("interactive", None, 0)
+    assert _rejected(controller).retry_after == 1
+
+
+def test_waiting_call_is_admitted_when_a_slot_frees_up():
+    controller = AdmissionController(1, 1, 1.0, 0)
+    controller.acquire("interactive", None, 0)
+
+    threading.Timer(0.05, controller.release, args=("interactive", None)).start()
+    started = time.monotonic()
+    controller.acquire("interactive", None, 2)
+    assert time.monotonic() - started < 1
+    assert controller.stats()["waited"] == 1
+
+
+def test_async_acquire_rejects_after_its_timeout():
+    controller = AdmissionController(1, 1, 1.0, 0)
+    controller.acquire("interactive", None, 0)
+    with pytest.raises(LLMRateLimitedError) as error:
+        asyncio.run(controller.acquire_async("interactive", None, 0.1))
+    assert error.value.retry_after == LLM_RETRY_AFTER_SECONDS
+
+
+@pytest.fixture
+def full_controller(monkeypatch):
+    # Every slot is taken, and a request's first call does not wait.
+    controller = AdmissionController(1, 1, 1.0, 0)
+    controller.acquire("interactive", None, 0)
+    monkeypatch.setattr(llm_admission, "controller", controller)
+    monkeypatch.setattr(llm_admission, "LLM_ADMISSION_WAIT_SECONDS", 0)
+    return controller
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/medical-term/explain", {"term": "Admission marker term"}),
+    ("/symptom-checker/analyze", {"symptoms": "mild headache since morning"}),
+    ("/medicine/identify", {"medicine_name": "Admission marker pill"}),
+])
+def test_non_streaming_routes_answer_429_with_retry_after(app_client, full_controller, path, body):
+    response = app_client.post(path, json=body, headers=AUTH)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(LLM_RETRY_AFTER_SECONDS)
+    assert response.is_json
+    assert full_controller.stats()["rejected"] == {"global": 1}
@@ -0,0 +1,295 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services import llm_gateway
+from services.fake_llm_backend import FakeClient
+
+PROMPT = "Explain this report in simple words."
+
+
+class _GatedClient:
+    """
+    The fake backend behind a gate: every call is counted and then held
+    until release() (or fails with `error`), so concurrent duplicates are
+    known to overlap.
+    """
+
+    def __init__(self, error: BaseException = None):
+        self._fake = FakeClient()
+        self._gate = threading.Event()
+        self.error = error
+        self.calls = 0
+        self.models = SimpleNamespace(generate_content=self._generate)
+        self.aio = SimpleNamespace(models=SimpleNamespace(generate_content=self._generate_async))
+
+    def release(self):
+        self._gate.set()
+
+    def _answer(self, model, contents, config):
+        if self.error is not None:
+            raise self.error
+        return self._fake.models.generate_content(model=model, contents=contents, config=config)
+
+    def _generate(self, model, contents, config=None):
+        self.calls += 1
+        self._gate.wait(5)
+        return self._answer(model, contents, config)
+
+    async def _generate_async(self, model, contents, config=None):
+        self.calls += 1
+        while not self._gate.is_set():
+            await asyncio.sleep(0.005)
+        return self._answer(model, contents, config)
+
+
+@pytest.fixture
+def gated(monkeypatch):
+    def install(error: BaseException = None) -> _GatedClient:
+        client = _GatedClient(error)
+        monkeypatch.setattr(llm_gateway, "client", client)
+        monkeypatch.setattr(llm_gateway, "_async_models", lambda: client.aio.models)
+        return client
+    return install
+
+
+def _call_sync(results: list):
+    try:
+        results.append(llm_gateway.generate_content(model="fake-model", contents=PROMPT))
+    except BaseException as e:
+        results.append(e)
+
+
+async def _call_async():
+    return await llm_gateway.generate_content_async(model="fake-model", contents=PROMPT)
+
+
+def _wait_for(condition, timeout: float = 5):
+    stop = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < stop, "timed out"
+        time.sleep(0.005)
+
+
+def _run(sync_callers: int, async_callers: int, client: _GatedClient) -> list:
+    # Starts every caller, waits until all but the leader have joined the
+    # leader's flight, then lets the single backend call finish.
+    coalesced = llm_gateway._flight_stats["coalesced"]
+    results = []
+    threads = [threading.Thread(target=_call_sync, args=(results,)) for _ in range(sync_callers)]
+    for thread in threads:
+        thread.start()
+    futures = [llm_gateway.submit_async(_call_async()) for _ in range(async_callers)]
+
+    total = sync_callers + async_callers
+    _wait_for(lambda: llm_gateway._flight_stats["coalesced"] - coalesced == total - 1 and client.calls == 1)
+    client.release()
+
+    for thread in threads:
+        thread.join(5)
+    for future in futures:
+        try:
+            results.append(future.result(5))
+        except BaseException as e:
+            results.append(e)
+    return results
+
+
+@pytest.mark.parametrize("sync_callers, async_callers", [(4, 0), (0, 4), (2, 3)])
+def test_identical_prompts_share_one_backend_call(gated, sync_callers, async_callers):
+    client = gated()
+    results = _run(sync_callers, async_callers, client)
+
+    assert client.calls == 1
+    assert len(results) == sync_callers + async_callers
+    assert all(result is results[0] for result in results)
+    assert results[0].text
+    assert not llm_gateway._in_flight
+
+
+@pytest.mark.parametrize("sync_callers, async_callers", [(3, 0), (0, 3), (1, 2)])
+def test_leader_error_reaches_every_waiter(gated, sync_callers, async_callers):
+    error = ValueError("bad request")
+    client = gated(error)
+    results = _run(sync_callers, async_callers, client)
+
+    assert client.calls == 1
+    assert len(results) == sync_callers + async_callers
+    assert all(result is error for result in results)
+
+
+def test_failed_flight_is_removed_so_the_next_call_retries(gated):
+    client = gated(ValueError("bad request"))
+    client.release()
+    with pytest.raises(ValueError):
+        llm_gateway.generate_content(model="fake-model", contents=PROMPT)
+    assert not llm_gateway._in_flight
+
+    client.error = None
+    assert llm_gateway.generate_content(model="fake-model", contents=PROMPT).text
+    assert llm_gateway.run_async(_call_async()).text
+    assert client.calls == 3
+
+
+def test_different_prompts_are_not_coalesced(gated):
+    client = gated()
+    client.release()
+    llm_gateway.generate_content(model="fake-model", contents=PROMPT)
+    llm_gateway.generate_content(model="fake-model", contents=PROMPT + " Again.")
+    llm_gateway.generate_content(model="other-model", contents=PROMPT)
+    assert client.calls == 3
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_breaker_opens_after_the_threshold_and_half_opens_after_the_cooldown(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(llm_gateway, "time", clock)
+    breaker = llm_gateway.CircuitBreaker(failure_threshold=3, reset_seconds=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 29.9
+    assert not breaker.allow()
+    assert breaker.stats() == {"state": "open", "consecutive_failures": 3, "rejected": 1}
+
+    clock.now += 0.1
+    assert breaker.state == "half_open"
+    assert breaker.allow()          # the one trial call
+    assert not breaker.allow()      # everyone else waits for its outcome
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_failed_trial_reopens_the_breaker(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(llm_gateway, "time", clock)
+    breaker = llm_gateway.CircuitBreaker(failure_threshold=1, reset_seconds=10)
+
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 9
+    assert not breaker.allow()
+
+    # A trial that fails for a non-transient reason frees the trial slot.
+    clock.now += 1
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def _server_error(code: int = 503):
+    return llm_gateway.errors.ServerError(code, {"error": {"code": code, "message": "down", "status": "UNAVAILABLE"}})
+
+
+def _client_error(code: int):
+    return llm_gateway.errors.ClientError(code, {"error": {"code": code, "message": "no", "status": "CLIENT"}})
+
+
+class _FlakyClient:
+    """The fake backend, failing its first calls with the given errors."""
+
+    def __init__(self, failures: list, delay: float = 0):
+        self._fake = FakeClient()
+        self.failures = list(failures)
+        self.delay = delay
+        self.calls = 0
+        self.models = SimpleNamespace(generate_content=self._generate)
+        self.aio = SimpleNamespace(models=SimpleNamespace(generate_content=self._generate_async))
+
+    def _generate(self, model, contents, config=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.failures:
+            raise self.failures.pop(0)
+        return self._fake.models.generate_content(model=model, contents=contents, config=config)
+
+    async def _generate_async(self, model, contents, config=None):
+        return self._generate(model, contents, config)
+
+
+@pytest.fixture
+def flaky(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "breaker", llm_gateway.CircuitBreaker(100, 30))
+    monkeypatch.setattr(llm_gateway, "LLM_RETRY_BASE_SECONDS", 0.001)
+    monkeypatch.setattr(llm_gateway, "LLM_RETRY_MAX_SECONDS", 0.001)
+    monkeypatch.setattr(llm_gateway, "LLM_MAX_ATTEMPTS", 3)
+
+    def install(failures: list, delay: float = 0) -> _FlakyClient:
+        client = _FlakyClient(failures, delay)
+        monkeypatch.setattr(llm_gateway, "client", client)
+        monkeypatch.setattr(llm_gateway, "_async_models", lambda: client.aio.models)
+        return client
+    return install
+
+
+@pytest.mark.parametrize("error", [_server_error(503), _server_error(500), _client_error(429), _client_error(408)])
+def test_transient_errors_are_retried(flaky, error):
+    client = flaky([error, error])
+    assert llm_gateway.generate_content(model="fake-model", contents=PROMPT).text
+    assert client.calls == 3
+
+
+def test_async_calls_are_retried_too(flaky):
+    client = flaky([_server_error()])
+    assert llm_gateway.run_async(_call_async()).text
+    assert client.calls == 2
+
+
+@pytest.mark.parametrize("error", [_client_error(400), _client_error(403), _client_error(404)])
+def test_client_errors_are_not_retried(flaky, error):
+    client = flaky([error])
+    with pytest.raises(llm_gateway.errors.ClientError):
+        llm_gateway.generate_content(model="fake-model", contents=PROMPT)
+    assert client.calls == 1
+    assert llm_gateway.breaker.stats()["consecutive_failures"] == 0
+
+
+def test_exhausted_retries_become_unavailable(flaky):
+    client = flaky([_server_error()] * 3)
+    with pytest.raises(llm_gateway.LLMUnavailableError):
+        llm_gateway.generate_content(model="fake-model", contents=PROMPT)
+    assert client.calls == 3
+
+
+def test_deadline_cuts_retries_short(flaky, monkeypatch):
+    monkeypatch.setattr(llm_gateway, "LLM_MAX_ATTEMPTS", 100)
+    monkeypatch.setattr(llm_gateway, "LLM_RETRY_BASE_SECONDS", 0.05)
+    monkeypatch.setattr(llm_gateway, "LLM_RETRY_MAX_SECONDS", 0.05)
+    client = flaky([_server_error()] * 100, delay=0.05)
+
+    started = time.monotonic()
+    with pytest.raises(llm_gateway.LLMUnavailableError):
+        llm_gateway.generate_content(model="fake-model", contents=PROMPT, deadline=0.3)
+    assert time.monotonic() - started < 1
+    assert 1 < client.calls < 10
+
+
+def test_open_breaker_fails_fast_without_calling_the_backend(flaky, monkeypatch):
+    monkeypatch.setattr(llm_gateway, "breaker", llm_gateway.CircuitBreaker(2, 30))
+    client = flaky([_server_error()] * 10)
+
+    with pytest.raises(llm_gateway.LLMUnavailableError):
+        llm_gateway.generate_content(model="fake-model", contents=PROMPT)
+    assert client.calls == 2
+    assert llm_gateway.breaker.state == "open"
+
+    with pytest.raises(llm_gateway.LLMUnavailableError):
+        llm_gateway.generate_content(model="fake-model", contents=PROMPT + " Again.")
+    assert client.calls == 2
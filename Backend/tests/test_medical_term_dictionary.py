@@ -0,0 +1,92 @@
+import json
+import os
+
+import pytest
+
+from services.medical_term_dictionary import TermIndex, explain_from_dictionary, get_index, normalize_term
+from utils.constants import MEDICAL_TERM_DICTIONARY_PATH
+
+
+def _term(query):
+    entry = get_index().lookup(query)
+    return entry and entry["term"]
+
+
+@pytest.mark.parametrize("query, term", [
+    ("Hemoglobin", "Hemoglobin"),
+    ("HAEMOGLOBIN", "Hemoglobin"),
+    ("S. Creatinine", "Creatinine"),
+    ("s-creatinine", "Creatinine"),
+    ("alt", "SGPT (ALT)"),
+    ("bp", "Blood Pressure"),
+    ("T3", "T3"),
+    ("total t3", "T3"),
+    ("free t3", "Free T3"),
+    ("FT3", "Free T3"),
+    ("ft4", "Free T4"),
+    ("thyroxine", "T4"),
+    ("hypertension", "Hypertension"),
+    ("high blood pressure", "Hypertension"),
+])
+def test_names_and_aliases(query, term):
+    assert _term(query) == term
+
+
+@pytest.mark.parametrize("query, term", [
+    ("hemoglobn", "Hemoglobin"),
+    ("creatinin", "Creatinine"),
+    ("blood presure", "Blood Pressure"),
+])
+def test_small_typos_are_tolerated(query, term):
+    assert _term(query) == term
+
+
+@pytest.mark.parametrize("query", [
+    "asl",          # abbreviations are never fuzzy-matched (ALT/AST)
+    "free t5",      # as close to Free T3 as to Free T4
+    "zhemoglobin",  # a different first letter
+    "systolic",     # one number of a reading, not the same as blood pressure
+    "diastolic",
+    "",
+])
+def test_unknown_or_ambiguous_terms_go_to_the_llm(query):
+    assert _term(query) is None
+
+
+def test_equally_close_entries_are_not_guessed():
+    index = TermIndex([
+        {"term": "Alpha marker", "explanations": {}},
+        {"term": "Alpha markor", "explanations": {}},
+    ])
+    assert index.lookup("alpha markxr") is None
+    assert index.lookup("alpha marker")["term"] == "Alpha marker"
+
+
+def test_autocomplete_ranks_prefixes_before_later_words():
+    index = get_index()
+    assert [entry["term"] for entry in index.complete("free")] == ["Free T3", "Free T4"]
+    assert [entry["term"] for entry in index.complete("glu", 3)] == [
+        "Fasting Glucose", "Post-prandial Glucose", "Random Glucose"
+    ]
+
+
+def test_explanations_by_language():
+    assert explain_from_dictionary("hypertension", "hi")
+    assert explain_from_dictionary("hypertension", "fr") is None
+
+
+def test_every_name_belongs_to_one_entry_with_all_languages():
+    with open(MEDICAL_TERM_DICTIONARY_PATH, encoding="utf-8") as f:
+        entries = json.load(f)["terms"]
+
+    owners = {}
+    for entry in entries:
+        assert set(entry["explanations"]) == {"en", "hi", "mr"}, entry["term"]
+        for name in [entry["term"]] + entry.get("aliases", []):
+            owner = owners.setdefault(normalize_term(name), entry["term"])
+            assert owner == entry["term"], f"{name!r} is used by {owner} and {entry['term']}"
+
+
+def test_dictionary_path_does_not_depend_on_the_working_directory():
+    assert os.path.isabs(MEDICAL_TERM_DICTIONARY_PATH)
+    assert os.path.exists(MEDICAL_TERM_DICTIONARY_PATH)
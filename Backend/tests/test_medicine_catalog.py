@@ -0,0 +1,85 @@
+import json
+import os
+
+import pytest
+
+from services.medical_term_dictionary import normalize_term
+from services.medicine_catalog import get_catalog, phonetic_key
+from utils.constants import MEDICINE_CATALOG_PATH
+
+
+def _medicine(query):
+    record = get_catalog().lookup(query)
+    return record and (record["term"], record["medicine"]["generic"])
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Dolo 650", ("Dolo 650", "Paracetamol")),
+    ("dolo", ("Dolo 650", "Paracetamol")),
+    ("DOLO-650 tablet", ("Dolo 650", "Paracetamol")),
+    ("acetaminophen", ("Paracetamol", "Paracetamol")),
+    ("paracitamol", ("Paracetamol", "Paracetamol")),
+    ("dollo 650", ("Dolo 650", "Paracetamol")),
+    ("thyronrom", ("Thyronorm", "Levothyroxine")),
+    ("sitrizin", ("Cetirizine", "Cetirizine")),
+    ("siprofloksasin", ("Ciprofloxacin", "Ciprofloxacin")),
+    ("crocin 500mg tablet", ("Crocin", "Paracetamol")),
+    ("augmentin 625", ("Augmentin", "Amoxicillin + Clavulanic Acid")),
+    ("Pan 40", ("Pan 40", "Pantoprazole")),
+])
+def test_names_typos_and_strengths_resolve(query, expected):
+    assert _medicine(query) == expected
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Combiflam", ("Combiflam", "Ibuprofen + Paracetamol")),
+    ("Pan D", ("Pan D", "Pantoprazole + Domperidone")),
+    ("Meftal Spas", ("Meftal Spas", "Mefenamic Acid + Dicyclomine")),
+    ("Montek LC", ("Montek LC", "Montelukast + Levocetirizine")),
+    ("Levocet M", ("Levocet M", "Montelukast + Levocetirizine")),
+])
+def test_combination_products_are_not_filed_under_one_ingredient(query, expected):
+    assert _medicine(query) == expected
+
+
+@pytest.mark.parametrize("query", [
+    # Combination brands the catalog does not carry.
+    "telma h", "losar h", "deplatt a", "clopilet a", "rozavel f", "telma h 40", "glycomet gp 1",
+    # Other medicines a couple of letters away.
+    "ampicillin",
+    # A different strength of a known brand.
+    "dolo 500", "dolo 65",
+    # A bare name two medicines' brands start with (Pan 40, Pan D).
+    "pan",
+    "h", "xyz", "",
+])
+def test_other_medicines_are_left_to_the_llm(query):
+    assert _medicine(query) is None
+
+
+def test_phonetic_key_keeps_single_letter_words():
+    assert phonetic_key("telma h") != phonetic_key("telma")
+    assert phonetic_key("Hifenac") == "hfnk"
+
+
+def test_name_confirmed_names_the_brand_and_generic():
+    result = get_catalog().identify("combiflam", "hi")
+    assert result["name_confirmed"] == "Combiflam (Ibuprofen + Paracetamol)"
+    assert result["purpose"]
+
+
+def test_every_name_belongs_to_one_medicine_with_all_languages():
+    with open(MEDICINE_CATALOG_PATH, encoding="utf-8") as f:
+        medicines = json.load(f)["medicines"]
+
+    owners = {}
+    for medicine in medicines:
+        for name in [medicine["generic"]] + medicine["brands"] + medicine["aliases"]:
+            assert owners.setdefault(normalize_term(name), medicine["generic"]) == medicine["generic"], name
+        for field in ("purpose", "best_time", "side_effects"):
+            assert set(medicine[field]) == {"en", "hi", "mr"}, (medicine["generic"], field)
+
+
+def test_catalog_path_does_not_depend_on_the_working_directory():
+    assert os.path.isabs(MEDICINE_CATALOG_PATH)
+    assert os.path.exists(MEDICINE_CATALOG_PATH)
@@ -0,0 +1,77 @@
+import fitz
+import pytest
+
+from benchmarks.synthetic_pdf import make_report_pdf
+from services import pdf_service, pdf_workers
+
+
+def _serial_pages(data: bytes) -> list:
+    doc = fitz.open(stream=data, filetype="pdf")
+    try:
+        return [page.get_text() for page in doc]
+    finally:
+        doc.close()
+
+
+@pytest.fixture(scope="module")
+def extract_pool():
+    pool = pdf_workers.WorkerPool(2)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def parallel(monkeypatch, tmp_path, extract_pool):
+    # Parallel from 20 pages on, two pool processes, shared memory in tmp_path.
+    monkeypatch.setattr(pdf_service, "PDF_PARALLEL_MIN_PAGES", 20)
+    monkeypatch.setattr(pdf_service, "PDF_EXTRACT_WORKERS", 2)
+    monkeypatch.setattr(pdf_service, "_extract_pool", extract_pool)
+    monkeypatch.setattr(pdf_workers, "_SHARED_MEMORY_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.parametrize("batch_pages", [7, 16, 1000])
+def test_parallel_matches_serial_for_uploads(parallel, batch_pages):
+    data = make_report_pdf(75)
+    doc = fitz.open(stream=memoryview(data), filetype="pdf")
+    try:
+        pages = list(pdf_service.iter_pages(doc, batch_pages=batch_pages))
+    finally:
+        doc.close()
+    assert pages == _serial_pages(data)
+
+
+def test_parallel_matches_serial_for_files(parallel, tmp_path):
+    data = make_report_pdf(60)
+    path = tmp_path / "report.pdf"
+    path.write_bytes(data)
+    assert pdf_service.extract_text_from_pdf(str(path), "pymupdf") == "".join(_serial_pages(data)).strip()
+
+
+def test_small_documents_stay_in_the_calling_process(parallel, monkeypatch):
+    def fail(*args):
+        raise AssertionError("pool used for a small document")
+
+    monkeypatch.setattr(pdf_service._extract_pool, "submit", fail)
+    data = make_report_pdf(10)
+    doc = fitz.open(stream=data, filetype="pdf")
+    try:
+        assert list(pdf_service.iter_pages(doc)) == _serial_pages(data)
+    finally:
+        doc.close()
+
+
+def test_pool_is_reused_and_documents_do_not_leak_between_calls(parallel, extract_pool):
+    first, second = make_report_pdf(40), make_report_pdf(41)
+    executor = extract_pool.executor()
+
+    for data in (first, second, first):
+        doc = fitz.open(stream=data, filetype="pdf")
+        try:
+            assert list(pdf_service.iter_pages(doc)) == _serial_pages(data)
+        finally:
+            doc.close()
+
+    assert extract_pool.executor() is executor
+    # The shared-memory copy of each upload is removed once it is read.
+    assert list(parallel.iterdir()) == []
@@ -0,0 +1,94 @@
+import io
+from tempfile import SpooledTemporaryFile
+
+import fitz
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from benchmarks.synthetic_pdf import make_report_pdf
+from services.pdf_service import _underlying_file, open_uploaded_pdf
+
+
+def _text(doc) -> str:
+    return "".join(page.get_text() for page in doc)
+
+
+def _spooled_upload(data: bytes, max_size: int) -> FileStorage:
+    # Rolled over to disk once `data` is larger than max_size (0 never rolls over).
+    stream = SpooledTemporaryFile(max_size=max_size, mode="rb+")
+    stream.write(data)
+    stream.seek(0)
+    return FileStorage(stream=stream, filename="report.pdf")
+
+
+class _PlainStream(io.RawIOBase):
+    # A stream that is neither a BytesIO nor backed by a file descriptor.
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._data.read(size)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._data.seek(offset, whence)
+
+
+@pytest.fixture(scope="module")
+def report_pdf() -> bytes:
+    return make_report_pdf(12)
+
+
+@pytest.fixture(scope="module")
+def expected_text(report_pdf) -> str:
+    doc = fitz.open(stream=report_pdf, filetype="pdf")
+    try:
+        return _text(doc)
+    finally:
+        doc.close()
+
+
+@pytest.mark.parametrize("max_size", [10 ** 9, 1], ids=["in_memory", "spooled"])
+def test_spooled_uploads_match_reading_the_file(report_pdf, expected_text, max_size):
+    upload = _spooled_upload(report_pdf, max_size)
+    with open_uploaded_pdf(upload) as doc:
+        assert _text(doc) == expected_text
+
+
+def test_in_memory_upload_is_not_rolled_over(report_pdf):
+    upload = _spooled_upload(report_pdf, 10 ** 9)
+    raw = _underlying_file(upload.stream)
+    assert isinstance(raw, io.BytesIO)
+    assert raw.getbuffer().nbytes == len(report_pdf)
+
+    with open_uploaded_pdf(upload) as doc:
+        assert doc.page_count == 12
+    assert _underlying_file(upload.stream) is raw
+
+
+def test_rolled_over_upload_is_the_temp_file(report_pdf):
+    upload = _spooled_upload(report_pdf, 1)
+    raw = _underlying_file(upload.stream)
+    assert not isinstance(raw, io.BytesIO)
+    assert raw.fileno() == upload.stream.fileno()
+
+
+def test_plain_stream_upload_is_read(report_pdf, expected_text):
+    upload = FileStorage(stream=_PlainStream(report_pdf), filename="report.pdf")
+    with open_uploaded_pdf(upload) as doc:
+        assert _text(doc) == expected_text
+
+
+def test_upload_is_not_saved_to_storage(report_pdf, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open_uploaded_pdf(_spooled_upload(report_pdf, 1)) as doc:
+        assert doc.page_count == 12
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_empty_upload_is_rejected():
+    with pytest.raises(ValueError, match="Empty PDF"):
+        with open_uploaded_pdf(_spooled_upload(b"", 10 ** 9)):
+            pass
@@ -0,0 +1,85 @@
+import io
+import json
+import sys
+import types
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from benchmarks.synthetic_pdf import make_report_pdf
+from services import gemini_service
+from utils.constants import MEDICAL_TERM_BATCH_MAX
+
+
+@pytest.fixture
+def report_service(monkeypatch):
+    # The repositories talk to Firestore through firebase_admin_init, which
+    # needs the service account key; reports and cached summaries are kept
+    # in memory here instead.
+    if "firebase_admin_init" not in sys.modules:
+        monkeypatch.setitem(sys.modules, "firebase_admin_init", types.SimpleNamespace(db=None))
+    from services import report_service, summary_cache
+
+    saved = []
+    monkeypatch.setattr(report_service, "save_report", lambda data: saved.append(data) or f"report-{len(saved)}")
+    monkeypatch.setattr(summary_cache, "get_cached_summary", lambda key: None)
+    monkeypatch.setattr(summary_cache, "save_cached_summary", lambda *args: None)
+    report_service.saved = saved
+    return report_service
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    # Every LLM call gemini_service makes, by route.
+    calls = []
+    for name in ("generate_content", "generate_content_async", "generate_content_stream"):
+        original = getattr(gemini_service, name)
+
+        def counted(*args, _original=original, **request):
+            calls.append(request.get("task"))
+            return _original(*args, **request)
+
+        monkeypatch.setattr(gemini_service, name, counted)
+    return calls
+
+
+def _flagged(count: int, marker: str) -> list:
+    # Terms the bundled dictionary does not know, so each reaches the LLM.
+    return [{"label": f"{marker} marker {i}", "value": 9.0, "unit": "mg/dL", "min_range": 1, "max_range": 2,
+             "status": "High"} for i in range(count)]
+
+
+def test_summary_and_flagged_terms_take_two_llm_calls(report_service, llm_calls):
+    visualizations = _flagged(MEDICAL_TERM_BATCH_MAX + 5, "Blocking")
+    summary = report_service.run_async(
+        report_service.summarize_report_async("Blocking marker report text", visualizations, "en"))
+
+    assert sorted(llm_calls) == ["medical_terms", "summary"]
+    assert len(json.loads(summary)["term_explanations"]) == MEDICAL_TERM_BATCH_MAX
+
+
+def test_streamed_upload_takes_two_llm_calls(report_service, llm_calls):
+    visualizations = _flagged(MEDICAL_TERM_BATCH_MAX, "Streamed")
+    events = list(report_service.stream_report_summary(
+        "Streamed marker report text", visualizations, "user-1", "report.pdf", "blood", "en"))
+
+    assert sorted(llm_calls) == ["medical_terms", "summary"]
+    assert [event for event, _ in events][-1] == "done"
+
+
+def test_uploaded_pdf_makes_a_bounded_number_of_llm_calls(report_service, llm_calls):
+    upload = FileStorage(stream=io.BytesIO(make_report_pdf(3)), filename="report.pdf")
+    report_id, summary = report_service.process_report(upload, "user-1", "blood", "en")
+
+    assert report_id == "report-1"
+    assert len(llm_calls) <= 2
+    assert llm_calls.count("medical_terms") <= 1
+
+
+def test_unexplained_terms_are_left_out(report_service, monkeypatch):
+    async def fail(terms, language):
+        raise ValueError("no answer")
+
+    monkeypatch.setattr(report_service, "get_or_explain_medical_terms_async", fail)
+    assert report_service.run_async(report_service.explain_terms_async(["Anything"], "en")) == {}
+    assert report_service.run_async(report_service.explain_terms_async([], "en")) == {}
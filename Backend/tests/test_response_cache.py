@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+
+import pytest
+
+from services import response_cache
+from services.response_cache import SqliteCacheBackend
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def tick(self, seconds: float = 1):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(response_cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache" / "responses.sqlite3")
+
+
+def test_entries_expire_after_their_ttl(clock, db_path):
+    cache = SqliteCacheBackend(db_path, maxsize=10, ttl=60)
+    cache.set("a", "alpha")
+
+    clock.tick(59)
+    assert cache.get("a") == "alpha"
+    assert cache.size() == 1
+
+    clock.tick(1)
+    assert cache.get("a") is None
+    assert cache.size() == 0
+
+    cache.set("a", "again")
+    assert cache.get("a") == "again"
+
+
+def test_least_recently_read_entries_are_evicted_at_capacity(clock, db_path):
+    cache = SqliteCacheBackend(db_path, maxsize=3, ttl=3600)
+    for key in ("a", "b", "c"):
+        cache.set(key, key.upper())
+        clock.tick()
+
+    assert cache.get("a") == "A"
+    clock.tick()
+    cache.set("d", "D")
+
+    assert cache.size() == 3
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["A", "C", "D"]
+
+
+def test_expired_entries_are_dropped_before_live_ones(clock, db_path):
+    cache = SqliteCacheBackend(db_path, maxsize=2, ttl=10)
+    cache.set("old", "1")
+    clock.tick(10)
+    cache.set("a", "2")
+    clock.tick()
+    cache.set("b", "3")
+
+    assert (cache.get("a"), cache.get("b")) == ("2", "3")
+
+
+def test_writes_are_read_from_other_connections(db_path):
+    writer = SqliteCacheBackend(db_path, maxsize=10, ttl=3600)
+    reader = SqliteCacheBackend(db_path, maxsize=10, ttl=3600)  # another worker
+    writer.set("term", "explanation")
+
+    assert reader.get("term") == "explanation"
+
+    # Each thread opens its own connection on the same file.
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(writer.get("term")))
+    thread.start()
+    thread.join(5)
+    assert seen == ["explanation"]
+
+
+def test_wal_lets_writes_commit_while_another_connection_reads(db_path):
+    cache = SqliteCacheBackend(db_path, maxsize=10, ttl=3600)
+    cache.set("a", "1")
+    assert sqlite3.connect(db_path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    reader = sqlite3.connect(db_path, timeout=0, isolation_level=None)
+    reader.execute("BEGIN")
+    assert reader.execute("SELECT value FROM response_cache WHERE key = 'a'").fetchone() == ("1",)
+
+    # With a rollback journal this would wait for the read to finish.
+    cache.set("b", "2")
+    assert reader.execute("SELECT COUNT(*) FROM response_cache").fetchone() == (1,)  # its snapshot
+    reader.execute("COMMIT")
+    assert reader.execute("SELECT COUNT(*) FROM response_cache").fetchone() == (2,)
+    reader.close()
@@ -0,0 +1,37 @@
+import pytest
+
+from services import gemini_service, llm_admission
+from utils.exception import LLMRateLimitedError
+from utils.response import start_stream
+
+
+def test_start_stream_keeps_every_item():
+    assert list(start_stream(iter("abc"))) == ["a", "b", "c"]
+    assert list(start_stream([])) == []
+
+
+def test_start_stream_raises_errors_before_the_first_item():
+    def failing():
+        raise ValueError("before the first item")
+        yield
+
+    with pytest.raises(ValueError):
+        start_stream(failing())
+
+
+def test_rejected_admission_is_raised_before_streaming(monkeypatch):
+    # Every slot is taken: the stream's first call is rejected at once.
+    monkeypatch.setattr(llm_admission, "controller", llm_admission.AdmissionController(1, 1, 1.0, 60))
+    monkeypatch.setattr(llm_admission, "LLM_ADMISSION_WAIT_SECONDS", 0)
+    llm_admission.controller.acquire("interactive", None, 0)
+    llm_admission.start_request()
+
+    tokens = gemini_service.stream_symptom_analysis("headache since morning")
+    with pytest.raises(LLMRateLimitedError) as error:
+        start_stream(tokens)
+    assert error.value.retry_after >= 1
+
+
+def test_admitted_stream_yields_the_whole_answer():
+    llm_admission.start_request()
+    assert "".join(start_stream(gemini_service.stream_symptom_analysis("headache since morning")))
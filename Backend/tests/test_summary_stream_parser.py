@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from services.summary_stream_parser import SummaryStreamParser
+
+SUMMARY = {
+    "summary_text": "Mostly normal {not a brace} report.",
+    "insights": [
+        {"title": "Hemoglobin {low}", "detail": "Say \"iron\" \\ eat greens ]["},
+        {"title": "Sugar", "detail": "Fasting value is fine.", "tags": [{"name": "ok"}]},
+    ],
+    "visualizations": [
+        {"label": "Hemoglobin", "value": 10.2, "range": [13, 17]},
+    ],
+}
+INSIGHTS = [("insights", item) for item in SUMMARY["insights"]]
+VISUALIZATIONS = [("visualizations", item) for item in SUMMARY["visualizations"]]
+
+
+def _feed(chunks) -> list:
+    parser = SummaryStreamParser()
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    return items
+
+
+def _split(text: str, *cuts) -> list:
+    bounds = [0, *cuts, len(text)]
+    return [text[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+
+def test_whole_document_in_one_chunk():
+    assert _feed([json.dumps(SUMMARY)]) == INSIGHTS + VISUALIZATIONS
+
+
+def test_one_character_per_chunk():
+    assert _feed(list(json.dumps(SUMMARY))) == INSIGHTS + VISUALIZATIONS
+
+
+@pytest.mark.parametrize("marker", [
+    "Mostly normal",  # inside a top-level string
+    "{low}",          # inside a string, before a brace in it
+    "\\\"iron",       # between a backslash and the quote it escapes
+    "\\\\ eat",       # between an escaped backslash's two characters
+    "][",             # before brackets inside a string
+])
+def test_chunks_split_inside_strings_and_escapes(marker):
+    text = json.dumps(SUMMARY)
+    cut = text.index(marker) + 1
+    assert _feed(_split(text, cut)) == INSIGHTS + VISUALIZATIONS
+
+
+def test_items_are_emitted_as_soon_as_they_close():
+    text = json.dumps(SUMMARY)
+    first_end = text.index('}, {"title": "Sugar"') + 1
+    parser = SummaryStreamParser()
+    assert parser.feed(text[:first_end - 1]) == []
+    assert parser.feed(text[first_end - 1:first_end]) == INSIGHTS[:1]
+    assert parser.feed(text[first_end:]) == INSIGHTS[1:] + VISUALIZATIONS
+
+
+def test_json_fence_and_trailing_text_are_ignored():
+    text = "```json\n" + json.dumps(SUMMARY, indent=2) + "\n```\n{\"insights\": [{\"x\": 1}]}"
+    chunks = _split(text, 3, 9, 40)
+    assert _feed(chunks) == INSIGHTS + VISUALIZATIONS
+
+    parser = SummaryStreamParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    assert parser.text() == text
+
+
+def test_nested_keys_with_the_same_names_are_not_items():
+    document = {"meta": {"insights": [{"title": "nested"}]}, "insights": [{"title": "top"}], "visualizations": []}
+    assert _feed(list(json.dumps(document))) == [("insights", {"title": "top"})]
+
+
+def test_truncated_stream_emits_only_complete_items():
+    text = json.dumps(SUMMARY)
+    cut = text.index('"Fasting value')
+    assert _feed(_split(text[:cut], cut // 2)) == INSIGHTS[:1]
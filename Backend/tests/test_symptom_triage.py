@@ -0,0 +1,90 @@
+import json
+import os
+
+import pytest
+
+from services.symptom_triage import PhraseMatcher, get_triage, normalize_text
+from utils.constants import SYMPTOM_RED_FLAGS_PATH
+
+
+def _categories(symptoms):
+    result = get_triage().check(symptoms)
+    return result and result["categories"]
+
+
+@pytest.mark.parametrize("symptoms, category", [
+    ("Severe chest pain since morning", "cardiac"),
+    ("my chest hurts", "cardiac"),
+    ("My CHEST is hurting a lot!!", "cardiac"),
+    ("baby is not breathing properly", "breathing"),
+    ("he is not breathing", "breathing"),
+    ("not breathing", "breathing"),
+    ("he stopped breathing", "breathing"),
+    ("shortness of breath when walking", "breathing"),
+    ("feeling breathless", "breathing"),
+    ("I can't breathe", "breathing"),
+    ("bleeding not stopping after a cut", "bleeding"),
+    ("he collapsed in the bathroom", "unresponsive"),
+    ("she is not conscious", "unresponsive"),
+    ("not conscious", "unresponsive"),
+    ("I do not want to live", "self_harm"),
+    ("I don't want to live anymore", "self_harm"),
+    ("सीने में दर्द हो रहा है", "cardiac"),
+    ("छातीत दुखत आहे", "cardiac"),
+    ("saans nahi aa rahi", "breathing"),
+])
+def test_red_flags_are_found(symptoms, category):
+    assert category in _categories(symptoms)
+
+
+@pytest.mark.parametrize("symptoms, category", [
+    ("No, chest pain since morning", "cardiac"),
+    ("Not really. Chest pain and sweating", "cardiac"),
+    ("no fever; chest pain", "cardiac"),
+    ("never had this before: can't breathe", "breathing"),
+])
+def test_negation_stops_at_punctuation(symptoms, category):
+    assert category in _categories(symptoms)
+
+
+@pytest.mark.parametrize("symptoms", [
+    "no chest pain",
+    "fever and cough, no chest pain",
+    "denies shortness of breath",
+    "mild headache without chest pain",
+    "fever and cough for two days",
+    "",
+])
+def test_negated_or_missing_red_flags_are_not_reported(symptoms):
+    assert _categories(symptoms) is None
+
+
+def test_guidance_is_in_the_requested_language():
+    result = get_triage().check("सीने में दर्द", "hi")
+    assert result["phrases"] == ["सीने में दर्द"]
+    assert "112" in result["guidance"]
+    assert get_triage().check("chest pain", "ta")["guidance"].startswith("Your description")
+
+
+def test_phrases_match_from_the_start_of_a_word():
+    matcher = PhraseMatcher({"fits": "unresponsive", "chest pain": "cardiac"})
+    assert [phrase for _, phrase, _ in matcher.find("chest pains")] == ["chest pain"]
+    assert matcher.find("it benefits me") == []
+
+
+def test_every_category_has_phrases_and_advice_in_all_languages():
+    with open(SYMPTOM_RED_FLAGS_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+
+    assert set(data["guidance"]) == {"en", "hi", "mr"}
+    seen = set()
+    for category in data["categories"]:
+        assert set(category["advice"]) == {"en", "hi", "mr"}, category["id"]
+        for phrase in category["phrases"]:
+            assert normalize_text(phrase) not in seen, phrase
+            seen.add(normalize_text(phrase))
+
+
+def test_red_flags_path_does_not_depend_on_the_working_directory():
+    assert os.path.isabs(SYMPTOM_RED_FLAGS_PATH)
+    assert os.path.exists(SYMPTOM_RED_FLAGS_PATH)
@@ -0,0 +1,70 @@
+import tracemalloc
+
+import fitz
+import pytest
+
+from benchmarks.synthetic_pdf import make_report_pdf
+from services import pdf_service
+from services.deidentification_service import anonymize
+from services.text_compaction import compact_pages, iter_compacted_pages
+
+LETTERHEAD = "City Diagnostics Laboratory, Pune"
+
+
+def _pages(count: int, extra: dict = None) -> list:
+    extra = extra or {}
+    return [
+        "\n".join([LETTERHEAD, f"Investigation section {i + 1}", *extra.get(i, []), f"Page {i + 1} of {count}"])
+        for i in range(count)
+    ]
+
+
+def test_boilerplate_is_kept_once_and_footers_dropped():
+    text, stats = compact_pages(_pages(5))
+    assert text.count(LETTERHEAD) == 1
+    assert "Page" not in text
+    assert all(f"Investigation section {i}" in text for i in range(1, 6))
+    assert stats["repeated_lines"] == 1
+    assert stats["tokens_saved"] > 0
+
+
+def test_findings_repeated_on_a_few_pages_are_kept():
+    finding = "Impression: no focal lesion seen in the liver"
+    text, _ = compact_pages(_pages(10, {3: [finding], 4: [finding]}))
+    assert text.count(finding) == 2
+
+
+def test_short_documents_use_the_whole_document_ratio():
+    # On 3 of 5 pages (the ratio is 0.6): boilerplate, even though the first
+    # two pages alone could not tell.
+    header = "Department of Biochemistry Report"
+    text, _ = compact_pages(_pages(5, {0: [header], 1: [header], 4: [header]}))
+    assert text.count(header) == 1
+
+
+@pytest.mark.parametrize("lookahead", [0, 1, 4, 16])
+def test_long_documents_keep_boilerplate_once(lookahead):
+    pages = list(iter_compacted_pages(_pages(60), lookahead=lookahead))
+    assert "\n".join(pages).count(LETTERHEAD) == 1
+    assert len(pages) == 60
+
+
+def _pipeline_peak(pages: int) -> int:
+    doc = fitz.open(stream=make_report_pdf(pages), filetype="pdf")
+    try:
+        tracemalloc.start()
+        for page in iter_compacted_pages(pdf_service.iter_document_pages(doc, "pymupdf")):
+            anonymize(page)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        doc.close()
+
+
+def test_pipeline_memory_does_not_grow_with_the_document(monkeypatch):
+    # Extract -> compact -> anonymize, as report_service.iter_sanitized_pages
+    # does. Extraction stays in this process so tracemalloc sees it.
+    monkeypatch.setattr(pdf_service, "PDF_PARALLEL_MIN_PAGES", 10 ** 9)
+    _pipeline_peak(5)
+    small, large = _pipeline_peak(50), _pipeline_peak(600)
+    assert large < small * 1.5
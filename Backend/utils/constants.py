@@ -0,0 +1,122 @@
+import os
+from pathlib import Path
+
+# Relative data file paths are taken from Backend/, not the working directory.
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Uploads at or below this size stay in memory and are handed to PyMuPDF as a
+# memoryview; anything larger is spooled to an anonymous temp file and mapped.
+PDF_SPOOL_THRESHOLD_BYTES = int(os.getenv("PDF_SPOOL_THRESHOLD_BYTES", 8 * 1024 * 1024))
+
+# Documents with at least this many pages have their text extracted by a
+# process pool; anything smaller is extracted in the request thread.
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 50))
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Pages extracted (and OCRed) per batch when streaming a document, which
+# bounds how much page text is held in memory at once.
+PDF_STREAM_BATCH_PAGES = int(os.getenv("PDF_STREAM_BATCH_PAGES", 16))
+
+# Summaries kept in each worker's memory in front of the Firestore summary cache.
+SUMMARY_CACHE_LOCAL_SIZE = int(os.getenv("SUMMARY_CACHE_LOCAL_SIZE", 256))
+
+# Cache for medical term explanations and medicine lookups: "memory" (per
+# worker) or "sqlite" (one file at RESPONSE_CACHE_PATH shared by all workers).
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", "storage/response_cache.sqlite3")
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 2048))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+
+# Most terms /medical-term/explain-batch accepts in one request.
+MEDICAL_TERM_BATCH_MAX = int(os.getenv("MEDICAL_TERM_BATCH_MAX", 20))
+
+# Bundled term dictionary answered before the LLM (services/medical_term_dictionary.py),
+# and how many suggestions /medical-term/autocomplete returns at most.
+MEDICAL_TERM_DICTIONARY_PATH = str(BACKEND_DIR / os.getenv("MEDICAL_TERM_DICTIONARY_PATH", "data/medical_terms.json"))
+MEDICAL_TERM_AUTOCOMPLETE_MAX = int(os.getenv("MEDICAL_TERM_AUTOCOMPLETE_MAX", 10))
+
+# Bundled medicine catalog answered before the LLM (services/medicine_catalog.py).
+MEDICINE_CATALOG_PATH = str(BACKEND_DIR / os.getenv("MEDICINE_CATALOG_PATH", "data/medicines.json"))
+
+# Red-flag phrases answered with emergency guidance before the LLM
+# (services/symptom_triage.py).
+SYMPTOM_RED_FLAGS_PATH = str(BACKEND_DIR / os.getenv("SYMPTOM_RED_FLAGS_PATH", "data/red_flags.json"))
+
+# Pages whose text layer has fewer characters than this are treated as scanned
+# and OCRed. They are rendered so the long edge is about OCR_TARGET_PIXELS,
+# clamped to [OCR_MIN_DPI, OCR_MAX_DPI].
+OCR_MIN_PAGE_CHARS = int(os.getenv("OCR_MIN_PAGE_CHARS", 20))
+OCR_TARGET_PIXELS = int(os.getenv("OCR_TARGET_PIXELS", 3000))
+OCR_MIN_DPI = int(os.getenv("OCR_MIN_DPI", 150))
+OCR_MAX_DPI = int(os.getenv("OCR_MAX_DPI", 400))
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", 2))
+OCR_LANGUAGES = os.getenv("OCR_LANGUAGES", "eng")
+OCR_PAGE_TIMEOUT = int(os.getenv("OCR_PAGE_TIMEOUT", 30))
+
+# Text extractor used for uploads: "auto" (PyMuPDF, OCR for sparse pages),
+# "pymupdf", "pypdf2" or "ocr". See services/pdf_service.EXTRACTORS.
+PDF_EXTRACTOR = os.getenv("PDF_EXTRACTOR", "auto")
+
+# Lines on at least COMPACTION_REPEAT_RATIO of a report's pages are treated
+# as letterhead/footer boilerplate; shorter lines are never treated that way.
+# Each page is judged once COMPACTION_LOOKAHEAD_PAGES more pages are read.
+COMPACTION_REPEAT_RATIO = float(os.getenv("COMPACTION_REPEAT_RATIO", 0.6))
+COMPACTION_MIN_LINE_CHARS = int(os.getenv("COMPACTION_MIN_LINE_CHARS", 12))
+COMPACTION_LOOKAHEAD_PAGES = int(os.getenv("COMPACTION_LOOKAHEAD_PAGES", 16))
+
+# Reports longer than SUMMARY_MAP_REDUCE_CHARS are summarized in chunks of
+# up to SUMMARY_CHUNK_CHARS, with at most SUMMARY_MAP_WORKERS chunk calls in flight.
+SUMMARY_MAP_REDUCE_CHARS = int(os.getenv("SUMMARY_MAP_REDUCE_CHARS", 60000))
+SUMMARY_CHUNK_CHARS = int(os.getenv("SUMMARY_CHUNK_CHARS", 20000))
+SUMMARY_MAP_WORKERS = int(os.getenv("SUMMARY_MAP_WORKERS", 4))
+
+# Model backend behind services/llm_gateway.py: "gemini", or "fake" for an
+# offline stand-in (services/fake_llm_backend.py) used in load tests. The
+# fake answers after a log-normal delay around FAKE_LLM_LATENCY_MS (sigma 0
+# for a fixed delay) and fails FAKE_LLM_ERROR_RATE of calls with a 503.
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", 800))
+FAKE_LLM_LATENCY_SIGMA = float(os.getenv("FAKE_LLM_LATENCY_SIGMA", 0.5))
+FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", 0.0))
+FAKE_LLM_STREAM_CHUNKS = int(os.getenv("FAKE_LLM_STREAM_CHUNKS", 8))
+FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED")) if os.getenv("FAKE_LLM_SEED") else None
+
+# Models behind the two tiers of services/model_router.py. LLM_ROUTES is an
+# optional JSON object of per-task overrides of the routing table, e.g.
+# {"medicine": {"tier": "heavy"}, "chat": {"model": "gemini-2.5-pro"}}.
+LLM_LIGHT_MODEL = os.getenv("LLM_LIGHT_MODEL", "gemini-2.5-flash-lite")
+LLM_HEAVY_MODEL = os.getenv("LLM_HEAVY_MODEL", "gemini-2.5-flash")
+LLM_ROUTES = os.getenv("LLM_ROUTES", "")
+
+# Gemini calls (services/llm_gateway.py): each attempt may take up to
+# LLM_TIMEOUT_SECONDS and a call, retries included, at most LLM_DEADLINE_SECONDS.
+# Transient failures are retried up to LLM_MAX_ATTEMPTS times with jittered
+# exponential backoff between LLM_RETRY_BASE_SECONDS and LLM_RETRY_MAX_SECONDS.
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", 60))
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", 90))
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", 3))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", 0.5))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", 8))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 20))
+
+# Admission control per worker process (services/llm_admission.py): at most
+# LLM_MAX_CONCURRENT calls in flight, LLM_MAX_CONCURRENT_PER_USER per user,
+# background tasks in at most LLM_BACKGROUND_SHARE of the slots, and
+# LLM_REQUESTS_PER_MINUTE call starts (0 = no rate limit). A request's first
+# call waits up to LLM_ADMISSION_WAIT_SECONDS for room before it is answered
+# with 429 and Retry-After: LLM_RETRY_AFTER_SECONDS.
+LLM_MAX_CONCURRENT = int(os.getenv("LLM_MAX_CONCURRENT", 16))
+LLM_MAX_CONCURRENT_PER_USER = int(os.getenv("LLM_MAX_CONCURRENT_PER_USER", 4))
+LLM_BACKGROUND_SHARE = float(os.getenv("LLM_BACKGROUND_SHARE", 0.75))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", 0))
+LLM_ADMISSION_WAIT_SECONDS = float(os.getenv("LLM_ADMISSION_WAIT_SECONDS", 2))
+LLM_RETRY_AFTER_SECONDS = int(os.getenv("LLM_RETRY_AFTER_SECONDS", 5))
+
+# After LLM_BREAKER_FAILURES transient failures in a row, calls fail fast for
+# LLM_BREAKER_RESET_SECONDS before a single trial call is let through.
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", 5))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", 30))
+
+# JSON answers that fail their response schema (services/llm_schemas.py) are
+# sent back to the model for repair at most this many times.
+LLM_SCHEMA_REPAIR_ATTEMPTS = int(os.getenv("LLM_SCHEMA_REPAIR_ATTEMPTS", 1))
@@ -20,3 +20,30 @@ class ReportProcessingError(AppException):
 class ReportNotFoundError(AppException):
     status_code = 404
     message = "Report not found"
+
+
+class LLMUnavailableError(AppException):
+    status_code = 503
+    message = "AI service is temporarily unavailable, please try again shortly"
+
+
+class LLMRateLimitedError(LLMUnavailableError):
+    # A kind of LLMUnavailableError, so every place that lets that one
+    # through lets this one through too.
+    status_code = 429
+    message = "Too many AI requests right now, please try again shortly"
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        self.retry_after = retry_after
+
+    def to_dict(self):
+        return {
+            "error": self.message,
+            "retryAfter": self.retry_after
+        }
+
+
+class LLMOutputInvalidError(AppException):
+    status_code = 502
+    message = "AI service returned an unusable answer, please try again"
@@ -1,3 +1,5 @@
+import itertools
+import json
 from flask import jsonify
 
 def success_response(data=None, message="Success"):
@@ -6,3 +8,23 @@ def success_response(data=None, message="Success"):
         "message": message,
         "data": data
     })
+
+
+def sse_event(event: str, data) -> str:
+    """One Server-Sent Events message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def start_stream(iterator):
+    """
+    Produce the first item of `iterator` now and return an iterator over
+    all of its items. Streaming routes call this before building their
+    Response, so errors raised up to the first item (e.g. admission control
+    rejecting the LLM call with LLMRateLimitedError) are answered with
+    their own status (429 + Retry-After) instead of an error event in a
+    200 stream.
+    """
+    iterator = iter(iterator)
+    for first in iterator:
+        return itertools.chain([first], iterator)
+    return iter(())
@@ -0,0 +1,14 @@
+from tempfile import SpooledTemporaryFile
+from flask import Request
+from utils.constants import PDF_SPOOL_THRESHOLD_BYTES
+
+
+class SpooledUploadRequest(Request):
+    """
+    Request class that keeps uploads in memory up to PDF_SPOOL_THRESHOLD_BYTES
+    and only rolls them over to an anonymous temp file beyond that.
+    The temp file is deleted as soon as the request is torn down.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledTemporaryFile(max_size=PDF_SPOOL_THRESHOLD_BYTES, mode="rb+")
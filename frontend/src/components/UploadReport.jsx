@@ -1,5 +1,5 @@
 import { useState, useEffect, useRef } from "react";
-import { uploadReport, explainMedicalTerm, checkSymptoms, identifyMedicine } from "../services/api";
+import { uploadReportStream, explainMedicalTerm, checkSymptoms, identifyMedicine } from "../services/api";
 import ReactMarkdown from "react-markdown";
 import remarkGfm from "remark-gfm";
 import {
@@ -177,11 +177,29 @@ export default function UploadReport({ user, onResult, onUploadSuccess, summary
     setLoading(true);
     setError(null);
 
+    const reportName = file.name.replace(/\.[^/.]+$/, "").toLowerCase();
+    // Charts, insights and the summary text are shown as they stream in.
+    const partial = { insights: [], visualizations: [] };
+    let shownPartial = false;
+
     try {
-      const result = await uploadReport(file, reportType, language, user);
+      const result = await uploadReportStream(file, reportType, language, user, (event, data) => {
+        if (event === "visualization") {
+          partial.visualizations.push(data);
+        } else if (event === "insight") {
+          partial.insights.push(data);
+        } else if (event === "summary_text") {
+          partial.summary_text = data.summary_text;
+        } else {
+          return;
+        }
+        shownPartial = true;
+        onResult({ summary: JSON.stringify(partial), reportName, reportType });
+      });
+
       onResult({
         summary: result.summary,
-        reportName: file.name.replace(/\.[^/.]+$/, "").toLowerCase(),
+        reportName,
         reportType: reportType
       });
 
@@ -189,6 +207,10 @@ export default function UploadReport({ user, onResult, onUploadSuccess, summary
         onUploadSuccess();
       }
     } catch (err) {
+      if (shownPartial) {
+        // The report was not saved: do not leave a half summary on screen.
+        onResult({ summary: "", reportName, reportType });
+      }
       setError(err.message);
       console.error(err);
     } finally {
@@ -76,6 +76,84 @@ export async function uploadReport(file, reportType, language = "en", user) {
   return data.data; // Backend returns { success: true, data: {...}, message: "..." }
 }
 
+/**
+ * Parse one Server-Sent Events message ("event: ...\ndata: ...")
+ */
+function parseSseMessage(message) {
+  let event = "message";
+  const data = [];
+  for (const line of message.split("\n")) {
+    if (line.startsWith("event:")) {
+      event = line.slice(6).trim();
+    } else if (line.startsWith("data:")) {
+      data.push(line.slice(5).trimStart());
+    }
+  }
+  return { event, data: data.length ? JSON.parse(data.join("\n")) : null };
+}
+
+/**
+ * Upload a medical report and stream its summary as it is generated
+ * @param {File} file - The PDF file to upload
+ * @param {string} reportType - Type of report (e.g., "CBC", "LIPID", etc.)
+ * @param {string} language - Language code (default: "en")
+ * @param {Object} user - Firebase user object
+ * @param {Function} onEvent - Called with (event, data) for every "visualization",
+ *   "insight" and "summary_text" event as it arrives
+ * @returns The saved report, same as uploadReport (the "done" event)
+ */
+export async function uploadReportStream(file, reportType, language = "en", user, onEvent) {
+  const formData = new FormData();
+  formData.append("file", file);
+  formData.append("reportType", reportType);
+  formData.append("language", language);
+
+  const headers = await getAuthHeaders(user);
+
+  const response = await fetch(`${API_BASE_URL}/reports/upload/stream`, {
+    method: "POST",
+    headers,
+    body: formData,
+  });
+
+  if (!response.ok) {
+    // Validation errors and 429 (too many requests) come back as plain JSON.
+    const data = await response.json().catch(() => ({}));
+    throw new Error(data.error || data.message || "Upload failed");
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (value) {
+      buffer += decoder.decode(value, { stream: true });
+    }
+
+    let end;
+    while ((end = buffer.indexOf("\n\n")) !== -1) {
+      const { event, data } = parseSseMessage(buffer.slice(0, end));
+      buffer = buffer.slice(end + 2);
+
+      if (event === "error") {
+        throw new Error(data.error || "Upload failed");
+      }
+      if (event === "done") {
+        return data;
+      }
+      if (onEvent) {
+        onEvent(event, data);
+      }
+    }
+
+    if (done) {
+      throw new Error("Upload stream ended unexpectedly");
+    }
+  }
+}
+
 /**
  * Get list of all reports for the current user
  */